@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from app.database_async import AsyncSession, get_async_db
+from app.models import User, UserRole, EmployeeProfile
+from app.schemas import User as UserSchema, Attendance as AttendanceSchema, EmployeeProfileMeResponse
+from app.schemas.token import Token
+from app.auth.security import create_access_token
+from app.auth.hashing import verify_and_update_password_async
+from app.auth.async_dependencies import (
+    get_current_active_user_async, get_current_employee_profile_async, get_current_active_user_with_roles_async,
+)
+from app.api import attendance, dashboard, employees
+from app.api.auth import get_user_for_login, save_upgraded_password_hash
+from app.api.caching import conditional_get_async
+from app.api.dashboard import ADMIN_DASHBOARD_TABLES, EmployeeDashboardSummary, AdminDashboardSummary
+from app.services.activity_service import log_activity
+
+# The hot routes served from an AsyncSession when ASYNC_DB_ENABLED is set. The router is
+# mounted ahead of the sync routers, so it takes over these paths. Each handler awaits the
+# database instead of holding a threadpool thread, and reuses the sync route's logic through
+# AsyncSession.run_sync so the two stacks cannot drift apart.
+
+router = APIRouter()
+
+# Role, the article used in the error message, and the name used in the activity log
+LOGIN_ROLES = {
+    "admin": (UserRole.ADMIN, "an Admin", "Admin"),
+    "hr": (UserRole.HR_OFFICER, "an HR Officer", "HR"),
+    "employee": (UserRole.EMPLOYEE, "an Employee", "Employee"),
+}
+
+def _in_session(handler, schema=None):
+    """
+    Adapts a sync route handler for AsyncSession.run_sync. The result is validated
+    into the response schema before leaving run_sync, where lazy loads are still allowed.
+    """
+    def call(session, **kwargs):
+        result = handler(db=session, **kwargs)
+        return schema.model_validate(result) if schema else result
+    return call
+
+async def _login(db: AsyncSession, form_data: OAuth2PasswordRequestForm, portal: str) -> dict:
+    role, role_description, role_name = LOGIN_ROLES[portal]
+    user = await db.run_sync(get_user_for_login, form_data.username)
+    is_valid, new_hash = (False, None)
+    if user:
+        is_valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if new_hash:
+        await db.run_sync(save_upgraded_password_hash, user, new_hash)
+
+    if user.role != role:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Unauthorized: User is not {role_description}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token = create_access_token(data={"sub": user.email})
+    await db.run_sync(log_activity, user.id, f"{role_name} login", f"{role_name} {user.email} logged in.")
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# --- Auth ---
+
+@router.post("/auth/admin/login", response_model=Token, tags=["auth"])
+async def login_admin(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Authenticate Admin and return a JWT token.
+    """
+    return await _login(db, form_data, "admin")
+
+@router.post("/auth/hr/login", response_model=Token, tags=["auth"])
+async def login_hr(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Authenticate HR Officer and return a JWT token.
+    """
+    return await _login(db, form_data, "hr")
+
+@router.post("/auth/employee/login", response_model=Token, tags=["auth"])
+async def login_employee(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Authenticate Employee and return a JWT token.
+    """
+    return await _login(db, form_data, "employee")
+
+@router.get("/auth/users/me", response_model=UserSchema, tags=["auth"])
+async def read_users_me(current_user: User = Depends(get_current_active_user_async)):
+    """
+    Get current user.
+    """
+    return current_user
+
+# --- Attendance ---
+
+@router.post("/attendance/check-in", response_model=AttendanceSchema, status_code=status.HTTP_201_CREATED, tags=["attendance"])
+async def check_in(
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Check-in for the current employee. Creates a new attendance record for the day.
+    """
+    return await db.run_sync(_in_session(attendance.check_in, AttendanceSchema), employee_profile=employee_profile)
+
+@router.post("/attendance/check-out", response_model=AttendanceSchema, tags=["attendance"])
+async def check_out(
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Check-out for the current employee. Updates the attendance record for the day.
+    """
+    return await db.run_sync(_in_session(attendance.check_out, AttendanceSchema), employee_profile=employee_profile)
+
+# --- Profile and dashboards ---
+
+@router.get("/employees/me", response_model=EmployeeProfileMeResponse, tags=["employees"])
+async def read_my_profile(
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve the current employee's profile.
+    """
+    return await db.run_sync(_in_session(employees.read_my_profile), employee_profile=employee_profile)
+
+@router.get("/dashboard/me", response_model=EmployeeDashboardSummary, tags=["dashboard"])
+async def get_employee_dashboard_summary(
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve dashboard data for the current employee.
+    """
+    return await db.run_sync(_in_session(dashboard.get_employee_dashboard_summary), employee_profile=employee_profile)
+
+@router.get(
+    "/dashboard/admin", response_model=AdminDashboardSummary, tags=["dashboard"],
+    dependencies=[Depends(conditional_get_async(
+        ADMIN_DASHBOARD_TABLES, get_current_active_user_with_roles_async([UserRole.ADMIN, UserRole.HR_OFFICER]),
+    ))],
+)
+async def get_admin_dashboard_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_with_roles_async([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Retrieve dashboard data for administrators and HR officers.
+    """
+    return await db.run_sync(_in_session(dashboard.get_admin_dashboard_summary), current_user=current_user)
@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import date, datetime, time, timedelta
 from app.database import get_db
-from app.models import User, EmployeeProfile, Attendance, AttendanceStatus, UserRole
-from app.schemas import Attendance as AttendanceSchema, AttendanceManualCreate
-from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.models import User, EmployeeProfile, Attendance, AttendanceStatus, AttendanceMonthlyRollup, UserRole
+from app.schemas import Attendance as AttendanceSchema, EmployeeProfile as EmployeeProfileSchema, AttendanceManualCreate, AttendanceMonthlyRollup as AttendanceMonthlyRollupSchema
+from app.auth.dependencies import get_current_active_user, get_current_employee_profile, get_current_active_user_with_roles
+from app.api.pagination import paginate_keyset
+from app.api.caching import conditional_get
+from app.responses import FastJSONResponse, fast_json, rows_to_dicts
+from app.services.attendance_export_service import ExportFormat, EXPORT_MEDIA_TYPES, iter_attendance_export
+from app.services.attendance_rollup_service import counts_of, record_attendance_change
 
 router = APIRouter()
 
+# The fields of the Attendance response schema as columns, the nested profile's labelled "employee_profile.<field>"
+ATTENDANCE_ROW_COLUMNS = [
+    getattr(Attendance, name) for name in AttendanceSchema.model_fields if name != "employee_profile"
+] + [
+    getattr(EmployeeProfile, name).label(f"employee_profile.{name}") for name in EmployeeProfileSchema.model_fields
+]
+
 @router.post("/check-in", response_model=AttendanceSchema, status_code=status.HTTP_201_CREATED)
 def check_in(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Check-in for the current employee. Creates a new attendance record for the day.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     today = date.today()
     
     # Check if there is already an attendance record for today
@@ -34,9 +44,11 @@ def check_in(
 
     if existing_attendance:
         # Update existing record (e.g. if created by admin as ABSENT)
+        before = counts_of(existing_attendance)
         existing_attendance.check_in_time = datetime.now()
         existing_attendance.status = AttendanceStatus.PRESENT
         db.add(existing_attendance)
+        record_attendance_change(db, employee_profile.id, today, before, counts_of(existing_attendance))
         db.commit()
         db.refresh(existing_attendance)
         return existing_attendance
@@ -49,22 +61,24 @@ def check_in(
             status=AttendanceStatus.PRESENT
         )
         db.add(new_attendance)
-        db.commit()
+        record_attendance_change(db, employee_profile.id, today, None, counts_of(new_attendance))
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent check-in created today's record first
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Already checked in for today")
         db.refresh(new_attendance)
         return new_attendance
 
 @router.post("/check-out", response_model=AttendanceSchema)
 def check_out(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Check-out for the current employee. Updates the attendance record for the day.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     today = date.today()
     
     attendance_record = db.query(Attendance).filter(
@@ -78,79 +92,152 @@ def check_out(
     if attendance_record.check_out_time:
         raise HTTPException(status_code=400, detail="Already checked out for today")
 
+    before = counts_of(attendance_record)
     attendance_record.check_out_time = datetime.now()
     db.add(attendance_record)
+    record_attendance_change(db, employee_profile.id, today, before, counts_of(attendance_record))
     db.commit()
     db.refresh(attendance_record)
     return attendance_record
 
-@router.get("/daily", response_model=List[AttendanceSchema])
+@router.get("/daily", response_model=List[AttendanceSchema], dependencies=[Depends(conditional_get(
+    [Attendance.__tablename__, EmployeeProfile.__tablename__], get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER]),
+))])
 def get_daily_attendance(
+    response: Response,
     day: date = date.today(),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
 ):
     """
     Get all attendance records for a specific day. (Admin or HR Officer only)
+    Returns up to `limit` records; the next page's cursor is returned in the X-Next-Cursor header.
     """
-    attendances = db.query(Attendance).filter(Attendance.date == day).all()
-    return attendances
+    query = db.query(Attendance).options(joinedload(Attendance.employee_profile)).filter(Attendance.date == day)
+    return paginate_keyset(query, [Attendance.date, Attendance.id], cursor, limit, response)
 
 @router.get("/weekly", response_model=List[AttendanceSchema])
 def get_weekly_attendance(
+    response: Response,
     day_in_week: date = date.today(),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
 ):
     """
     Get all attendance records for a specific week. (Admin or HR Officer only)
+    Returns up to `limit` records; the next page's cursor is returned in the X-Next-Cursor header.
     """
     start_of_week = day_in_week - timedelta(days=day_in_week.weekday())
     end_of_week = start_of_week + timedelta(days=6)
     
-    attendances = db.query(Attendance).filter(
+    query = db.query(Attendance).options(joinedload(Attendance.employee_profile)).filter(
         Attendance.date >= start_of_week,
         Attendance.date <= end_of_week
-    ).all()
-    return attendances
+    )
+    return paginate_keyset(query, [Attendance.date, Attendance.id], cursor, limit, response)
 
 @router.get("/me", response_model=List[AttendanceSchema])
 def get_my_attendance_history(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db),
 ):
     """
     Get the current employee's attendance history.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     attendances = db.query(Attendance).filter(
         Attendance.employee_profile_id == employee_profile.id
     ).order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
     
     return attendances
 
-@router.get("/all", response_model=List[AttendanceSchema])
+@router.get("/all", response_model=List[AttendanceSchema], response_class=FastJSONResponse)
 def get_all_attendance_records(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     employee_profile_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
 ):
     """
-    Get all attendance records. (Admin or HR Officer only)
+    Get all attendance records, newest first. (Admin or HR Officer only)
+    The cursor for the next page is returned in the X-Next-Cursor header; prefer it over `skip`,
+    which still works but gets slower the deeper the page.
     """
-    query = db.query(Attendance)
+    # Selects exactly the response fields as columns, with the profile joined in,
+    # and encodes the rows without building ORM objects or response models
+    query = db.query(*ATTENDANCE_ROW_COLUMNS).outerjoin(EmployeeProfile, EmployeeProfile.id == Attendance.employee_profile_id)
     if employee_profile_id:
         query = query.filter(Attendance.employee_profile_id == employee_profile_id)
-        
-    attendances = query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
-    return attendances
+
+    rows = paginate_keyset(query, [Attendance.date, Attendance.id], cursor, limit, response, descending=True, offset=skip)
+    return fast_json(rows_to_dicts(rows), response)
+
+@router.get("/monthly", response_model=List[AttendanceMonthlyRollupSchema])
+def get_monthly_attendance(
+    response: Response,
+    year: int,
+    month: int = Query(..., ge=1, le=12),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Get every employee's attendance totals for a month, from the monthly rollups. (Admin or HR Officer only)
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    query = db.query(AttendanceMonthlyRollup).filter(
+        AttendanceMonthlyRollup.year == year,
+        AttendanceMonthlyRollup.month == month,
+    )
+    return paginate_keyset(query, [AttendanceMonthlyRollup.employee_profile_id], cursor, limit, response)
+
+@router.get("/monthly/me", response_model=AttendanceMonthlyRollupSchema)
+def get_my_monthly_attendance(
+    year: int,
+    month: int = Query(..., ge=1, le=12),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current employee's attendance totals for a month.
+    """
+    rollup = db.query(AttendanceMonthlyRollup).filter(
+        AttendanceMonthlyRollup.employee_profile_id == employee_profile.id,
+        AttendanceMonthlyRollup.year == year,
+        AttendanceMonthlyRollup.month == month,
+    ).first()
+    return rollup or AttendanceMonthlyRollupSchema(employee_profile_id=employee_profile.id, year=year, month=month)
+
+@router.get("/export")
+def export_attendance(
+    start_date: date,
+    end_date: date,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    employee_profile_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Stream every attendance record in a date range as CSV or NDJSON, e.g. for a payroll cutoff. (Admin or HR Officer only)
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+
+    filename = f"attendance_{start_date.isoformat()}_{end_date.isoformat()}.{export_format.value}"
+    return StreamingResponse(
+        iter_attendance_export(db.get_bind(), start_date, end_date, export_format, employee_profile_id),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @router.post("/manual", response_model=AttendanceSchema)
 def manual_attendance_entry(
@@ -170,6 +257,7 @@ def manual_attendance_entry(
         Attendance.date == attendance_in.date
     ).first()
 
+    before = counts_of(attendance)
     if attendance:
         # Update existing record
         attendance.check_in_time = attendance_in.check_in_time
@@ -181,6 +269,7 @@ def manual_attendance_entry(
         attendance = Attendance(**attendance_in.model_dump())
 
     db.add(attendance)
+    record_attendance_change(db, attendance.employee_profile_id, attendance.date, before, counts_of(attendance))
     db.commit()
     db.refresh(attendance)
     return attendance
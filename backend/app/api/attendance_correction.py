@@ -5,7 +5,10 @@ from datetime import datetime
 from app.database import get_db
 from app.models import User, Attendance, AttendanceCorrectionRequest, UserRole, CorrectionRequestStatus
 from app.schemas.attendance_correction import AttendanceCorrectionRequest as AttendanceCorrectionRequestSchema, AttendanceCorrectionRequestCreate, AttendanceCorrectionRequestUpdate
+from app.schemas.bulk import BulkReviewRequest, BulkReviewResponse
 from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.services.attendance_rollup_service import counts_of, record_attendance_change
+from app.services.bulk_review_service import review_correction_requests, check_review_batch_size, summarize_review
 
 router = APIRouter()
 
@@ -46,6 +49,30 @@ def get_pending_correction_requests(
     requests = db.query(AttendanceCorrectionRequest).filter(AttendanceCorrectionRequest.status == CorrectionRequestStatus.PENDING).all()
     return requests
 
+@router.post("/bulk/approve", response_model=BulkReviewResponse)
+def bulk_approve_correction_requests(
+    review_in: BulkReviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Approve many attendance correction requests in one transaction, reporting the outcome of each. (Admin or HR Officer only)
+    """
+    check_review_batch_size(review_in.ids)
+    return summarize_review(review_correction_requests(db, review_in.ids, True, current_user.id, review_in.comments))
+
+@router.post("/bulk/reject", response_model=BulkReviewResponse)
+def bulk_reject_correction_requests(
+    review_in: BulkReviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Reject many attendance correction requests in one transaction, reporting the outcome of each. (Admin or HR Officer only)
+    """
+    check_review_batch_size(review_in.ids)
+    return summarize_review(review_correction_requests(db, review_in.ids, False, current_user.id, review_in.comments))
+
 @router.put("/{request_id}/approve", response_model=AttendanceCorrectionRequestSchema)
 def approve_correction_request(
     request_id: int,
@@ -69,9 +96,11 @@ def approve_correction_request(
     # Update the attendance record
     attendance = db.query(Attendance).filter(Attendance.id == db_request.attendance_id).first()
     if attendance:
+        before = counts_of(attendance)
         attendance.check_in_time = db_request.requested_check_in_time
         attendance.check_out_time = db_request.requested_check_out_time
         db.add(attendance)
+        record_attendance_change(db, attendance.employee_profile_id, attendance.date, before, counts_of(attendance))
 
     db.add(db_request)
     db.commit()
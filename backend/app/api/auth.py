@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.database import get_db
 from app.models import User, UserSettings, UserRole, Company, EmployeeProfile, LeaveBalance, LeaveType
 from app.schemas import UserCreate, User as UserSchema
 from app.schemas.token import Token
-from app.auth.security import get_password_hash, verify_password, create_access_token
+from app.auth.security import get_password_hash, create_access_token
+from app.auth.hashing import verify_and_update_password_async
 from app.auth.dependencies import get_current_active_user
 from app.services.activity_service import log_activity
+from app.services.dashboard_service import increment_counter, EMPLOYEE_COUNT, ACTIVE_USER_COUNT
 import shutil
 from pathlib import Path
 from datetime import datetime
@@ -18,7 +22,7 @@ router = APIRouter()
 COMPANY_LOGO_DIR = Path("static/company_logos")
 COMPANY_LOGO_DIR.mkdir(parents=True, exist_ok=True)
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
+def get_user_for_login(db: Session, email: str) -> Optional[User]:
     # Check by email
     user = db.query(User).filter(User.email == email).first()
     
@@ -28,8 +32,31 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
         if employee_profile:
             user = employee_profile.user
 
-    if not user or not verify_password(password, user.hashed_password):
+    return user
+
+def save_upgraded_password_hash(db: Session, user: User, new_hash: str) -> None:
+    user.hashed_password = new_hash
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    Looks up the user by email or login ID and verifies the password.
+    Database work runs in the threadpool and bcrypt runs in the password hashing pool,
+    so the event loop is never blocked. Hashes created with an outdated work factor
+    are replaced on a successful login.
+    """
+    user = await run_in_threadpool(get_user_for_login, db, email)
+    if not user:
         return None
+
+    is_valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not is_valid:
+        return None
+
+    if new_hash:
+        await run_in_threadpool(save_upgraded_password_hash, db, user, new_hash)
     return user
 
 # --- Admin Auth ---
@@ -85,6 +112,7 @@ def register_admin(
         is_active=True,
     )
     db.add(db_user)
+    increment_counter(db, ACTIVE_USER_COUNT)
     db.commit()
     db.refresh(db_user)
     
@@ -112,6 +140,7 @@ def register_admin(
         designation="Administrator"
     )
     db.add(new_profile)
+    increment_counter(db, EMPLOYEE_COUNT)
     db.commit()
     db.refresh(new_profile)
     
@@ -141,11 +170,11 @@ def register_admin(
     return db_user
 
 @router.post("/admin/login", response_model=Token)
-def login_admin(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_admin(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Authenticate Admin and return a JWT token.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,7 +191,7 @@ def login_admin(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
     access_token = create_access_token(data={"sub": user.email})
     
-    log_activity(db, user.id, "Admin login", f"Admin {user.email} logged in.")
+    await run_in_threadpool(log_activity, db, user.id, "Admin login", f"Admin {user.email} logged in.")
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -219,6 +248,7 @@ def register_hr(
         is_active=user.is_active if 'user' in locals() else True, # Default to True
     )
     db.add(db_user)
+    increment_counter(db, ACTIVE_USER_COUNT)
     db.commit()
     db.refresh(db_user)
     
@@ -246,6 +276,7 @@ def register_hr(
         designation="HR Officer"
     )
     db.add(new_profile)
+    increment_counter(db, EMPLOYEE_COUNT)
     db.commit()
     db.refresh(new_profile)
     
@@ -275,11 +306,11 @@ def register_hr(
     return db_user
 
 @router.post("/hr/login", response_model=Token)
-def login_hr(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_hr(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Authenticate HR Officer and return a JWT token.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -296,18 +327,18 @@ def login_hr(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Dep
 
     access_token = create_access_token(data={"sub": user.email})
     
-    log_activity(db, user.id, "HR login", f"HR {user.email} logged in.")
+    await run_in_threadpool(log_activity, db, user.id, "HR login", f"HR {user.email} logged in.")
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 # --- Employee Auth ---
 
 @router.post("/employee/login", response_model=Token)
-def login_employee(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_employee(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Authenticate Employee and return a JWT token.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -324,7 +355,7 @@ def login_employee(form_data: OAuth2PasswordRequestForm = Depends(), db: Session
 
     access_token = create_access_token(data={"sub": user.email})
     
-    log_activity(db, user.id, "Employee login", f"Employee {user.email} logged in.")
+    await run_in_threadpool(log_activity, db, user.id, "Employee login", f"Employee {user.email} logged in.")
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -0,0 +1,75 @@
+import hashlib
+from datetime import date
+from typing import Callable, Dict, Iterable
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.database_async import AsyncSession, get_async_db
+from app.models import User
+from app.services.table_version_service import POLLED_TABLES, get_table_versions
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag.removeprefix("W/") for candidate in if_none_match.split(","))
+
+def _validated(tables: Iterable[str]) -> tuple:
+    tables = tuple(sorted(tables))
+    unversioned = set(tables) - POLLED_TABLES
+    if unversioned:
+        raise ValueError(f"Add {', '.join(sorted(unversioned))} to POLLED_TABLES to version them")
+    return tables
+
+def _answer(request: Request, response: Response, versions: Dict[str, object]) -> None:
+    key = "|".join([
+        request.url.path,
+        request.url.query,
+        request.headers.get("authorization", ""),
+        date.today().isoformat(),
+        *(f"{table}={version}" for table, version in versions.items()),
+    ])
+    etag = f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+def conditional_get(tables: Iterable[str], authorize: Callable[..., User]):
+    """
+    Dependency for polled GET endpoints. Gives the response a weak ETag derived from
+    the versions of the tables it reads, and answers a matching If-None-Match with
+    304 before the endpoint runs any of its own queries.
+
+    `authorize` is the endpoint's own user dependency. The check depends on it, so
+    it only runs, and a 304 is only given, once the request has passed authorization;
+    a user deactivated or demoted since receiving the tag gets their 401 or 403. The
+    tag also covers the URL, the Authorization header (so it is only ever matched for
+    the token that received it) and today's date (for endpoints that default to today).
+    """
+    tables = _validated(tables)
+
+    def check(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(authorize),
+    ) -> None:
+        _answer(request, response, get_table_versions(db, tables))
+
+    return check
+
+def conditional_get_async(tables: Iterable[str], authorize: Callable[..., User]):
+    """conditional_get for the routes served from an AsyncSession."""
+    tables = _validated(tables)
+
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(authorize),
+    ) -> None:
+        _answer(request, response, await db.run_sync(get_table_versions, tables))
+
+    return check
@@ -0,0 +1,165 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from datetime import date
+from app.config import settings
+from app.database import get_db
+from app.models import User, EmployeeProfile, UserRole, CompanyHoliday, CompanyWorkWeek, DEFAULT_WORKING_WEEKDAYS
+from app.schemas import CompanyHoliday as CompanyHolidaySchema, CompanyHolidayCreate, CompanyHolidayUpdate, WorkWeek, WorkingDays
+from app.auth.dependencies import get_current_employee_profile, get_current_active_user_with_roles
+from app.services.calendar_service import count_working_days, invalidate_calendar
+
+router = APIRouter()
+
+def _get_company_holiday(db: Session, holiday_id: int, company_id: int) -> CompanyHoliday:
+    holiday = db.query(CompanyHoliday).filter(
+        CompanyHoliday.id == holiday_id,
+        CompanyHoliday.company_id == company_id
+    ).first()
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    return holiday
+
+@router.get("/holidays", response_model=List[CompanyHolidaySchema])
+def list_holidays(
+    year: Optional[int] = None,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+):
+    """
+    List the holidays of the current user's company, optionally for one year.
+    """
+    query = db.query(CompanyHoliday).filter(CompanyHoliday.company_id == employee_profile.company_id)
+    if year:
+        query = query.filter(CompanyHoliday.date >= date(year, 1, 1), CompanyHoliday.date <= date(year, 12, 31))
+    return query.order_by(CompanyHoliday.date).all()
+
+@router.post("/holidays", response_model=CompanyHolidaySchema, status_code=status.HTTP_201_CREATED)
+def create_holiday(
+    holiday_in: CompanyHolidayCreate,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Add a holiday to the current user's company. (Admin or HR Officer only)
+    """
+    holiday = CompanyHoliday(company_id=employee_profile.company_id, **holiday_in.model_dump())
+    db.add(holiday)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="A holiday already exists on this date")
+    db.refresh(holiday)
+    invalidate_calendar(holiday.company_id, holiday.date.year)
+    return holiday
+
+@router.put("/holidays/{holiday_id}", response_model=CompanyHolidaySchema)
+def update_holiday(
+    holiday_id: int,
+    holiday_in: CompanyHolidayUpdate,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Update a holiday of the current user's company. (Admin or HR Officer only)
+    """
+    holiday = _get_company_holiday(db, holiday_id, employee_profile.company_id)
+    previous_year = holiday.date.year
+
+    update_data = holiday_in.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(holiday, field, value)
+
+    db.add(holiday)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="A holiday already exists on this date")
+    db.refresh(holiday)
+    invalidate_calendar(holiday.company_id, previous_year)
+    invalidate_calendar(holiday.company_id, holiday.date.year)
+    return holiday
+
+@router.delete("/holidays/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_holiday(
+    holiday_id: int,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Delete a holiday of the current user's company. (Admin or HR Officer only)
+    """
+    holiday = _get_company_holiday(db, holiday_id, employee_profile.company_id)
+    company_id, year = holiday.company_id, holiday.date.year
+    db.delete(holiday)
+    db.commit()
+    invalidate_calendar(company_id, year)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/work-week", response_model=WorkWeek)
+def get_work_week(
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the working weekdays of the current user's company (Monday = 0 ... Sunday = 6).
+    """
+    work_week = db.query(CompanyWorkWeek).filter(CompanyWorkWeek.company_id == employee_profile.company_id).first()
+    mask = work_week.working_weekdays if work_week else DEFAULT_WORKING_WEEKDAYS
+    return WorkWeek(working_weekdays=[weekday for weekday in range(7) if mask >> weekday & 1])
+
+@router.put("/work-week", response_model=WorkWeek)
+def update_work_week(
+    work_week_in: WorkWeek,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Set the working weekdays of the current user's company (Monday = 0 ... Sunday = 6). (Admin or HR Officer only)
+    """
+    if any(weekday < 0 or weekday > 6 for weekday in work_week_in.working_weekdays):
+        raise HTTPException(status_code=400, detail="Weekdays must be between 0 (Monday) and 6 (Sunday)")
+    mask = 0
+    for weekday in work_week_in.working_weekdays:
+        mask |= 1 << weekday
+
+    work_week = db.query(CompanyWorkWeek).filter(CompanyWorkWeek.company_id == employee_profile.company_id).first()
+    if not work_week:
+        work_week = CompanyWorkWeek(company_id=employee_profile.company_id)
+    work_week.working_weekdays = mask
+    db.add(work_week)
+    db.commit()
+    invalidate_calendar(employee_profile.company_id)
+    return WorkWeek(working_weekdays=sorted(set(work_week_in.working_weekdays)))
+
+@router.get("/working-days", response_model=WorkingDays)
+def get_working_days(
+    start_date: date,
+    end_date: date,
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
+    db: Session = Depends(get_db),
+):
+    """
+    Count the working days between two dates (inclusive) in the current user's company calendar.
+    The range may touch at most CALENDAR_MAX_RANGE_YEARS calendar years.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    # Every year in the range is compiled and cached, so the span is bounded
+    if end_date.year - start_date.year >= settings.CALENDAR_MAX_RANGE_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The range may span at most {settings.CALENDAR_MAX_RANGE_YEARS} calendar years",
+        )
+    return WorkingDays(
+        start_date=start_date,
+        end_date=end_date,
+        working_days=count_working_days(db, employee_profile.company_id, start_date, end_date),
+    )
@@ -2,9 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel # Added this import
 from app.database import get_db
-from app.models import User, EmployeeProfile, Attendance, LeaveBalance, UserRole, LeaveRequest, LeaveStatus
-from app.schemas import EmployeeProfile as EmployeeProfileSchema, Attendance as AttendanceSchema, LeaveBalance as LeaveBalanceSchema
-from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.models import User, EmployeeProfile, Attendance, AttendanceMonthlyRollup, DashboardCounter, LeaveBalance, UserRole, LeaveRequest, LeaveStatus
+from app.schemas import EmployeeProfile as EmployeeProfileSchema, Attendance as AttendanceSchema, LeaveBalance as LeaveBalanceSchema, AttendanceMonthlyRollup as AttendanceMonthlyRollupSchema, AttendanceMonthSummary
+from app.auth.dependencies import get_current_active_user, get_current_employee_profile, get_current_active_user_with_roles
+from app.api.caching import conditional_get
+from app.services.dashboard_service import get_dashboard_counters, on_leave_counter, reconcile_dashboard_counters, EMPLOYEE_COUNT, ACTIVE_USER_COUNT, PENDING_LEAVE_REQUEST_COUNT
+from app.services.leave_interval_service import employees_on_leave
+from app.services.attendance_rollup_service import get_month_summary
 from datetime import date
 from typing import List, Optional
 
@@ -14,27 +18,26 @@ class EmployeeDashboardSummary(BaseModel):
     profile: EmployeeProfileSchema
     today_attendance: Optional[AttendanceSchema] = None
     leave_balances: List[LeaveBalanceSchema]
+    on_leave_today: bool = False
+    month_attendance: Optional[AttendanceMonthlyRollupSchema] = None
     # recent_activity: List[ActivitySchema] # Assuming ActivitySchema would be defined later
 
 class AdminDashboardSummary(BaseModel):
     employee_count: int
     active_employee_count: int
     pending_leave_requests_count: int
-    # attendance_summary: Optional[dict] = None # To be implemented
+    on_leave_today_count: int = 0
+    attendance_summary: Optional[AttendanceMonthSummary] = None # Totals for the current month
     # recent_activities: List[ActivitySchema] # To be implemented
 
 @router.get("/me", response_model=EmployeeDashboardSummary)
 def get_employee_dashboard_summary(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve dashboard data for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     today_attendance = db.query(Attendance).filter(
         Attendance.employee_profile_id == employee_profile.id,
         Attendance.date == date.today()
@@ -45,27 +48,64 @@ def get_employee_dashboard_summary(
         LeaveBalance.year == date.today().year
     ).all()
 
+    month_attendance = db.query(AttendanceMonthlyRollup).filter(
+        AttendanceMonthlyRollup.employee_profile_id == employee_profile.id,
+        AttendanceMonthlyRollup.year == date.today().year,
+        AttendanceMonthlyRollup.month == date.today().month
+    ).first()
+
     return EmployeeDashboardSummary(
         profile=employee_profile,
         today_attendance=today_attendance,
         leave_balances=leave_balances,
+        on_leave_today=employee_profile.id in employees_on_leave(db, employee_profile_ids=[employee_profile.id]),
+        month_attendance=month_attendance,
         # recent_activity=[] # Placeholder
     )
 
-@router.get("/admin", response_model=AdminDashboardSummary)
+# The tables the admin dashboard is read from, for its ETag
+ADMIN_DASHBOARD_TABLES = (DashboardCounter.__tablename__, LeaveRequest.__tablename__, AttendanceMonthlyRollup.__tablename__)
+
+@router.get("/admin", response_model=AdminDashboardSummary, dependencies=[Depends(conditional_get(
+    ADMIN_DASHBOARD_TABLES, get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER]),
+))])
 def get_admin_dashboard_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
 ):
     """
     Retrieve dashboard data for administrators and HR officers.
+    Reads the incrementally maintained counters instead of counting the source tables.
+    The month's attendance totals are the exception: they are summed from the monthly
+    rollups (one indexed row per employee), since a company-wide counter would be a
+    row updated by every check-in. The ETag spares repeated polls that sum.
     """
-    employee_count = db.query(EmployeeProfile).count()
-    active_employee_count = db.query(User).filter(User.is_active == True).count()
-    pending_leave_requests_count = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.PENDING).count()
-    
+    today = date.today()
+    counters = get_dashboard_counters(db, today)
+
+    return AdminDashboardSummary(
+        employee_count=counters[EMPLOYEE_COUNT],
+        active_employee_count=counters[ACTIVE_USER_COUNT],
+        pending_leave_requests_count=counters[PENDING_LEAVE_REQUEST_COUNT],
+        on_leave_today_count=counters[on_leave_counter(today)],
+        attendance_summary=get_month_summary(db, today.year, today.month),
+    )
+
+@router.post("/admin/reconcile", response_model=AdminDashboardSummary)
+def reconcile_admin_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN])),
+):
+    """
+    Recompute the admin dashboard counters from the source tables. (Admin only)
+    """
+    today = date.today()
+    counters = reconcile_dashboard_counters(db, today)
+
     return AdminDashboardSummary(
-        employee_count=employee_count,
-        active_employee_count=active_employee_count,
-        pending_leave_requests_count=pending_leave_requests_count,
+        employee_count=counters[EMPLOYEE_COUNT],
+        active_employee_count=counters[ACTIVE_USER_COUNT],
+        pending_leave_requests_count=counters[PENDING_LEAVE_REQUEST_COUNT],
+        on_leave_today_count=counters[on_leave_counter(today)],
+        attendance_summary=get_month_summary(db, today.year, today.month),
     )
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import extract, exc
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import exc
 from typing import List
-import shutil
 import secrets
 import string
 from pathlib import Path
@@ -10,10 +10,20 @@ from datetime import date
 from app.database import get_db
 from app.models import User, EmployeeProfile, UserRole, BankDetail, Skill, EmployeeSkill, Certification, Attendance, LeaveRequest, LeaveStatus, UserSettings, LeaveBalance, LeaveType, Company
 from decimal import Decimal
-from app.schemas import EmployeeProfile as EmployeeProfileSchema, EmployeeProfileUpdate, BankDetail as BankDetailSchema, BankDetailCreate, BankDetailUpdate, Skill as SkillSchema, EmployeeSkillCreate, Certification as CertificationSchema, CertificationCreate, CertificationUpdate, EmployeeListResponse, EmployeeCreateBasic, EmployeeBasicResponse, EmployeeProfileMeResponse
-from app.auth.security import get_password_hash
-
-from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.schemas import EmployeeProfile as EmployeeProfileSchema, EmployeeProfileUpdate, BankDetail as BankDetailSchema, BankDetailCreate, BankDetailUpdate, Skill as SkillSchema, EmployeeSkillCreate, Certification as CertificationSchema, CertificationCreate, CertificationUpdate, EmployeeListResponse, EmployeeCreateBasic, EmployeeBasicResponse, EmployeeProfileMeResponse, EmployeeBulkCreateResponse
+from app.auth.hashing import hash_password_async, hash_passwords_async
+from app.config import settings
+from app.services.employee_status_service import resolve_employee_statuses
+from app.services.dashboard_service import increment_counter, EMPLOYEE_COUNT, ACTIVE_USER_COUNT
+from app.services.employee_id_service import allocate_login_id
+from app.services.upload_service import read_body, save_upload, IMAGE_TYPES
+from app.services.employee_onboarding_service import (
+    DEFAULT_LEAVE_ALLOWANCES, ROW_CREATED, ROW_SKIPPED, ROW_INVALID,
+    company_id_for_user, parse_employee_rows, validate_employee_rows, create_employees_bulk,
+)
+
+from app.auth.dependencies import get_current_active_user, get_current_employee_profile, get_current_active_user_with_roles
+from app.api.caching import conditional_get
 
 router = APIRouter()
 
@@ -21,7 +31,7 @@ UPLOAD_DIR = Path("static/profile_pictures")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.post("/", response_model=EmployeeBasicResponse, status_code=status.HTTP_201_CREATED)
-def create_employee(
+async def create_employee(
     employee_in: EmployeeCreateBasic,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
@@ -30,52 +40,90 @@ def create_employee(
     Create a new employee with basic information.
     Auto-generates Login ID and Password.
     """
-    # 1. Check if email already exists
-    if db.query(User).filter(User.email == employee_in.work_email).first():
+    # Refuse a registered email before spending a hash on it; create_employee_records
+    # checks again for a concurrent registration
+    await run_in_threadpool(ensure_email_available, db, employee_in.work_email)
+    # Generate the password and hash it in the password hashing pool, then run the
+    # database work in the threadpool
+    password = generate_password()
+    hashed_password = await hash_password_async(password)
+    return await run_in_threadpool(create_employee_records, db, employee_in, current_user, password, hashed_password)
+
+@router.post("/bulk", response_model=EmployeeBulkCreateResponse)
+async def bulk_create_employees(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Create many employees at once from a JSON list or a CSV file of EmployeeCreateBasic records.
+    Every record is validated first; the valid ones are created in one transaction and the
+    result of each row, with the generated credentials, is returned. Records whose email is
+    already registered are skipped, so an interrupted import can be sent again as is.
+    """
+    body = await read_body(request, settings.EMPLOYEE_BULK_MAX_BYTES)
+    raw_rows = parse_employee_rows(body, request.headers.get("content-type", ""))
+    if len(raw_rows) > settings.EMPLOYEE_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.EMPLOYEE_BULK_MAX_ROWS} employees can be imported at once",
+        )
+
+    to_create, results = await run_in_threadpool(validate_employee_rows, db, raw_rows)
+    company_id = await run_in_threadpool(company_id_for_user, db, current_user)
+
+    passwords = [generate_password() for _ in to_create]
+    hashed_passwords = await hash_passwords_async(passwords)
+    employees = [employee_in for _, employee_in in to_create]
+    try:
+        login_ids = await run_in_threadpool(create_employees_bulk, db, employees, hashed_passwords, company_id)
+    except exc.IntegrityError:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some of these employees were registered while the import ran; send it again to create the rest",
+        )
+
+    for (row, employee_in), login_id, password in zip(to_create, login_ids, passwords):
+        results[row] = {
+            "row": row, "work_email": employee_in.work_email, "status": ROW_CREATED,
+            "employee_id": login_id, "password": password,
+        }
+    ordered = [results[row] for row in sorted(results)]
+    return EmployeeBulkCreateResponse(
+        created=sum(result["status"] == ROW_CREATED for result in ordered),
+        skipped=sum(result["status"] == ROW_SKIPPED for result in ordered),
+        invalid=sum(result["status"] == ROW_INVALID for result in ordered),
+        results=ordered,
+    )
+
+def generate_password(length: int = 12) -> str:
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    return ''.join(secrets.choice(alphabet) for i in range(length))
+
+def ensure_email_available(db: Session, email: str) -> None:
+    if db.query(User.id).filter(User.email == email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
+def create_employee_records(
+    db: Session,
+    employee_in: EmployeeCreateBasic,
+    current_user: User,
+    password: str,
+    hashed_password: str,
+) -> EmployeeBasicResponse:
+    """
+    Creates the User, UserSettings, EmployeeProfile and default leave balances for a new employee.
+    """
+    # 1. Check if email already exists
+    ensure_email_available(db, employee_in.work_email)
+
     # 2. Generate Login ID
     # Format: OI + First 2 First + First 2 Last + Year + Serial
     # Example: OIJODO20220001
-    
-    first_part = employee_in.first_name[:2].upper()
-    last_part = employee_in.last_name[:2].upper() if employee_in.last_name else "XX"
-    year = employee_in.joining_date.year
-    
-    # Find max serial for this year
-    # We look for employees joined in this year
-    employees_this_year = db.query(EmployeeProfile).filter(extract('year', EmployeeProfile.joining_date) == year).all()
-    
-    max_serial = 0
-    for emp in employees_this_year:
-        # Try to extract serial from the end of employee_id
-        # Assuming format ends with YYYYNNNN
-        try:
-            # ID might be OIJODO20220001
-            # Last 4 digits are serial
-            serial_str = emp.employee_id[-4:]
-            if serial_str.isdigit():
-                max_serial = max(max_serial, int(serial_str))
-        except:
-            pass
-            
-    new_serial = max_serial + 1
-    serial_str = f"{new_serial:04d}"
-    
-    login_id = f"OI{first_part}{last_part}{year}{serial_str}"
-    
-    # Ensure uniqueness of login_id (just in case)
-    while db.query(EmployeeProfile).filter(EmployeeProfile.employee_id == login_id).first():
-        new_serial += 1
-        serial_str = f"{new_serial:04d}"
-        login_id = f"OI{first_part}{last_part}{year}{serial_str}"
+    login_id = allocate_login_id(db, employee_in.first_name, employee_in.last_name, employee_in.joining_date.year)
 
-    # 3. Generate Password
-    alphabet = string.ascii_letters + string.digits + string.punctuation
-    password = ''.join(secrets.choice(alphabet) for i in range(12))
-    hashed_password = get_password_hash(password)
-
-    # 4. Create User
+    # 3. Create User
     # We use work_email as the User.email
     db_user = User(
         email=employee_in.work_email,
@@ -84,25 +132,18 @@ def create_employee(
         is_active=True
     )
     db.add(db_user)
+    increment_counter(db, ACTIVE_USER_COUNT)
     db.commit()
     db.refresh(db_user)
     
-    # 5. Create UserSettings
+    # 4. Create UserSettings
     user_settings = UserSettings(user_id=db_user.id)
     db.add(user_settings)
     
-    # 6. Get Company ID (from current user's profile)
-    # HR/Admin must have a profile and company
-    hr_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if hr_profile:
-        company_id = hr_profile.company_id
-    else:
-        # Fallback if admin has no profile (should not happen in normal flow)
-        # Try to find any company or create one? 
-        # For now, assume ID 1 exists or fail.
-        company_id = 1 
+    # 5. Get Company ID (from current user's profile)
+    company_id = company_id_for_user(db, current_user)
 
-    # 7. Create EmployeeProfile
+    # 6. Create EmployeeProfile
     new_profile = EmployeeProfile(
         user_id=db_user.id,
         company_id=company_id,
@@ -116,17 +157,13 @@ def create_employee(
         # personal_email is optional, we don't set it from work_email
     )
     db.add(new_profile)
+    increment_counter(db, EMPLOYEE_COUNT)
     db.commit()
     db.refresh(new_profile)
     
-    # 8. Seed default Leave Balances for the current year
+    # 7. Seed default Leave Balances for the current year
     current_year = employee_in.joining_date.year
-    leave_defaults = [
-        (LeaveType.PAID, 24),
-        (LeaveType.SICK, 10),
-        (LeaveType.UNPAID, 0)
-    ]
-    for leave_type, total in leave_defaults:
+    for leave_type, total in DEFAULT_LEAVE_ALLOWANCES:
         new_balance = LeaveBalance(
             employee_profile_id=new_profile.id,
             leave_type=leave_type,
@@ -145,7 +182,10 @@ def create_employee(
         message="Employee created successfully. Please save these credentials."
     )
 
-@router.get("/", response_model=List[EmployeeListResponse])
+@router.get("/", response_model=List[EmployeeListResponse], dependencies=[Depends(conditional_get(
+    [EmployeeProfile.__tablename__, User.__tablename__, Attendance.__tablename__, LeaveRequest.__tablename__],
+    get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER]),
+))])
 def read_all_employees(
     skip: int = 0,
     limit: int = 100,
@@ -155,46 +195,22 @@ def read_all_employees(
     """
     Retrieve all employees with status. (Admin or HR Officer only)
     """
-    employees = db.query(EmployeeProfile).offset(skip).limit(limit).all()
-    
+    employees = db.query(EmployeeProfile).options(joinedload(EmployeeProfile.user)).order_by(EmployeeProfile.id).offset(skip).limit(limit).all()
+
+    # Resolve today's status for the whole page in a constant number of queries
+    statuses = resolve_employee_statuses(db, [emp.id for emp in employees])
+
     result = []
-    today = date.today()
-    
     for emp in employees:
         # Get email from User
         email = emp.user.email if emp.user else ""
-        
-        # Determine status
-        status_val = "pending"
-        
-        # Check attendance
-        attendance = db.query(Attendance).filter(
-            Attendance.employee_profile_id == emp.id,
-            Attendance.date == today
-        ).first()
-        
-        if attendance:
-            status_val = attendance.status.value if hasattr(attendance.status, 'value') else str(attendance.status)
-        else:
-            # Check leave
-            leave = db.query(LeaveRequest).filter(
-                LeaveRequest.employee_profile_id == emp.id,
-                LeaveRequest.start_date <= today,
-                LeaveRequest.end_date >= today,
-                LeaveRequest.status == LeaveStatus.APPROVED
-            ).first()
-            
-            if leave:
-                status_val = "leave"
-            else:
-                status_val = "absent" 
-        
+
         # Create response object
         emp_profile = EmployeeProfileSchema.model_validate(emp)
         emp_data = EmployeeListResponse(
             **emp_profile.model_dump(),
             email=email,
-            status=status_val
+            status=statuses.get(emp.id, "absent")
         )
         result.append(emp_data)
         
@@ -202,16 +218,12 @@ def read_all_employees(
 
 @router.get("/me", response_model=EmployeeProfileMeResponse)
 def read_my_profile(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve the current employee's profile.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-    
     # Get company details
     company = db.query(Company).filter(Company.id == employee_profile.company_id).first()
     company_name = company.name if company else None
@@ -224,7 +236,7 @@ def read_my_profile(
     # Create response with email from user and company info
     return EmployeeProfileMeResponse(
         **EmployeeProfileSchema.model_validate(employee_profile).model_dump(),
-        email=current_user.email,
+        email=employee_profile.user.email,
         company_name=company_name,
         company_logo=company_logo
     )
@@ -293,35 +305,23 @@ def update_employee_profile(
 @router.post("/me/profile-picture", response_model=EmployeeProfileSchema)
 async def upload_profile_picture(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Upload a profile picture for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
-    # Validate file type
-    if file.content_type not in ["image/jpeg", "image/png", "image/gif"]:
-        raise HTTPException(status_code=400, detail="Invalid file type. Only JPEG, PNG, GIF allowed.")
-
-    # Generate a unique filename
-    file_extension = file.filename.split(".")[-1]
-    file_name = f"{employee_profile.id}_profile.{file_extension}"
-    file_path = UPLOAD_DIR / file_name
+    upload = await save_upload(
+        file, UPLOAD_DIR, IMAGE_TYPES, "Invalid file type. Only JPEG, PNG, GIF allowed.",
+        name=f"{employee_profile.id}_profile",
+    )
+    return await run_in_threadpool(set_profile_picture, db, employee_profile, upload["url"])
 
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Update profile_picture field in the database
-    employee_profile.profile_picture = f"/static/profile_pictures/{file_name}"
+def set_profile_picture(db: Session, employee_profile: EmployeeProfile, url: str) -> EmployeeProfile:
+    employee_profile.profile_picture = url
     db.add(employee_profile)
     db.commit()
     db.refresh(employee_profile)
-
     return employee_profile
 
 # --- Bank Details CRUD ---
@@ -329,16 +329,12 @@ async def upload_profile_picture(
 @router.post("/me/bank-details", response_model=BankDetailSchema, status_code=status.HTTP_201_CREATED)
 def create_my_bank_details(
     bank_detail_in: BankDetailCreate,
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Add bank details for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     if bank_detail_in.employee_profile_id != employee_profile.id:
         raise HTTPException(status_code=403, detail="Not authorized to add bank details for this employee profile")
 
@@ -350,16 +346,12 @@ def create_my_bank_details(
 
 @router.get("/me/bank-details", response_model=List[BankDetailSchema])
 def read_my_bank_details(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve bank details for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-    
     return employee_profile.bank_details
 
 @router.get("/{employee_profile_id}/bank-details", response_model=List[BankDetailSchema])
@@ -432,16 +424,12 @@ def delete_bank_details(
 @router.post("/me/skills", response_model=SkillSchema, status_code=status.HTTP_201_CREATED)
 def add_my_skill(
     skill_in: str, # Assuming skill name is passed, and we need to create it if it doesn't exist
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Add a skill to the current employee's profile. Creates the skill if it doesn't exist.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     skill = db.query(Skill).filter(Skill.name == skill_in).first()
     if not skill:
         skill = Skill(name=skill_in)
@@ -466,16 +454,12 @@ def add_my_skill(
 @router.delete("/me/skills/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_my_skill(
     skill_id: int,
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Remove a skill from the current employee's profile.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     employee_skill = db.query(EmployeeSkill).filter(
         EmployeeSkill.employee_profile_id == employee_profile.id,
         EmployeeSkill.skill_id == skill_id
@@ -489,16 +473,12 @@ def remove_my_skill(
 
 @router.get("/me/skills", response_model=List[SkillSchema])
 def list_my_skills(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     List skills for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-    
     skills = [es.skill for es in employee_profile.employee_skills]
     return skills
 
@@ -576,16 +556,12 @@ def remove_skill_from_employee(
 @router.post("/me/certifications", response_model=CertificationSchema, status_code=status.HTTP_201_CREATED)
 def add_my_certification(
     certification_in: CertificationCreate,
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Add a certification for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     # Ensure the certification being added belongs to the current employee's profile
     if certification_in.employee_profile_id != employee_profile.id:
         raise HTTPException(status_code=403, detail="Not authorized to add certification for this employee profile")
@@ -598,16 +574,12 @@ def add_my_certification(
 
 @router.get("/me/certifications", response_model=List[CertificationSchema])
 def list_my_certifications(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     List certifications for the current employee.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-    
     return employee_profile.certifications
 
 @router.get("/{employee_profile_id}/certifications", response_model=List[CertificationSchema])
@@ -1,28 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import enum
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional
 from app.database import get_db
 from app.models import User, EmployeeProfile, LeaveRequest, LeaveBalance, UserRole, LeaveStatus, LeaveType
-from app.schemas import LeaveRequest as LeaveRequestSchema, LeaveRequestCreate, LeaveRequestUpdate, LeaveBalance as LeaveBalanceSchema
-from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.schemas import LeaveRequest as LeaveRequestSchema, LeaveRequestCreate, LeaveRequestUpdate, LeaveBalance as LeaveBalanceSchema, BulkReviewRequest, BulkReviewResponse
+from app.auth.dependencies import get_current_active_user, get_current_employee_profile, get_current_active_user_with_roles
+from app.services.dashboard_service import increment_counter, record_leave_approvals, PENDING_LEAVE_REQUEST_COUNT
+from app.api.pagination import paginate_keyset
+from app.api.caching import conditional_get
+from app.services.calendar_service import count_working_days
+from app.services.leave_interval_service import find_overlapping_leave
+from app.services.leave_service import transition_leave_request, debit_leave_balance, is_unpaid_leave
+from app.services.bulk_review_service import review_leave_requests, check_review_batch_size, summarize_review
 
 router = APIRouter()
 
+class LeaveSortField(str, enum.Enum):
+    CREATED_AT = "created_at"
+    START_DATE = "start_date"
+    END_DATE = "end_date"
+
+class SortOrder(str, enum.Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+LEAVE_SORT_COLUMNS = {
+    LeaveSortField.CREATED_AT: LeaveRequest.created_at,
+    LeaveSortField.START_DATE: LeaveRequest.start_date,
+    LeaveSortField.END_DATE: LeaveRequest.end_date,
+}
+
 @router.post("/apply", response_model=LeaveRequestSchema, status_code=status.HTTP_201_CREATED)
 def apply_for_leave(
     leave_request_in: LeaveRequestCreate,
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Submit a new leave request.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     # Check if the leave request is for the current employee's profile
     if leave_request_in.employee_profile_id != employee_profile.id:
         raise HTTPException(status_code=403, detail="Not authorized to submit leave for this employee profile")
@@ -31,16 +50,23 @@ def apply_for_leave(
     if leave_request_in.start_date > leave_request_in.end_date:
         raise HTTPException(status_code=400, detail="Start date cannot be after end date")
 
-    # Calculate total days (simple calculation, can be made more complex to exclude weekends/holidays)
-    delta = leave_request_in.end_date - leave_request_in.start_date
-    total_days = Decimal(delta.days + 1) # +1 to include both start and end dates
+    # Count the working days in the range; weekends and company holidays are not charged
+    total_days = Decimal(count_working_days(
+        db, employee_profile.company_id, leave_request_in.start_date, leave_request_in.end_date
+    ))
+    if total_days == 0:
+        raise HTTPException(status_code=400, detail="The selected dates contain no working days")
 
+    # Reject requests overlapping one of the employee's pending or approved requests
+    overlapping = find_overlapping_leave(db, employee_profile.id, leave_request_in.start_date, leave_request_in.end_date)
+    if overlapping:
+        raise HTTPException(
+            status_code=400,
+            detail=f"These dates overlap your {overlapping.status.value} leave request from {overlapping.start_date} to {overlapping.end_date}",
+        )
 
-    # Check leave balance (skip for UNPAID)
-    # Use string comparison for robustness
-    is_unpaid = str(leave_request_in.leave_type.value if hasattr(leave_request_in.leave_type, 'value') else leave_request_in.leave_type) == "unpaid"
-    
-    if not is_unpaid:
+    # Check leave balance (skip for UNPAID); the balance is only charged on approval
+    if not is_unpaid_leave(leave_request_in.leave_type):
         leave_balance = db.query(LeaveBalance).filter(
             LeaveBalance.employee_profile_id == employee_profile.id,
             LeaveBalance.leave_type == leave_request_in.leave_type,
@@ -59,61 +85,88 @@ def apply_for_leave(
         reason=leave_request_in.reason
     )
     db.add(db_leave_request)
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT)
     db.commit()
     db.refresh(db_leave_request)
     return db_leave_request
 
 @router.get("/my-requests", response_model=List[LeaveRequestSchema])
 def get_my_leave_requests(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve the current employee's leave requests.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-
     leave_requests = db.query(LeaveRequest).filter(LeaveRequest.employee_profile_id == employee_profile.id).all()
     return leave_requests
 
-@router.get("/all", response_model=List[LeaveRequestSchema])
+@router.get("/all", response_model=List[LeaveRequestSchema], dependencies=[Depends(conditional_get(
+    [LeaveRequest.__tablename__, EmployeeProfile.__tablename__], get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER]),
+))])
 def get_all_leave_requests(
+    response: Response,
+    status_filter: Optional[LeaveStatus] = Query(None, alias="status"),
+    leave_type: Optional[LeaveType] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    department: Optional[str] = None,
+    employee_profile_id: Optional[int] = None,
+    sort: LeaveSortField = LeaveSortField.CREATED_AT,
+    order: SortOrder = SortOrder.DESC,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
 ):
     """
-    Get all leave requests (Pending, Approved, Rejected). (Admin or HR Officer only)
-    Returns leave requests with employee_code populated.
+    Get leave requests (Pending, Approved, Rejected), newest first by default. (Admin or HR Officer only)
+    Returns leave requests with employee_code populated. `date_from`/`date_to` select requests that
+    overlap the range. Without `limit` every matching request is returned; pass it to page through
+    them, the next page's cursor is returned in the X-Next-Cursor header.
     """
-    leaves = db.query(LeaveRequest).order_by(LeaveRequest.created_at.desc()).all()
-    
-    # Populate employee_code and employee_name for each leave request
+    query = db.query(
+        LeaveRequest.id,
+        LeaveRequest.employee_profile_id,
+        LeaveRequest.leave_type,
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.total_days,
+        LeaveRequest.reason,
+        LeaveRequest.status,
+        LeaveRequest.approver_id,
+        LeaveRequest.approved_at,
+        LeaveRequest.comments,
+        LeaveRequest.created_at,
+        EmployeeProfile.employee_id.label("employee_code"),
+        EmployeeProfile.first_name,
+        EmployeeProfile.last_name,
+    ).outerjoin(EmployeeProfile, EmployeeProfile.id == LeaveRequest.employee_profile_id)
+
+    if status_filter:
+        query = query.filter(LeaveRequest.status == status_filter)
+    if leave_type:
+        query = query.filter(LeaveRequest.leave_type == leave_type)
+    if date_from:
+        query = query.filter(LeaveRequest.end_date >= date_from)
+    if date_to:
+        query = query.filter(LeaveRequest.start_date <= date_to)
+    if department:
+        query = query.filter(EmployeeProfile.department == department)
+    if employee_profile_id:
+        query = query.filter(LeaveRequest.employee_profile_id == employee_profile_id)
+
+    rows = paginate_keyset(
+        query, [LEAVE_SORT_COLUMNS[sort], LeaveRequest.id], cursor, limit, response,
+        descending=order == SortOrder.DESC,
+    )
+
     result = []
-    for leave in leaves:
-        employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.id == leave.employee_profile_id).first()
-        employee_name = None
-        if employee_profile:
-            # Use first + last name from profile when available
-            employee_name = f"{employee_profile.first_name} {employee_profile.last_name}".strip()
-
-        leave_dict = {
-            "id": leave.id,
-            "employee_profile_id": leave.employee_profile_id,
-            "employee_code": employee_profile.employee_id if employee_profile else None,
-            "employee_name": employee_name,
-            "leave_type": leave.leave_type,
-            "start_date": leave.start_date,
-            "end_date": leave.end_date,
-            "total_days": leave.total_days,
-            "reason": leave.reason,
-            "status": leave.status,
-            "approver_id": leave.approver_id,
-            "approved_at": leave.approved_at,
-            "comments": leave.comments,
-            "created_at": leave.created_at,
-        }
+    for row in rows:
+        leave_dict = row._asdict()
+        first_name, last_name = leave_dict.pop("first_name"), leave_dict.pop("last_name")
+        # Use first + last name from profile when available
+        leave_dict["employee_name"] = f"{first_name} {last_name}".strip() if first_name is not None else None
         result.append(leave_dict)
     
     return result
@@ -129,6 +182,30 @@ def get_pending_leave_requests(
     pending_requests = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.PENDING).all()
     return pending_requests
 
+@router.post("/bulk/approve", response_model=BulkReviewResponse)
+def bulk_approve_leave_requests(
+    review_in: BulkReviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Approve many pending leave requests in one transaction, reporting the outcome of each. (Admin or HR Officer only)
+    """
+    check_review_batch_size(review_in.ids)
+    return summarize_review(review_leave_requests(db, review_in.ids, True, current_user.id, review_in.comments))
+
+@router.post("/bulk/reject", response_model=BulkReviewResponse)
+def bulk_reject_leave_requests(
+    review_in: BulkReviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Reject many pending leave requests in one transaction, reporting the outcome of each. (Admin or HR Officer only)
+    """
+    check_review_batch_size(review_in.ids)
+    return summarize_review(review_leave_requests(db, review_in.ids, False, current_user.id, review_in.comments))
+
 @router.put("/{leave_id}/approve", response_model=LeaveRequestSchema)
 def approve_leave_request(
     leave_id: int,
@@ -145,35 +222,38 @@ def approve_leave_request(
     if leave_request.status != LeaveStatus.PENDING:
         raise HTTPException(status_code=400, detail="Only pending leave requests can be approved")
 
-    # Check if this is unpaid leave (skip balance check for unpaid)
-    is_unpaid = str(leave_request.leave_type.value if hasattr(leave_request.leave_type, 'value') else leave_request.leave_type) == "unpaid"
+    # Requests filed before overlaps were rejected may still collide with approved leave
+    if find_overlapping_leave(
+        db, leave_request.employee_profile_id, leave_request.start_date, leave_request.end_date,
+        statuses=(LeaveStatus.APPROVED,), exclude_id=leave_request.id,
+    ):
+        raise HTTPException(status_code=400, detail="This request overlaps leave that is already approved")
 
-    leave_balance = None
-    if not is_unpaid:
-        # Update leave balance
-        leave_balance = db.query(LeaveBalance).filter(
-            LeaveBalance.employee_profile_id == leave_request.employee_profile_id,
-            LeaveBalance.leave_type == leave_request.leave_type,
-            LeaveBalance.year == leave_request.start_date.year
-        ).first()
+    # Recount the working days in case holidays changed since the request was filed
+    total_days = leave_request.total_days
+    company_id = db.query(EmployeeProfile.company_id).filter(EmployeeProfile.id == leave_request.employee_profile_id).scalar()
+    if company_id is not None:
+        total_days = Decimal(count_working_days(db, company_id, leave_request.start_date, leave_request.end_date))
 
-        if not leave_balance or leave_balance.remaining_days < leave_request.total_days:
-            raise HTTPException(status_code=400, detail="Insufficient leave balance to approve this request")
+    # Conditional updates: a concurrent approval of the same request, or of another
+    # request drawing on the same balance, cannot both succeed
+    if not transition_leave_request(
+        db, leave_request.id, LeaveStatus.PENDING, LeaveStatus.APPROVED,
+        approver_id=current_user.id, approved_at=datetime.now(), total_days=total_days,
+    ):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This leave request has already been processed")
 
-        leave_balance.used_days += leave_request.total_days
-        leave_balance.remaining_days -= leave_request.total_days
-        db.add(leave_balance)
+    # Unpaid leave is not charged to a balance
+    if not is_unpaid_leave(leave_request.leave_type):
+        if not debit_leave_balance(db, leave_request, total_days, created_by_id=current_user.id):
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Insufficient leave balance to approve this request")
 
-    # Update leave request status
-    leave_request.status = LeaveStatus.APPROVED
-    leave_request.approver_id = current_user.id
-    leave_request.approved_at = datetime.now()
-    db.add(leave_request)
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT, -1)
+    record_leave_approvals(db, [(leave_request.employee_profile_id, leave_request.start_date, leave_request.end_date)])
     db.commit()
     db.refresh(leave_request)
-    if leave_balance:
-        db.refresh(leave_balance) # Refresh balance to reflect changes
-
     return leave_request
 
 @router.put("/{leave_id}/reject", response_model=LeaveRequestSchema)
@@ -193,12 +273,13 @@ def reject_leave_request(
     if leave_request.status != LeaveStatus.PENDING:
         raise HTTPException(status_code=400, detail="Only pending leave requests can be rejected")
 
-    leave_request.status = LeaveStatus.REJECTED
-    leave_request.approver_id = current_user.id
-    leave_request.approved_at = datetime.now()
+    values = {"approver_id": current_user.id, "approved_at": datetime.now()}
     if rejection_in and rejection_in.comments:
-        leave_request.comments = rejection_in.comments
-    db.add(leave_request)
+        values["comments"] = rejection_in.comments
+    if not transition_leave_request(db, leave_request.id, LeaveStatus.PENDING, LeaveStatus.REJECTED, **values):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This leave request has already been processed")
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT, -1)
     db.commit()
     db.refresh(leave_request)
     return leave_request
@@ -223,8 +304,10 @@ def cancel_leave_request(
     if leave_request.status != LeaveStatus.PENDING:
         raise HTTPException(status_code=400, detail="Only pending leave requests can be cancelled")
 
-    leave_request.status = LeaveStatus.CANCELLED
-    db.add(leave_request)
+    if not transition_leave_request(db, leave_request.id, LeaveStatus.PENDING, LeaveStatus.CANCELLED):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This leave request has already been processed")
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT, -1)
     db.commit()
     db.refresh(leave_request)
     return leave_request
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.auth.dependencies import get_current_active_user_with_roles
+from app.auth.token_cache import token_cache
+from app.metrics import metrics_registry
+from app.models import User, UserRole
+from app.services.activity_service import activity_log_writer
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics(current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN]))):
+    """
+    Request, query, token cache and activity log metrics in the Prometheus text format. (Admin only)
+    """
+    return PlainTextResponse(
+        metrics_registry.render({
+            "token_cache": token_cache.stats(),
+            "activity_log_writer": activity_log_writer.stats(),
+        }),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,115 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, false, or_
+from sqlalchemy.orm import Query
+
+# Keyset (cursor) pagination: instead of OFFSET, which makes the database walk and
+# discard every skipped row, each page continues after the sort key of the last row
+# of the previous page. List endpoints keep returning plain JSON arrays and hand out
+# the cursor for the next page in this header; it is absent on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encodes the sort key of the last row of a page into an opaque cursor."""
+    payload = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decodes a cursor back into the sort key values, converted to the Python type
+    of the matching column. Raises 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw_values, list) or len(raw_values) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        values = []
+        for column, raw in zip(columns, raw_values):
+            python_type = column.type.python_type
+            if raw is None:
+                values.append(None)
+            elif python_type is date:
+                values.append(date.fromisoformat(raw))
+            elif python_type is datetime:
+                values.append(datetime.fromisoformat(raw))
+            else:
+                values.append(python_type(raw))
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def _nullable(column: Any) -> bool:
+    return getattr(column, "nullable", True)
+
+def _order_by(column: Any, descending: bool):
+    """
+    NULLs sort as if greater than every value: last ascending, first descending.
+    Databases disagree on the default, so nullable columns spell it out.
+    """
+    ordered = column.desc() if descending else column.asc()
+    if not _nullable(column):
+        return ordered
+    return ordered.nulls_first() if descending else ordered.nulls_last()
+
+def _beyond(column: Any, value: Any, descending: bool):
+    """Rows whose `column` sorts strictly after `value`, in the order set by `_order_by`."""
+    if value is None:
+        return column.is_not(None) if descending else false()
+    if descending:
+        return column < value
+    if _nullable(column):
+        return or_(column > value, column.is_(None))
+    return column > value
+
+def after_cursor(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """
+    Builds the row-value comparison `(c1, c2, ...) > (v1, v2, ...)` (or `<` when
+    descending) as nested OR/AND terms, which every backend can match against an index.
+    A `column > value` comparison is never true for NULL, so nullable columns compare
+    NULLs explicitly.
+    """
+    column, value = columns[0], values[0]
+    beyond = _beyond(column, value, descending)
+    if len(columns) == 1:
+        return beyond
+    same = column.is_(None) if value is None else column == value
+    return or_(beyond, and_(same, after_cursor(columns[1:], values[1:], descending)))
+
+def paginate_keyset(
+    query: Query,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: Optional[int],
+    response: Response,
+    descending: bool = False,
+    offset: int = 0,
+) -> list:
+    """
+    Orders `query` by `columns` (which must end in a unique column), continues
+    after `cursor` and returns at most `limit` rows. If another page may follow,
+    its cursor is set on the response's X-Next-Cursor header. With no limit,
+    every remaining row is returned. `offset` is only honoured without a cursor,
+    for clients that still page with skip.
+    """
+    if cursor:
+        query = query.filter(after_cursor(columns, decode_cursor(cursor, columns), descending))
+    query = query.order_by(*[_order_by(column, descending) for column in columns])
+    if offset and not cursor:
+        query = query.offset(offset)
+    if limit is None:
+        return query.all()
+
+    rows = query.limit(limit).all()
+    if limit and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
-from app.models import User, EmployeeProfile, SalaryStructure, UserRole
-from app.schemas import SalaryStructure as SalaryStructureSchema, SalaryStructureCreate, SalaryStructureUpdate, SalaryPayroll
-from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.models import User, EmployeeProfile, SalaryStructure, UserRole, PayrollRun, PayrollRunEntry
+from app.schemas import SalaryStructure as SalaryStructureSchema, SalaryStructureCreate, SalaryStructureUpdate, SalaryPayroll, PayrollRun as PayrollRunSchema, PayrollRunCreate, PayrollRunEntry as PayrollRunEntrySchema
+from app.auth.dependencies import get_current_active_user, get_current_employee_profile, get_current_active_user_with_roles
 from app.services.salary_service import calculate_net_salary
+from app.services.payroll_service import get_payroll_projection, is_calendar_month, run_payroll
+from app.api.pagination import paginate_keyset
+from app.responses import FastJSONResponse, fast_json
 
 router = APIRouter()
 
@@ -57,23 +60,19 @@ def update_salary_structure(
 
 @router.get("/me", response_model=SalaryStructureSchema)
 def get_my_salary_structure(
-    current_user: User = Depends(get_current_active_user),
+    employee_profile: EmployeeProfile = Depends(get_current_employee_profile),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve the current employee's salary structure.
     """
-    employee_profile = db.query(EmployeeProfile).filter(EmployeeProfile.user_id == current_user.id).first()
-    if not employee_profile:
-        raise HTTPException(status_code=404, detail="Employee profile not found for this user")
-    
     salary_structure = db.query(SalaryStructure).filter(SalaryStructure.employee_profile_id == employee_profile.id).first()
     if not salary_structure:
         raise HTTPException(status_code=404, detail="Salary structure not found for this employee")
     
     return salary_structure
 
-@router.get("/all", response_model=List[SalaryPayroll])
+@router.get("/all", response_model=List[SalaryPayroll], response_class=FastJSONResponse)
 def get_all_payroll_data(
     skip: int = 0,
     limit: int = 100,
@@ -83,29 +82,70 @@ def get_all_payroll_data(
     """
     Retrieve all payroll data with computed gross and net salaries. (Admin or HR Officer only)
     """
-    salary_structures = db.query(SalaryStructure).offset(skip).limit(limit).all()
-    
-    payroll_data = []
-    for ss in salary_structures:
-        calculated_salary = calculate_net_salary(ss)
-        payroll_entry = SalaryPayroll(
-            id=ss.id,
-            employee_profile_id=ss.employee_profile_id,
-            basic_salary=ss.basic_salary,
-            hra=ss.hra,
-            standard_allowance=ss.standard_allowance,
-            performance_bonus=ss.performance_bonus,
-            lta=ss.lta,
-            fixed_allowance=ss.fixed_allowance,
-            professional_tax=ss.professional_tax,
-            pf_contribution=ss.pf_contribution,
-            gross_salary=calculated_salary["gross_salary"],
-            total_deductions=calculated_salary["total_deductions"],
-            net_salary=calculated_salary["net_salary"],
+    return fast_json(get_payroll_projection(db, skip=skip, limit=limit))
+
+@router.post("/payroll-runs", response_model=PayrollRunSchema, status_code=status.HTTP_201_CREATED)
+def create_payroll_run(
+    payroll_run_in: PayrollRunCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Run payroll for one calendar month, prorating pay by unpaid leave and absences,
+    and store the result. (Admin or HR Officer only)
+    """
+    if not is_calendar_month(payroll_run_in.period_start, payroll_run_in.period_end):
+        raise HTTPException(
+            status_code=400,
+            detail="The pay period must be one calendar month, from its first to its last day",
         )
-        payroll_data.append(payroll_entry)
-        
-    return payroll_data
+
+    return run_payroll(db, payroll_run_in.period_start, payroll_run_in.period_end, created_by_id=current_user.id)
+
+@router.get("/payroll-runs", response_model=List[PayrollRunSchema])
+def list_payroll_runs(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    List payroll runs, newest first. (Admin or HR Officer only)
+    """
+    return db.query(PayrollRun).order_by(PayrollRun.id.desc()).offset(skip).limit(limit).all()
+
+@router.get("/payroll-runs/{payroll_run_id}", response_model=PayrollRunSchema)
+def get_payroll_run(
+    payroll_run_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Retrieve a payroll run with its totals. (Admin or HR Officer only)
+    """
+    payroll_run = db.query(PayrollRun).filter(PayrollRun.id == payroll_run_id).first()
+    if not payroll_run:
+        raise HTTPException(status_code=404, detail="Payroll run not found")
+    return payroll_run
+
+@router.get("/payroll-runs/{payroll_run_id}/entries", response_model=List[PayrollRunEntrySchema])
+def get_payroll_run_entries(
+    payroll_run_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])),
+):
+    """
+    Retrieve the per-employee entries of a payroll run. (Admin or HR Officer only)
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    if not db.query(PayrollRun.id).filter(PayrollRun.id == payroll_run_id).first():
+        raise HTTPException(status_code=404, detail="Payroll run not found")
+
+    query = db.query(PayrollRunEntry).filter(PayrollRunEntry.payroll_run_id == payroll_run_id)
+    return paginate_keyset(query, [PayrollRunEntry.id], cursor, limit, response)
 
 @router.get("/{employee_profile_id}/slip", response_model=SalaryPayroll)
 def get_salary_slip_data(
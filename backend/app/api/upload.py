@@ -1,11 +1,8 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
-from typing import List
-import shutil
-import os
+from fastapi import APIRouter, UploadFile, File, Depends
 from pathlib import Path
-import uuid
 from app.auth.dependencies import get_current_active_user
 from app.models import User
+from app.services.upload_service import save_upload, IMAGE_TYPES, DOCUMENT_TYPES, JPEG, PNG, PDF
 
 router = APIRouter()
 
@@ -27,17 +24,7 @@ async def upload_profile_picture(
     """
     Upload a profile picture.
     """
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
-    
-    file_extension = os.path.splitext(file.filename)[1]
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = PROFILE_PICTURES_DIR / file_name
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    return {"url": f"/static/profile_pictures/{file_name}"}
+    return await save_upload(file, PROFILE_PICTURES_DIR, IMAGE_TYPES, "File must be an image")
 
 @router.post("/resume", response_model=dict)
 async def upload_resume(
@@ -47,18 +34,7 @@ async def upload_resume(
     """
     Upload a resume (PDF or Word doc).
     """
-    allowed_types = ["application/pdf", "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(status_code=400, detail="File must be a PDF or Word document")
-    
-    file_extension = os.path.splitext(file.filename)[1]
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = RESUMES_DIR / file_name
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    return {"url": f"/static/resumes/{file_name}"}
+    return await save_upload(file, RESUMES_DIR, DOCUMENT_TYPES, "File must be a PDF or Word document")
 
 @router.post("/certification", response_model=dict)
 async def upload_certification(
@@ -69,15 +45,4 @@ async def upload_certification(
     Upload a certification document/image.
     """
     # Allow images and PDFs
-    allowed_types = ["application/pdf", "image/jpeg", "image/png", "image/jpg"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(status_code=400, detail="File must be an image or PDF")
-    
-    file_extension = os.path.splitext(file.filename)[1]
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = CERTIFICATIONS_DIR / file_name
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    return {"url": f"/static/certifications/{file_name}"}
\ No newline at end of file
+    return await save_upload(file, CERTIFICATIONS_DIR, (PDF, JPEG, PNG), "File must be an image or PDF")
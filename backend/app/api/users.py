@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from datetime import date
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
-from app.models import User, UserRole, UserSettings # Added UserSettings
+from app.models import User, UserRole, UserSettings, LeaveRequest, LeaveStatus # Added UserSettings
 from app.schemas import UserCreate, UserUpdate, User as UserSchema
 from app.auth.security import get_password_hash
 from app.auth.dependencies import get_current_active_user, get_current_active_user_with_roles
+from app.auth.token_cache import token_cache
+from app.services.dashboard_service import increment_counter, on_leave_counter, EMPLOYEE_COUNT, ACTIVE_USER_COUNT, PENDING_LEAVE_REQUEST_COUNT
+from app.services.leave_interval_service import employees_on_leave
 
 router = APIRouter()
 
@@ -46,6 +50,8 @@ def create_user(
         is_active=user.is_active,
     )
     db.add(db_user)
+    if user.is_active:
+        increment_counter(db, ACTIVE_USER_COUNT)
     db.commit()
     db.refresh(db_user)
     
@@ -98,12 +104,19 @@ def update_user(
         update_data["hashed_password"] = get_password_hash(update_data["password"])
         del update_data["password"]
         
+    was_active = bool(db_user.is_active)
     for field, value in update_data.items():
         setattr(db_user, field, value)
+
+    if bool(db_user.is_active) != was_active:
+        increment_counter(db, ACTIVE_USER_COUNT, 1 if db_user.is_active else -1)
         
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+
+    # Role, status or email may have changed, so cached tokens must be re-verified
+    token_cache.invalidate_user(db_user.id)
     return db_user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -119,6 +132,20 @@ def delete_user(
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # Deleting the user cascades to its profile and the profile's leave requests
+    if db_user.is_active:
+        increment_counter(db, ACTIVE_USER_COUNT, -1)
+    if db_user.employee_profile:
+        increment_counter(db, EMPLOYEE_COUNT, -1)
+        pending_leaves = db.query(LeaveRequest).filter(
+            LeaveRequest.employee_profile_id == db_user.employee_profile.id,
+            LeaveRequest.status == LeaveStatus.PENDING
+        ).count()
+        increment_counter(db, PENDING_LEAVE_REQUEST_COUNT, -pending_leaves)
+        on_leave = employees_on_leave(db, employee_profile_ids=[db_user.employee_profile.id])
+        increment_counter(db, on_leave_counter(date.today()), -len(on_leave))
+
     db.delete(db_user)
     db.commit()
+    token_cache.invalidate_user(user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,72 @@
+from typing import List
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.database_async import AsyncSession, get_async_db
+from app.models import User, UserRole, EmployeeProfile
+from .dependencies import oauth2_scheme
+from .security import decode_access_token, TokenData
+from .token_cache import token_cache
+
+# AsyncSession counterparts of app.auth.dependencies, used by the routes in app.api.async_routes
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = decode_access_token(token)
+    if payload is None:
+        raise credentials_exception
+
+    email: str = payload.get("sub")
+    if email is None:
+        raise credentials_exception
+
+    token_data = TokenData(sub=email)
+
+    user = (await db.execute(select(User).where(User.email == token_data.sub).limit(1))).scalars().first()
+    if user is None:
+        raise credentials_exception
+
+    token_cache.set(token, payload, user)
+    return user
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+async def get_current_employee_profile_async(
+    request: Request,
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> EmployeeProfile:
+    """The current user's EmployeeProfile with its user, memoized on the request."""
+    employee_profile = getattr(request.state, "employee_profile", None)
+    if employee_profile is None:
+        employee_profile = (await db.execute(
+            select(EmployeeProfile)
+            .options(joinedload(EmployeeProfile.user))
+            .where(EmployeeProfile.user_id == current_user.id)
+            .limit(1)
+        )).scalars().first()
+        if not employee_profile:
+            raise HTTPException(status_code=404, detail="Employee profile not found for this user")
+        request.state.employee_profile = employee_profile
+    return employee_profile
+
+def get_current_active_user_with_roles_async(required_roles: List[UserRole]):
+    async def _get_user_with_roles(current_user: User = Depends(get_current_active_user_async)) -> User:
+        if current_user.role not in required_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="The user does not have enough privileges",
+            )
+        return current_user
+    return _get_user_with_roles
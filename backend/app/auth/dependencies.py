@@ -1,14 +1,19 @@
 from typing import List
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
-from app.models import User, UserRole
+from app.models import User, UserRole, EmployeeProfile
 from .security import decode_access_token, TokenData
+from .token_cache import token_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -27,7 +32,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user = db.query(User).filter(User.email == token_data.sub).first()
     if user is None:
         raise credentials_exception
-        
+
+    token_cache.set(token, payload, user)
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -35,6 +41,28 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_current_employee_profile(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> EmployeeProfile:
+    """
+    Returns the current user's EmployeeProfile, loaded together with its user in one joined query.
+    The profile is memoized on the request, so it is loaded at most once per request.
+    """
+    employee_profile = getattr(request.state, "employee_profile", None)
+    if employee_profile is None:
+        employee_profile = (
+            db.query(EmployeeProfile)
+            .options(joinedload(EmployeeProfile.user))
+            .filter(EmployeeProfile.user_id == current_user.id)
+            .first()
+        )
+        if not employee_profile:
+            raise HTTPException(status_code=404, detail="Employee profile not found for this user")
+        request.state.employee_profile = employee_profile
+    return employee_profile
+
 def get_current_active_user_with_roles(required_roles: List[UserRole]):
     def _get_user_with_roles(current_user: User = Depends(get_current_active_user)) -> User:
         if current_user.role not in required_roles:
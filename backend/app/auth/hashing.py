@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import anyio
+from fastapi import HTTPException, status
+from app.config import settings
+from .security import pwd_context
+
+# Password hashing runs bcrypt, which costs ~250 ms of CPU per call at the default work
+# factor. Doing it inline ties up a request thread for that long, so the async helpers
+# below hand the work to a small dedicated process pool instead. Requests wait on the
+# pool without holding a thread, and once too many hashes are queued new ones are
+# rejected with 503 rather than piling up behind the login burst.
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _get_executor() -> Optional[Executor]:
+    global _executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None # Fall back to the default threadpool
+    with _executor_lock:
+        if _executor is None:
+            # spawn avoids forking a process that already runs server threads
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+async def _run_hashing_task(func, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a plain-text password in the password hashing pool."""
+    return await _run_hashing_task(_hash_password, password)
+
+def _batch_concurrency() -> int:
+    """
+    How many hashes of a batch may be in flight at once: one per pool worker, or in
+    threadpool mode as many as the threadpool runs, never more than half the pending
+    limit.
+    """
+    workers = settings.PASSWORD_HASH_WORKERS
+    if workers <= 0:
+        workers = int(anyio.to_thread.current_default_thread_limiter().total_tokens)
+    return max(min(workers, settings.PASSWORD_HASH_MAX_PENDING // 2), 1)
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """
+    Hashes many passwords in parallel across the pool (or the threadpool). Only as
+    many hashes as can run at once are queued at a time, so a large batch neither
+    trips the 503 limit nor starves concurrent logins.
+    """
+    in_flight = asyncio.Semaphore(_batch_concurrency())
+
+    async def hash_one(password: str) -> str:
+        async with in_flight:
+            return await hash_password_async(password)
+
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a plain-text password against a hashed password in the password hashing pool."""
+    is_valid, _ = await _run_hashing_task(_verify_and_update_password, plain_password, hashed_password)
+    return is_valid
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash uses an outdated work factor,
+    also returns a replacement hash computed with the current one.
+    """
+    return await _run_hashing_task(_verify_and_update_password, plain_password, hashed_password)
+
+def shutdown_password_hashing() -> None:
+    """Stops the password hashing pool. Called on application shutdown."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
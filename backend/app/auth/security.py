@@ -9,8 +9,14 @@ from app.config import settings
 class TokenData(BaseModel):
     sub: Optional[str] = None
 
-# Create a CryptContext instance, specifying the hashing algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Create a CryptContext instance, specifying the hashing algorithm.
+# Hashes below the configured work factor are reported as needing an update.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from app.config import settings
+from app.models import User
+
+# Columns copied from the User row into the cached snapshot
+SNAPSHOT_FIELDS = ("id", "email", "role", "is_active", "created_at", "updated_at")
+
+class _CacheEntry:
+    __slots__ = ("user_id", "claims", "snapshot", "expires_at")
+
+    def __init__(self, user_id: int, claims: dict, snapshot: dict, expires_at: float):
+        self.user_id = user_id
+        self.claims = claims
+        self.snapshot = snapshot
+        self.expires_at = expires_at
+
+class TokenCache:
+    """
+    Bounded, TTL-based cache of verified access tokens.
+
+    Maps the SHA-256 digest of a token to its verified claims and a snapshot of the
+    user it belongs to, so repeated requests with the same token skip both JWT
+    verification and the user lookup. Entries never outlive the token's own `exp`
+    claim. The least recently used entry is evicted once the cache is full.
+
+    The cache is per process: writes to a user must call `invalidate_user` so the
+    next request reloads it from the database. Other worker processes pick the
+    change up at the latest after `ttl_seconds`.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._digests_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[User]:
+        """
+        Returns a detached User built from the cached snapshot, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        key = self.digest(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            snapshot = entry.snapshot
+        # A fresh transient instance per request so callers cannot mutate the cached copy
+        return User(**snapshot)
+
+    def set(self, token: str, claims: dict, user: User) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            # Never serve a token from cache after it has expired
+            expires_at = min(expires_at, now + (float(exp) - time.time()))
+            if expires_at <= now:
+                return
+
+        snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        key = self.digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(user.id, dict(claims), snapshot, expires_at)
+            self._digests_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drops every cached token that belongs to the given user.
+        """
+        with self._lock:
+            for key in list(self._digests_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "miss_rate": self.misses / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        digests = self._digests_by_user.get(entry.user_id)
+        if digests is not None:
+            digests.discard(key)
+            if not digests:
+                del self._digests_by_user[entry.user_id]
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "Dayflow HRMS"
@@ -8,11 +9,79 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-min-32-chars"  # TODO: Change in production
 
     DATABASE_URL: str = "sqlite:///./dayflow.db"
+
+    # SQLite connection pragmas (only used when DATABASE_URL is a SQLite file)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456 # 256 MiB
+    SQLITE_CACHE_SIZE: int = -65536 # Negative values are KiB, i.e. 64 MiB
+
+    # Connection pool; pre-ping and recycle only apply to server databases such as PostgreSQL
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Serve the hot routes (login, check-in/out, dashboards, /me) from an AsyncSession.
+    # Needs greenlet and an async driver (aiosqlite for SQLite, asyncpg for PostgreSQL);
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the async driver swapped in.
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
     TESTING: bool = False # Added for test environment control
 
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440 # 24 hours
 
+    # In-process cache of verified tokens; set either value to 0 to disable it
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # bcrypt work factor; stored hashes with fewer rounds are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    # Size of the password hashing process pool (0 runs hashing in the threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashes allowed to queue for the pool before requests are rejected with 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Compiled holiday/work-week calendars are cached per process for at most this long
+    CALENDAR_CACHE_TTL_SECONDS: int = 300
+    # Working days are counted over ranges touching at most this many calendar years
+    CALENDAR_MAX_RANGE_YEARS: int = 5
+
+    # Uploaded files are streamed to disk in chunks of this size and rejected past the limit
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    # Request latency and query metrics at /metrics (admins only).
+    # Requests running more queries than the threshold (likely N+1 patterns) are logged.
+    METRICS_ENABLED: bool = True
+    METRICS_QUERY_COUNT_THRESHOLD: int = 25
+    # Per-response query count and timings in a Server-Timing header, readable by any
+    # client, so off by default (needs METRICS_ENABLED)
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Responses at least this large are gzip-compressed for clients that accept it
+    GZIP_MINIMUM_SIZE: int = 1024
+
+    # Maximum number of records, and of body bytes, accepted by one bulk employee import
+    EMPLOYEE_BULK_MAX_ROWS: int = 1000
+    EMPLOYEE_BULK_MAX_BYTES: int = 2 * 1024 * 1024
+
+    # Maximum number of requests approved or rejected by one bulk review call
+    BULK_REVIEW_MAX_IDS: int = 500
+
+    # How often the admin dashboard counters are recomputed from scratch (0 disables it)
+    DASHBOARD_RECONCILE_INTERVAL_SECONDS: int = 900
+
+    # Activity log entries are written in batches by a background thread (not used in tests)
+    ACTIVITY_LOG_ASYNC: bool = True
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000
+    ACTIVITY_LOG_BATCH_SIZE: int = 500
+    ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+
     OPENAPI_TITLE: str = "Dayflow HRMS API"
     OPENAPI_VERSION: str = "1.0.0"
 
@@ -1,15 +1,70 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
 
 # Determine the database URL
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Applies the configured pragmas to every new SQLite connection.
+    WAL lets readers run alongside the single writer, and busy_timeout makes
+    concurrent writers wait for the lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_JOURNAL_MODE:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        if settings.SQLITE_SYNCHRONOUS:
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    finally:
+        cursor.close()
+
+def create_db_engine(database_url: Optional[str] = None) -> Engine:
+    """
+    Creates the SQLAlchemy engine for the given URL (defaults to settings.DATABASE_URL).
+
+    SQLite file databases get the connection pragmas from settings. Server databases
+    such as PostgreSQL also get pre-ping and connection recycling. Both use the
+    configured pool size.
+    """
+    url = make_url(database_url or SQLALCHEMY_DATABASE_URL)
+
+    if url.get_backend_name() == "sqlite":
+        # For SQLite, connect_args is needed for multiple threads
+        connect_args = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+        if not url.database or url.database == ":memory:":
+            return create_engine(url, connect_args=connect_args)
+
+        engine = create_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
 # Create the SQLAlchemy engine
-# For SQLite, connect_args is needed for multiple threads
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine()
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,83 @@
+from typing import AsyncIterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from .config import settings
+from .database import SQLALCHEMY_DATABASE_URL, _set_sqlite_pragmas
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+except ImportError:  # greenlet is not installed
+    AsyncEngine = AsyncSession = async_sessionmaker = create_async_engine = None
+
+# Async drivers for the sync URLs the app is configured with
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+async_engine: Optional["AsyncEngine"] = None
+AsyncSessionLocal: Optional["async_sessionmaker"] = None
+
+def async_database_url(database_url: Optional[str] = None) -> str:
+    """The async driver URL for a sync database URL (already async URLs are returned as is)."""
+    url = make_url(database_url or settings.ASYNC_DATABASE_URL or SQLALCHEMY_DATABASE_URL)
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url.render_as_string(hide_password=False)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver is known for {url.get_backend_name()} databases")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+def create_async_db_engine(database_url: Optional[str] = None) -> "AsyncEngine":
+    """
+    Creates the async engine, configured like create_db_engine: SQLite files get the
+    connection pragmas, server databases get pre-ping and connection recycling.
+    """
+    if create_async_engine is None:
+        raise RuntimeError("The async database layer needs the greenlet package")
+    url = make_url(async_database_url(database_url))
+
+    if url.get_backend_name() == "sqlite":
+        connect_args = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if not url.database or url.database == ":memory:":
+            return create_async_engine(url, connect_args=connect_args)
+
+        engine = create_async_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+def init_async_db(database_url: Optional[str] = None) -> "AsyncEngine":
+    """Creates the async engine and session factory (called on startup when ASYNC_DB_ENABLED)."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = create_async_db_engine(database_url)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=True)
+    return async_engine
+
+async def dispose_async_db() -> None:
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+    async_engine = AsyncSessionLocal = None
+
+# Dependency to get an async database session
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    if AsyncSessionLocal is None:
+        init_async_db()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,11 +1,20 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from .config import settings
-from .database import Base, engine, SessionLocal
+from .database import engine, SessionLocal
+from .database_async import init_async_db, dispose_async_db
+from .migrations import run_migrations
+from .services.dashboard_service import reconcile_dashboard_counters, run_periodic_reconcile
+from .services.activity_service import activity_log_writer
+from .services.table_version_service import track_table_versions
+from .services.upload_service import UploadSizeLimitMiddleware
+from .metrics import MetricsMiddleware, instrument_queries
 from .models import User, UserRole
 from .auth.security import get_password_hash
-from app.api import auth as auth_router, users as users_router, employees as employees_router, attendance as attendance_router, attendance_correction as attendance_correction_router, leave as leave_router, salary as salary_router, settings as settings_router, dashboard as dashboard_router, upload as uploads_router
+from .auth.hashing import shutdown_password_hashing
+from app.api import auth as auth_router, users as users_router, employees as employees_router, attendance as attendance_router, attendance_correction as attendance_correction_router, leave as leave_router, salary as salary_router, settings as settings_router, dashboard as dashboard_router, upload as uploads_router, calendar as calendar_router, metrics as metrics_router
 
 app = FastAPI(
     title=settings.OPENAPI_TITLE,
@@ -14,6 +23,10 @@ app = FastAPI(
 )
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+# Added before CORS, so it runs inside it and its 413 carries the CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
 
 origins = [
     "http://localhost:3000",
@@ -26,14 +39,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "ETag", "Server-Timing"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+if settings.METRICS_ENABLED:
+    # Outermost, so the timings cover the other middleware as well
+    instrument_queries()
+    app.add_middleware(MetricsMiddleware)
+
+# Bump the per-table versions behind the ETags of polled endpoints on every commit
+track_table_versions()
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.on_event("startup")
 async def startup_event():
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     
     # Create a new session for the startup event
     db: Session = SessionLocal()
@@ -52,14 +75,44 @@ async def startup_event():
                 )
                 db.add(new_admin)
                 db.commit()
+
+        # Seed the dashboard counters from the source tables on every start
+        reconcile_dashboard_counters(db)
     finally:
         db.close()
 
+    if settings.ACTIVITY_LOG_ASYNC and not settings.TESTING:
+        activity_log_writer.start(engine)
+
+    if settings.ASYNC_DB_ENABLED:
+        init_async_db()
+
+    if settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS > 0:
+        app.state.dashboard_reconcile_task = asyncio.create_task(
+            run_periodic_reconcile(SessionLocal, settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS)
+        )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    reconcile_task = getattr(app.state, "dashboard_reconcile_task", None)
+    if reconcile_task:
+        reconcile_task.cancel()
+    # Write out any queued activity log entries before exiting
+    activity_log_writer.stop()
+    if settings.ASYNC_DB_ENABLED:
+        await dispose_async_db()
+    shutdown_password_hashing()
+
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Dayflow HRMS API"}
 
+if settings.ASYNC_DB_ENABLED:
+    # Mounted first so its async handlers take over the hot routes from the sync routers below
+    from app.api import async_routes as async_router
+    app.include_router(async_router.router, prefix="/api/v1")
+
 app.include_router(auth_router.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users_router.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(employees_router.router, prefix="/api/v1/employees", tags=["employees"])
@@ -69,4 +122,8 @@ app.include_router(leave_router.router, prefix="/api/v1/leave", tags=["leave"])
 app.include_router(salary_router.router, prefix="/api/v1/salary", tags=["salary"])
 app.include_router(settings_router.router, prefix="/api/v1/settings", tags=["settings"])
 app.include_router(dashboard_router.router, prefix="/api/v1/dashboard", tags=["dashboard"])
-app.include_router(uploads_router.router, prefix="/api/v1/upload", tags=["upload"])
\ No newline at end of file
+app.include_router(uploads_router.router, prefix="/api/v1/upload", tags=["upload"])
+app.include_router(calendar_router.router, prefix="/api/v1/calendar", tags=["calendar"])
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router.router, tags=["metrics"])
\ No newline at end of file
@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Request metrics. MetricsMiddleware times every HTTP request and, through the
+# SQLAlchemy cursor events below, counts the queries it runs and their total time.
+# The per-request numbers go into a Server-Timing header when SERVER_TIMING_ENABLED
+# is set; the aggregates per route are exposed to admins in the Prometheus text
+# format at /metrics. Requests that run more than
+# METRICS_QUERY_COUNT_THRESHOLD queries, the usual sign of an N+1 pattern, are
+# logged and counted per route.
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+# Set for the duration of a request. Sync endpoints run in the threadpool with a copy
+# of the request's context, which still refers to the same RequestStats object.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.queries += 1
+    stats.query_seconds += time.perf_counter() - started.pop()
+
+def instrument_queries() -> None:
+    """Counts and times the queries of every engine within requests (idempotent)."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+class RouteMetrics:
+    __slots__ = ("bucket_counts", "count", "seconds", "queries", "query_seconds", "query_heavy")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # the last one is +Inf
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.query_heavy = 0
+
+class MetricsRegistry:
+    """Aggregates request metrics per (method, route, status); safe to use from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str, str], RouteMetrics] = defaultdict(RouteMetrics)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self._routes[(method, route, str(status))]
+            metrics.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.queries += stats.queries
+            metrics.query_seconds += stats.query_seconds
+            if stats.queries > settings.METRICS_QUERY_COUNT_THRESHOLD:
+                metrics.query_heavy += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self, gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+        """The metrics in the Prometheus text exposition format, plus the given gauge groups."""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines: List[str] = [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route, status), metrics in routes:
+                labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), metrics.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+            for name, attribute, kind, help_text in (
+                ("db_queries_total", "queries", "counter", "Database queries run by requests, by route."),
+                ("db_query_duration_seconds_total", "query_seconds", "counter", "Time spent in database queries, by route."),
+                ("db_query_heavy_requests_total", "query_heavy", "counter",
+                 "Requests that ran more queries than the configured threshold, by route."),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (method, route, status), metrics in routes:
+                    labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+                    lines.append(f"{name}{{{labels}}} {getattr(metrics, attribute)}")
+
+        for prefix, values in (gauges or {}).items():
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    lines.append(f"# TYPE {prefix}_{key} gauge")
+                    lines.append(f"{prefix}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+metrics_registry = MetricsRegistry()
+
+def _route_template(scope) -> str:
+    """
+    The path template of the matched route, e.g. /api/v1/employees/{employee_profile_id}.
+    Routes of included routers may only know their path relative to the router's
+    prefix, so the prefix is taken from the request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return "unmatched"  # never the raw path, which would create a series per URL
+    route_segments = path_format.split("/")[1:]
+    path_segments = scope["path"].split("/")[1:]
+    return "/" + "/".join(path_segments[:len(path_segments) - len(route_segments)] + route_segments)
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no body buffering, streaming responses pass through as is)
+    that records every HTTP request in the registry and, with SERVER_TIMING_ENABLED,
+    adds a Server-Timing header.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    server_timing = (
+                        f'db;dur={stats.query_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                        f"app;dur={elapsed_ms:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(token)
+            seconds = time.perf_counter() - started
+            route = _route_template(scope)
+            self.registry.observe(scope["method"], route, status_code, seconds, stats)
+            if stats.queries > settings.METRICS_QUERY_COUNT_THRESHOLD:
+                logger.warning(
+                    "%s %s ran %d queries (threshold %d) in %.1f ms",
+                    scope["method"], route, stats.queries, settings.METRICS_QUERY_COUNT_THRESHOLD, seconds * 1000,
+                )
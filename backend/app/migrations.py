@@ -0,0 +1,88 @@
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .database import Base
+from . import models  # noqa: F401 - registers every model on Base.metadata
+from .services.attendance_rollup_service import rebuild_attendance_rollups, rollups_available
+from .services.table_version_service import seed_table_versions
+
+logger = logging.getLogger(__name__)
+
+# The schema is managed with Base.metadata.create_all, which creates missing tables
+# (with their indexes) but never touches tables that already exist. The steps below
+# bring existing databases up to date and are safe to run on every startup.
+
+def add_missing_columns(engine: Engine) -> None:
+    """
+    Adds the nullable columns declared on the models that are missing from existing
+    tables. Existing rows get NULL; columns that cannot be added that way are left
+    to a manual migration with a warning.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable or column.primary_key:
+                logger.warning("Column %s.%s is missing and cannot be added automatically", table.name, column.name)
+                continue
+            preparer = engine.dialect.identifier_preparer
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}"
+                ))
+            logger.info("Added column %s.%s", table.name, column.name)
+
+def create_missing_indexes(engine: Engine) -> None:
+    """
+    Creates every index declared on the models that is missing from the database.
+    A unique index whose data is not unique yet is skipped with a warning so that
+    startup does not fail; it is retried on the next start once the data is fixed.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                index.create(bind=engine)
+            except IntegrityError:
+                logger.warning(
+                    "Skipped unique index %s on %s: existing rows contain duplicates",
+                    index.name, table.name,
+                )
+
+def build_missing_attendance_rollups(engine: Engine) -> None:
+    """
+    Builds the monthly attendance rollups when their table is empty but attendance
+    exists: an install upgraded from before the rollups, which payroll and the
+    monthly reports would otherwise read as having no attendance at all.
+    """
+    db = Session(bind=engine)
+    try:
+        if not rollups_available(db):
+            count = rebuild_attendance_rollups(db)
+            logger.info("Built %d monthly attendance rollups from the existing attendance", count)
+    finally:
+        db.close()
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Creates missing tables and applies the idempotent schema migrations.
+    """
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    create_missing_indexes(engine)
+    seed_table_versions(engine)
+    build_missing_attendance_rollups(engine)
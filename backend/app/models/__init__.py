@@ -7,8 +7,13 @@ from .bank_detail import BankDetail
 from .skill import Skill
 from .certification import Certification
 from .salary import SalaryStructure
-from .attendance import Attendance, AttendanceStatus
-from .leave import LeaveRequest, LeaveBalance, LeaveType, LeaveStatus
+from .attendance import Attendance, AttendanceStatus, AttendanceMonthlyRollup
+from .leave import LeaveRequest, LeaveBalance, LeaveBalanceLedger, LeaveType, LeaveStatus
 from .attendance_correction import AttendanceCorrectionRequest, CorrectionRequestStatus
 from .activity_log import ActivityLog
-from .user_settings import UserSettings
\ No newline at end of file
+from .user_settings import UserSettings
+from .dashboard_counter import DashboardCounter
+from .payroll import PayrollRun, PayrollRunEntry
+from .employee_id_sequence import EmployeeIdSequence
+from .calendar import CompanyHoliday, CompanyWorkWeek, DEFAULT_WORKING_WEEKDAYS
+from .table_version import TableVersion
\ No newline at end of file
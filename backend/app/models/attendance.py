@@ -1,5 +1,7 @@
 import enum
-from sqlalchemy import Column, Integer, Date, DateTime, Enum, String, ForeignKey, Text
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Column, Integer, Date, DateTime, Enum, String, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -14,6 +16,10 @@ class Attendance(Base):
     Represents an employee's attendance record for a specific day.
     """
     __tablename__ = "attendances"
+    __table_args__ = (
+        # One record per employee per day; also serves every (employee, date) lookup
+        Index("uq_attendances_employee_date", "employee_profile_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_profile_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
@@ -22,6 +28,39 @@ class Attendance(Base):
     check_out_time = Column(DateTime, nullable=True)
     status = Column(Enum(AttendanceStatus), nullable=False)
     notes = Column(Text, nullable=True)
+    # Stamps the table's version at read time (see table_version_service)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationship
     employee_profile = relationship("EmployeeProfile", back_populates="attendances")
+
+class AttendanceMonthlyRollup(Base):
+    """
+    Per-employee, per-month attendance totals, kept up to date as attendance records change.
+    """
+    __tablename__ = "attendance_monthly_rollups"
+    __table_args__ = (
+        Index("uq_attendance_monthly_rollups_employee_month", "employee_profile_id", "year", "month", unique=True),
+        # Company-wide totals for a month
+        Index("ix_attendance_monthly_rollups_month", "year", "month"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    employee_profile_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    half_days = Column(Integer, nullable=False, default=0)
+    leave_days = Column(Integer, nullable=False, default=0)
+    # Time between check-in and check-out, summed over the month
+    worked_minutes = Column(Integer, nullable=False, default=0)
+    # Stamps the table's version at read time (see table_version_service)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Relationship
+    employee_profile = relationship("EmployeeProfile", back_populates="attendance_rollups")
+
+    @property
+    def worked_hours(self) -> Decimal:
+        return (Decimal(self.worked_minutes or 0) / 60).quantize(Decimal("0.01"))
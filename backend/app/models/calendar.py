@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+# Monday to Friday, one bit per weekday with Monday as bit 0 (date.weekday())
+DEFAULT_WORKING_WEEKDAYS = 0b0011111
+
+class CompanyHoliday(Base):
+    """
+    A public or company holiday, which does not count as a working day.
+    """
+    __tablename__ = "company_holidays"
+    __table_args__ = (
+        Index("uq_company_holidays_company_date", "company_id", "date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationship
+    company = relationship("Company")
+
+class CompanyWorkWeek(Base):
+    """
+    The weekdays a company works on, as a bitmask with Monday as bit 0.
+    Companies without a row work Monday to Friday.
+    """
+    __tablename__ = "company_work_weeks"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True, autoincrement=False)
+    working_weekdays = Column(Integer, nullable=False, default=DEFAULT_WORKING_WEEKDAYS)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship
+    company = relationship("Company")
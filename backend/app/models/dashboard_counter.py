@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.database import Base
+
+class DashboardCounter(Base):
+    """
+    Stores a named aggregate shown on the admin dashboard, such as the number of
+    pending leave requests. Counters are adjusted in the same transaction as the
+    writes that affect them and periodically reconciled against the source tables.
+    """
+    __tablename__ = "dashboard_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
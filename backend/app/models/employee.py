@@ -52,6 +52,7 @@ class EmployeeProfile(Base):
     certifications = relationship("Certification", back_populates="employee_profile", cascade="all, delete-orphan")
     salary_structure = relationship("SalaryStructure", back_populates="employee_profile", uselist=False, cascade="all, delete-orphan")
     attendances = relationship("Attendance", back_populates="employee_profile", cascade="all, delete-orphan")
+    attendance_rollups = relationship("AttendanceMonthlyRollup", back_populates="employee_profile", cascade="all, delete-orphan")
     leave_requests = relationship("LeaveRequest", back_populates="employee_profile", cascade="all, delete-orphan")
     leave_balances = relationship("LeaveBalance", back_populates="employee_profile", cascade="all, delete-orphan")
 
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class EmployeeIdSequence(Base):
+    """
+    The last serial handed out in employee login IDs (OI...YYYYNNNN) for a joining year.
+    """
+    __tablename__ = "employee_id_sequences"
+
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    last_serial = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey, Text, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey, Text, Numeric, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -20,6 +20,15 @@ class LeaveRequest(Base):
     Represents a leave request submitted by an employee.
     """
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        # Per-employee lookups by status and date range (today's status, overlap checks, my requests)
+        Index("ix_leave_requests_employee_status_dates", "employee_profile_id", "status", "start_date", "end_date"),
+        # Who is on approved leave on a day: seeks on status and ranges over leave that has not ended yet
+        Index("ix_leave_requests_status_end_start", "status", "end_date", "start_date"),
+        # Pending queues and counts across all employees
+        Index("ix_leave_requests_status", "status"),
+        Index("ix_leave_requests_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_profile_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
@@ -47,6 +56,9 @@ class LeaveBalance(Base):
     Represents the leave balance for an employee for a specific leave type and year.
     """
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        Index("ix_leave_balances_employee_type_year", "employee_profile_id", "leave_type", "year"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_profile_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
@@ -61,3 +73,24 @@ class LeaveBalance(Base):
 
     # Relationship
     employee_profile = relationship("EmployeeProfile", back_populates="leave_balances")
+
+class LeaveBalanceLedger(Base):
+    """
+    Records every change to the days used from a leave balance, so balances can be
+    recomputed from their history.
+    """
+    __tablename__ = "leave_balance_ledger"
+    __table_args__ = (
+        # A leave request is charged to a balance at most once
+        Index("ix_leave_balance_ledger_request_entry_type", "leave_request_id", "entry_type", unique=True),
+        Index("ix_leave_balance_ledger_balance", "leave_balance_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    leave_balance_id = Column(Integer, ForeignKey("leave_balances.id"), nullable=False)
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=True)
+    entry_type = Column(String(32), nullable=False)
+    # Days added to used_days (negative when days are given back)
+    days = Column(Numeric(5, 2), nullable=False)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
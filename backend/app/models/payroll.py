@@ -0,0 +1,58 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class PayrollRun(Base):
+    """
+    A payroll run for a pay period, with the company-wide totals.
+    The per-employee amounts are kept in PayrollRunEntry as they were computed,
+    so later salary structure changes do not alter past runs.
+    """
+    __tablename__ = "payroll_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)
+    period_days = Column(Integer, nullable=False)
+    employee_count = Column(Integer, nullable=False, default=0)
+    total_gross = Column(Numeric(14, 2), nullable=False, default=0)
+    total_deductions = Column(Numeric(14, 2), nullable=False, default=0)
+    total_net = Column(Numeric(14, 2), nullable=False, default=0)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    entries = relationship("PayrollRunEntry", back_populates="payroll_run", cascade="all, delete-orphan")
+    created_by = relationship("User")
+
+class PayrollRunEntry(Base):
+    """
+    One employee's pay for a payroll run: the salary components in effect, the
+    loss-of-pay days from unpaid leave and absences, and the prorated amounts.
+    """
+    __tablename__ = "payroll_run_entries"
+    __table_args__ = (
+        Index("uq_payroll_run_entries_run_employee", "payroll_run_id", "employee_profile_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    payroll_run_id = Column(Integer, ForeignKey("payroll_runs.id", ondelete="CASCADE"), nullable=False)
+    employee_profile_id = Column(Integer, ForeignKey("employee_profiles.id"), nullable=False)
+    salary_structure_id = Column(Integer, ForeignKey("salary_structures.id"), nullable=True)
+
+    # Monthly amounts from the salary structure
+    gross_salary = Column(Numeric(10, 2), nullable=False)
+    total_deductions = Column(Numeric(10, 2), nullable=False)
+
+    unpaid_leave_days = Column(Numeric(5, 2), nullable=False, default=0)
+    absent_days = Column(Numeric(5, 2), nullable=False, default=0)
+    payable_days = Column(Numeric(5, 2), nullable=False)
+
+    # Amounts for the period after proration
+    prorated_gross = Column(Numeric(10, 2), nullable=False)
+    prorated_deductions = Column(Numeric(10, 2), nullable=False)
+    net_pay = Column(Numeric(10, 2), nullable=False)
+
+    # Relationship
+    payroll_run = relationship("PayrollRun", back_populates="entries")
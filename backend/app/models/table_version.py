@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class TableVersion(Base):
+    """
+    A counter per table, incremented by every committed transaction that wrote to
+    the table. Cheap to read, so responses can be given an ETag without running
+    their queries.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,80 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, Optional, Sequence
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library encoder
+    orjson = None
+
+# A JSON response for large list endpoints that opt in to it. The endpoint builds
+# plain dicts (typically straight from row tuples) and returns this response, which
+# skips response model validation and FastAPI's encoder; orjson, when installed,
+# encodes the content in one pass. The output matches what the endpoint's
+# response_model would produce: Decimals as strings, dates and datetimes in ISO 8601,
+# enums as their values.
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def rows_to_dicts(rows: Sequence[Any]) -> List[dict]:
+    """
+    Turns result rows into dicts keyed by column label. Labels of the form
+    "relation.field" are gathered into a nested dict under "relation", which is
+    None when all of its fields are (an outer join that matched nothing).
+    """
+    if not rows:
+        return []
+    plan = []
+    nested = {}
+    for index, label in enumerate(rows[0]._fields):
+        relation, _, field = label.partition(".")
+        if field:
+            if relation not in nested:
+                nested[relation] = []
+                plan.append((relation, nested[relation]))
+            nested[relation].append((field, index))
+        else:
+            plan.append((label, index))
+
+    result = []
+    for row in rows:
+        item = {}
+        for key, source in plan:
+            if isinstance(source, int):
+                item[key] = row[source]
+            else:
+                values = {field: row[index] for field, index in source}
+                item[key] = values if any(value is not None for value in values.values()) else None
+        result.append(item)
+    return result
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    A FastJSONResponse of `content`, carrying over the headers an endpoint or its
+    dependencies set on the injected Response (pagination cursor, ETag), which
+    FastAPI does not apply to responses returned directly.
+    """
+    fast_response = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        fast_response.headers.update({key: value for key, value in response.headers.items() if key != "content-length"})
+    return fast_response
@@ -1,13 +1,16 @@
 # This file makes the 'schemas' directory a package.
 from .user import User, UserCreate, UserUpdate
 from .company import Company, CompanyCreate, CompanyUpdate
-from .employee import EmployeeProfile, EmployeeProfileCreate, EmployeeProfileUpdate, EmployeeListResponse, EmployeeCreateBasic, EmployeeBasicResponse, EmployeeProfileMeResponse
+from .employee import EmployeeProfile, EmployeeProfileCreate, EmployeeProfileUpdate, EmployeeListResponse, EmployeeCreateBasic, EmployeeBasicResponse, EmployeeProfileMeResponse, EmployeeBulkRowResult, EmployeeBulkCreateResponse
 from .bank_detail import BankDetail, BankDetailCreate, BankDetailUpdate
 from .skill import Skill, SkillCreate, SkillUpdate, EmployeeSkill, EmployeeSkillCreate
 from .certification import Certification, CertificationCreate, CertificationUpdate
 from .salary import SalaryStructure, SalaryStructureCreate, SalaryStructureUpdate, SalaryPayroll
-from .attendance import Attendance, AttendanceCreate, AttendanceUpdate, AttendanceManualCreate
+from .attendance import Attendance, AttendanceCreate, AttendanceUpdate, AttendanceManualCreate, AttendanceMonthlyRollup, AttendanceMonthSummary
 from .leave import LeaveRequest, LeaveRequestCreate, LeaveRequestUpdate, LeaveBalance, LeaveBalanceCreate, LeaveBalanceUpdate
 from .attendance_correction import AttendanceCorrectionRequest, AttendanceCorrectionRequestCreate, AttendanceCorrectionRequestUpdate
 from .activity_log import ActivityLog, ActivityLogCreate
-from .user_settings import UserSettings, UserSettingsCreate, UserSettingsUpdate
\ No newline at end of file
+from .user_settings import UserSettings, UserSettingsCreate, UserSettingsUpdate
+from .payroll import PayrollRun, PayrollRunCreate, PayrollRunEntry
+from .calendar import CompanyHoliday, CompanyHolidayCreate, CompanyHolidayUpdate, WorkWeek, WorkingDays
+from .bulk import BulkReviewRequest, BulkReviewResult, BulkReviewResponse
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from decimal import Decimal
 from datetime import date, datetime
 from app.models.attendance import AttendanceStatus
 
@@ -43,4 +44,29 @@ class Attendance(AttendanceBase):
     class Config:
         from_attributes = True
 
+# Schema for monthly attendance totals
+class AttendanceMonthlyRollup(BaseModel):
+    employee_profile_id: int
+    year: int
+    month: int
+    present_days: int = 0
+    absent_days: int = 0
+    half_days: int = 0
+    leave_days: int = 0
+    worked_minutes: int = 0
+    worked_hours: Decimal = Decimal("0.00")
+
+    class Config:
+        from_attributes = True
+
+# Schema for the attendance totals of a whole company for a month
+class AttendanceMonthSummary(BaseModel):
+    year: int
+    month: int
+    present_days: int = 0
+    absent_days: int = 0
+    half_days: int = 0
+    leave_days: int = 0
+    worked_hours: Decimal = Decimal("0.00")
+
 from app.schemas.employee import EmployeeProfile
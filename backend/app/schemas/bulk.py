@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class BulkReviewRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+    comments: Optional[str] = None
+
+class BulkReviewResult(BaseModel):
+    id: int
+    status: str
+    detail: Optional[str] = None
+
+class BulkReviewResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkReviewResult]
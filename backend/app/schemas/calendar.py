@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date
+
+# --- CompanyHoliday Schemas ---
+
+# Base schema for common attributes
+class CompanyHolidayBase(BaseModel):
+    date: date
+    name: str
+
+# Schema for creating a new holiday
+class CompanyHolidayCreate(CompanyHolidayBase):
+    pass
+
+# Schema for updating a holiday
+class CompanyHolidayUpdate(BaseModel):
+    date: Optional[date] = None
+    name: Optional[str] = None
+
+# Schema for holiday data returned from the API
+class CompanyHoliday(CompanyHolidayBase):
+    id: int
+    company_id: int
+
+    class Config:
+        from_attributes = True
+
+# --- Work week Schemas ---
+
+# Working weekdays as numbers, Monday = 0 ... Sunday = 6
+class WorkWeek(BaseModel):
+    working_weekdays: List[int] = Field(..., min_length=1)
+
+class WorkingDays(BaseModel):
+    start_date: date
+    end_date: date
+    working_days: int
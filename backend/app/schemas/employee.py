@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 from app.models.employee import Gender, MaritalStatus
 
@@ -71,6 +71,21 @@ class EmployeeBasicResponse(BaseModel):
     work_email: str
     message: str
 
+# Outcome of one record of a bulk import: created, skipped (already registered) or invalid
+class EmployeeBulkRowResult(BaseModel):
+    row: int
+    work_email: Optional[str] = None
+    status: str
+    employee_id: Optional[str] = None
+    password: Optional[str] = None
+    errors: List[str] = []
+
+class EmployeeBulkCreateResponse(BaseModel):
+    created: int
+    skipped: int
+    invalid: int
+    results: List[EmployeeBulkRowResult]
+
 class EmployeeListResponse(EmployeeProfile):
     email: str
     status: str = "pending"
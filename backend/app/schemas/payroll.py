@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+# Schema for starting a payroll run
+class PayrollRunCreate(BaseModel):
+    period_start: date
+    period_end: date
+
+# Schema for payroll run data returned from the API
+class PayrollRun(BaseModel):
+    id: int
+    period_start: date
+    period_end: date
+    period_days: int
+    employee_count: int
+    total_gross: Decimal
+    total_deductions: Decimal
+    total_net: Decimal
+    created_by_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# Schema for one employee's pay in a payroll run
+class PayrollRunEntry(BaseModel):
+    id: int
+    payroll_run_id: int
+    employee_profile_id: int
+    salary_structure_id: Optional[int] = None
+    gross_salary: Decimal
+    total_deductions: Decimal
+    unpaid_leave_days: Decimal
+    absent_days: Decimal
+    payable_days: Decimal
+    prorated_gross: Decimal
+    prorated_deductions: Decimal
+    net_pay: Decimal
+
+    class Config:
+        from_attributes = True
@@ -1,18 +1,153 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models import ActivityLog
-from app.schemas import ActivityLogCreate
-from typing import Optional # Added this import
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() to wake the flusher if it is waiting on an empty queue
+_WAKE_UP = object()
+
+class ActivityLogWriter:
+    """
+    Writes activity log entries from a bounded in-memory queue on a background
+    thread, so requests do not pay for a commit per entry.
+
+    Entries are inserted in batches with a single executemany, flushed once
+    `batch_size` entries are waiting or `flush_interval` seconds after the first
+    one arrived. When the queue is full new entries are dropped (and counted)
+    rather than blocking the request. stop() drains what is left.
+    """
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max(max_queue_size, 1))
+        self._engine: Optional[Engine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, engine: Engine) -> None:
+        """Starts the flusher thread, writing to `engine`."""
+        if self.running:
+            return
+        self._engine = engine
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10) -> None:
+        """Stops the flusher thread after writing every queued entry."""
+        if not self.running:
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_WAKE_UP)
+        except queue.Full:
+            pass # The flusher is busy with a full queue and will notice on its own
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, user_id: int, action: str, details: Optional[str] = None) -> bool:
+        """Queues an entry; returns False if it was dropped because the queue is full."""
+        entry = {"user_id": user_id, "action": action, "details": details, "timestamp": datetime.utcnow()}
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            logger.warning("Activity log queue is full, dropped entry: %s", action)
+            return False
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+    def _next_batch(self) -> List[dict]:
+        """Waits for the next batch, returning early once it is full or the flush interval has passed."""
+        batch: List[dict] = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if self._stopping.is_set():
+                    # Draining: take whatever is left without waiting
+                    entry = self._queue.get_nowait()
+                elif deadline is None:
+                    entry = self._queue.get()
+                else:
+                    entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if entry is _WAKE_UP:
+                continue
+            batch.append(entry)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch
+
+    def _flush(self, batch: List[dict]) -> None:
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(insert(ActivityLog.__table__), batch)
+        except Exception:
+            logger.exception("Failed to write %d activity log entries", len(batch))
+            with self._stats_lock:
+                self.failed += len(batch)
+            return
+        with self._stats_lock:
+            self.flushed += len(batch)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+            elif self._stopping.is_set() and self._queue.empty():
+                return
+
+activity_log_writer = ActivityLogWriter(
+    max_queue_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+)
 
 def log_activity(
-    db: Session, 
-    user_id: int, 
-    action: str, 
+    db: Session,
+    user_id: int,
+    action: str,
     details: Optional[str] = None
 ):
     """
     Logs an activity performed by a user.
+    The entry is handed to the background writer when it is running (it is not
+    started in tests); otherwise it is written and committed on `db` right away.
     """
+    if activity_log_writer.running:
+        activity_log_writer.enqueue(user_id, action, details)
+        return
+
     activity = ActivityLog(user_id=user_id, action=action, details=details)
     db.add(activity)
     db.commit()
-    db.refresh(activity)
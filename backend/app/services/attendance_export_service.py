@@ -0,0 +1,95 @@
+import csv
+import enum
+import io
+import json
+from datetime import date
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import Attendance, EmployeeProfile
+
+# Rows fetched from the database per round trip, and written per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "employee_profile_id", "employee_id", "first_name", "last_name",
+    "date", "status", "check_in_time", "check_out_time", "notes",
+]
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+def _format_value(value):
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def _export_statement(start_date: date, end_date: date, employee_profile_id: Optional[int]):
+    stmt = (
+        select(
+            Attendance.id, Attendance.employee_profile_id, EmployeeProfile.employee_id,
+            EmployeeProfile.first_name, EmployeeProfile.last_name, Attendance.date,
+            Attendance.status, Attendance.check_in_time, Attendance.check_out_time, Attendance.notes,
+        )
+        .join(EmployeeProfile, EmployeeProfile.id == Attendance.employee_profile_id)
+        .where(Attendance.date >= start_date, Attendance.date <= end_date)
+        .order_by(Attendance.date, Attendance.id)
+    )
+    if employee_profile_id:
+        stmt = stmt.where(Attendance.employee_profile_id == employee_profile_id)
+    return stmt
+
+def iter_attendance_export(
+    bind: Engine,
+    start_date: date,
+    end_date: date,
+    export_format: ExportFormat,
+    employee_profile_id: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """
+    Streams the attendance rows in [start_date, end_date] as CSV or NDJSON chunks.
+
+    Rows are read as plain tuples through a streaming cursor `batch_size` at a time
+    and each batch is written out before the next is fetched, so memory use does not
+    grow with the size of the range. The export uses its own session because it
+    outlives the request's session while the response is being sent.
+    """
+    db = Session(bind=bind)
+    try:
+        result = db.execute(
+            _export_statement(start_date, end_date, employee_profile_id),
+            execution_options={"yield_per": batch_size},
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == ExportFormat.CSV else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+
+        for batch in result.partitions():
+            for row in batch:
+                values = [_format_value(value) for value in row]
+                if writer:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
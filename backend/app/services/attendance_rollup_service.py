@@ -0,0 +1,219 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import Attendance, AttendanceMonthlyRollup, AttendanceStatus, EmployeeProfile
+
+# Monthly attendance totals per employee. Every write to an attendance record adds
+# the difference between the record's contribution after and before the change to
+# its month's rollup, in the same transaction, so the rollups never drift from the
+# raw rows as long as every write goes through here; rebuild_attendance_rollups
+# recomputes them from scratch for anything that did not (imports, manual SQL).
+
+STATUS_COLUMNS = {
+    AttendanceStatus.PRESENT: "present_days",
+    AttendanceStatus.ABSENT: "absent_days",
+    AttendanceStatus.HALF_DAY: "half_days",
+    AttendanceStatus.LEAVE: "leave_days",
+}
+ROLLUP_COLUMNS = ("present_days", "absent_days", "half_days", "leave_days", "worked_minutes")
+
+RollupKey = Tuple[int, int, int]  # (employee_profile_id, year, month)
+Counts = Dict[str, int]
+
+REBUILD_BATCH_SIZE = 5000
+
+def worked_minutes(check_in_time: Optional[datetime], check_out_time: Optional[datetime]) -> int:
+    if not check_in_time or not check_out_time or check_out_time <= check_in_time:
+        return 0
+    return int((check_out_time - check_in_time).total_seconds() // 60)
+
+def attendance_counts(status, check_in_time: Optional[datetime], check_out_time: Optional[datetime]) -> Counts:
+    """What one attendance record contributes to its month's rollup."""
+    counts = {column: 0 for column in ROLLUP_COLUMNS}
+    column = STATUS_COLUMNS.get(AttendanceStatus(status)) if status else None
+    if column:
+        counts[column] = 1
+    counts["worked_minutes"] = worked_minutes(check_in_time, check_out_time)
+    return counts
+
+def counts_of(attendance: Optional[Attendance]) -> Optional[Counts]:
+    """The rollup contribution of an attendance record, or None if there is no record."""
+    if attendance is None:
+        return None
+    return attendance_counts(attendance.status, attendance.check_in_time, attendance.check_out_time)
+
+def add_change(
+    deltas: Dict[RollupKey, Counts],
+    employee_profile_id: int,
+    day: date,
+    before: Optional[Counts],
+    after: Optional[Counts],
+) -> None:
+    """Accumulates the change of one attendance record into `deltas`."""
+    key = (employee_profile_id, day.year, day.month)
+    delta = deltas.setdefault(key, {column: 0 for column in ROLLUP_COLUMNS})
+    for column in ROLLUP_COLUMNS:
+        delta[column] += (after or {}).get(column, 0) - (before or {}).get(column, 0)
+
+def _ensure_rollups(db: Session, keys: List[RollupKey]) -> None:
+    """Creates empty rollups for the months that have none yet."""
+    existing = set(db.execute(
+        select(AttendanceMonthlyRollup.employee_profile_id, AttendanceMonthlyRollup.year, AttendanceMonthlyRollup.month)
+        .where(or_(*[
+            and_(
+                AttendanceMonthlyRollup.employee_profile_id == employee_id,
+                AttendanceMonthlyRollup.year == year,
+                AttendanceMonthlyRollup.month == month,
+            )
+            for employee_id, year, month in keys
+        ]))
+    ).all())
+    missing = [
+        {"employee_profile_id": employee_id, "year": year, "month": month, **{column: 0 for column in ROLLUP_COLUMNS}}
+        for employee_id, year, month in keys
+        if (employee_id, year, month) not in existing
+    ]
+    if not missing:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(AttendanceMonthlyRollup), missing)
+    except IntegrityError:
+        # A concurrent request created some of them; add the others one by one
+        for row in missing:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(AttendanceMonthlyRollup), [row])
+            except IntegrityError:
+                pass
+
+def apply_rollup_deltas(db: Session, deltas: Dict[RollupKey, Counts]) -> None:
+    """
+    Adds the accumulated changes to the rollups in the caller's transaction (the
+    caller commits): one query to find missing months and one executemany UPDATE.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+    _ensure_rollups(db, list(deltas))
+
+    table = AttendanceMonthlyRollup.__table__
+    db.execute(
+        update(table).where(
+            table.c.employee_profile_id == bindparam("b_employee_profile_id"),
+            table.c.year == bindparam("b_year"),
+            table.c.month == bindparam("b_month"),
+        ).values(**{column: table.c[column] + bindparam(f"b_{column}") for column in ROLLUP_COLUMNS}),
+        [
+            {
+                "b_employee_profile_id": employee_id, "b_year": year, "b_month": month,
+                **{f"b_{column}": delta[column] for column in ROLLUP_COLUMNS},
+            }
+            for (employee_id, year, month), delta in deltas.items()
+        ],
+    )
+
+def record_attendance_change(
+    db: Session,
+    employee_profile_id: int,
+    day: date,
+    before: Optional[Counts],
+    after: Optional[Counts],
+) -> None:
+    """Applies the change of a single attendance record (before/after from counts_of)."""
+    deltas: Dict[RollupKey, Counts] = {}
+    add_change(deltas, employee_profile_id, day, before, after)
+    apply_rollup_deltas(db, deltas)
+
+def _overlapping_months(period_start: date, period_end: date):
+    """WHERE criteria for the rollups of every month overlapping the period."""
+    first = period_start.year * 12 + period_start.month
+    last = period_end.year * 12 + period_end.month
+    month_index = AttendanceMonthlyRollup.year * 12 + AttendanceMonthlyRollup.month
+    return (
+        AttendanceMonthlyRollup.year >= period_start.year,
+        AttendanceMonthlyRollup.year <= period_end.year,
+        month_index >= first,
+        month_index <= last,
+    )
+
+def rollups_available(db: Session) -> bool:
+    """
+    Whether the rollups can stand in for the raw records: they have been built, or
+    there is no attendance to build them from. An install upgraded to the rollups
+    has attendance but an empty rollup table until they are rebuilt.
+    """
+    if db.execute(select(AttendanceMonthlyRollup.id).limit(1)).first():
+        return True
+    return db.execute(select(Attendance.id).limit(1)).first() is None
+
+def employees_with_absences(
+    db: Session,
+    employee_profile_ids: Iterable[int],
+    period_start: date,
+    period_end: date,
+) -> Set[int]:
+    """
+    The employees among those given with an absence or half day recorded in any
+    month overlapping the period (so possibly outside the period itself).
+    """
+    return set(db.execute(
+        select(AttendanceMonthlyRollup.employee_profile_id).where(
+            AttendanceMonthlyRollup.employee_profile_id.in_(list(employee_profile_ids)),
+            *_overlapping_months(period_start, period_end),
+            or_(AttendanceMonthlyRollup.absent_days > 0, AttendanceMonthlyRollup.half_days > 0),
+        ).distinct()
+    ).scalars())
+
+def get_month_summary(db: Session, year: int, month: int, company_id: Optional[int] = None) -> dict:
+    """Attendance totals of every employee (of one company, if given) for a month."""
+    stmt = select(*[func.coalesce(func.sum(AttendanceMonthlyRollup.__table__.c[column]), 0) for column in ROLLUP_COLUMNS]).where(
+        AttendanceMonthlyRollup.year == year,
+        AttendanceMonthlyRollup.month == month,
+    )
+    if company_id is not None:
+        stmt = stmt.join(EmployeeProfile, EmployeeProfile.id == AttendanceMonthlyRollup.employee_profile_id).where(
+            EmployeeProfile.company_id == company_id
+        )
+    totals = dict(zip(ROLLUP_COLUMNS, db.execute(stmt).one()))
+    minutes = totals.pop("worked_minutes")
+    return {
+        "year": year,
+        "month": month,
+        **totals,
+        "worked_hours": (Decimal(minutes) / 60).quantize(Decimal("0.01")),
+    }
+
+def rebuild_attendance_rollups(db: Session, employee_profile_id: Optional[int] = None) -> int:
+    """
+    Recomputes the rollups (of every employee, or of one) from the raw attendance
+    records in one transaction. Returns the number of rollup rows written.
+    """
+    delete_stmt = delete(AttendanceMonthlyRollup)
+    rows_stmt = select(
+        Attendance.employee_profile_id, Attendance.date, Attendance.status,
+        Attendance.check_in_time, Attendance.check_out_time,
+    ).execution_options(yield_per=REBUILD_BATCH_SIZE)
+    if employee_profile_id is not None:
+        delete_stmt = delete_stmt.where(AttendanceMonthlyRollup.employee_profile_id == employee_profile_id)
+        rows_stmt = rows_stmt.where(Attendance.employee_profile_id == employee_profile_id)
+
+    totals: Dict[RollupKey, Counts] = defaultdict(lambda: {column: 0 for column in ROLLUP_COLUMNS})
+    for employee_id, day, attendance_status, check_in_time, check_out_time in db.execute(rows_stmt):
+        total = totals[(employee_id, day.year, day.month)]
+        for column, value in attendance_counts(attendance_status, check_in_time, check_out_time).items():
+            total[column] += value
+
+    db.execute(delete_stmt)
+    rollups = [
+        {"employee_profile_id": employee_id, "year": year, "month": month, **counts}
+        for (employee_id, year, month), counts in totals.items()
+    ]
+    for start in range(0, len(rollups), REBUILD_BATCH_SIZE):
+        db.execute(insert(AttendanceMonthlyRollup), rollups[start:start + REBUILD_BATCH_SIZE])
+    db.commit()
+    return len(rollups)
@@ -0,0 +1,295 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import (
+    Attendance, AttendanceCorrectionRequest, CorrectionRequestStatus, EmployeeProfile,
+    LeaveBalance, LeaveBalanceLedger, LeaveRequest, LeaveStatus,
+)
+from app.services.attendance_rollup_service import add_change, apply_rollup_deltas, attendance_counts
+from app.services.calendar_service import count_working_days
+from app.services.dashboard_service import increment_counter, record_leave_approvals, PENDING_LEAVE_REQUEST_COUNT
+from app.services.leave_service import LEDGER_APPROVAL, is_unpaid_leave
+
+# Bulk review loads every request in a batch, and the balances or attendance records
+# it touches, with one query each, decides the outcome of every ID in memory and then
+# writes all transitions (and attendance rollup changes) with one executemany per
+# table in a single transaction.
+# The writes are the same conditional UPDATEs the single-request endpoints use
+# (status still pending, enough days remaining), so a request changed concurrently
+# is never applied twice; if any of them no longer matches, the whole batch is
+# rolled back with a 409 and can be sent again.
+
+# Per-ID outcomes of a bulk review
+REVIEW_APPROVED = "approved"
+REVIEW_REJECTED = "rejected"
+REVIEW_NOT_FOUND = "not_found"
+REVIEW_NOT_PENDING = "not_pending"
+REVIEW_OVERLAP = "overlap"
+REVIEW_INSUFFICIENT_BALANCE = "insufficient_balance"
+
+CONFLICT_DETAIL = "Some of these requests changed while they were being reviewed; reload them and try again"
+
+def _result(request_id: int, outcome: str, detail: Optional[str] = None) -> dict:
+    return {"id": request_id, "status": outcome, "detail": detail}
+
+def check_review_batch_size(ids: Sequence[int]) -> None:
+    if len(ids) > settings.BULK_REVIEW_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_REVIEW_MAX_IDS} requests can be reviewed at once",
+        )
+
+def summarize_review(results: List[dict]) -> dict:
+    """The bulk review response body for a list of per-ID outcomes."""
+    succeeded = sum(1 for result in results if result["status"] in (REVIEW_APPROVED, REVIEW_REJECTED))
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+def _update_all(db: Session, stmt, params: List[dict]) -> bool:
+    """Runs a conditional UPDATE once per parameter set; True if every one matched a row."""
+    if not params:
+        return True
+    if db.get_bind().dialect.supports_sane_multi_rowcount:
+        return db.execute(stmt, params).rowcount == len(params)
+    return all(db.execute(stmt, row).rowcount == 1 for row in params)
+
+def _plan_leave_approvals(
+    db: Session,
+    requests: List[LeaveRequest],
+    results: Dict[int, dict],
+) -> Tuple[List[Tuple[LeaveRequest, Decimal]], Dict[int, Decimal], List[dict]]:
+    """
+    Decides which pending requests can be approved, in order: a request may not
+    overlap approved leave (including leave approved earlier in the batch) and the
+    batch may not spend more than a balance has remaining. Returns the approvals
+    with their recounted days, the days to debit per balance and the ledger entries.
+    """
+    employee_ids = {request.employee_profile_id for request in requests}
+    company_ids = dict(db.execute(
+        select(EmployeeProfile.id, EmployeeProfile.company_id).where(EmployeeProfile.id.in_(employee_ids))
+    ).all())
+
+    approved_ranges: Dict[int, List[Tuple[date, date]]] = defaultdict(list)
+    rows = db.execute(
+        select(LeaveRequest.employee_profile_id, LeaveRequest.start_date, LeaveRequest.end_date).where(
+            LeaveRequest.employee_profile_id.in_(employee_ids),
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.start_date <= max(request.end_date for request in requests),
+            LeaveRequest.end_date >= min(request.start_date for request in requests),
+        )
+    )
+    for employee_id, start, end in rows:
+        approved_ranges[employee_id].append((start, end))
+
+    balances: Dict[tuple, List] = {}
+    for balance_id, employee_id, leave_type, year, remaining_days in db.execute(
+        select(
+            LeaveBalance.id, LeaveBalance.employee_profile_id, LeaveBalance.leave_type,
+            LeaveBalance.year, LeaveBalance.remaining_days,
+        ).where(
+            LeaveBalance.employee_profile_id.in_(employee_ids),
+            LeaveBalance.year.in_({request.start_date.year for request in requests}),
+        )
+    ):
+        balances[(employee_id, leave_type, year)] = [balance_id, Decimal(remaining_days)]
+
+    approvals, debits, ledger = [], defaultdict(Decimal), []
+    for request in requests:
+        days = request.total_days
+        company_id = company_ids.get(request.employee_profile_id)
+        if company_id is not None:
+            days = Decimal(count_working_days(db, company_id, request.start_date, request.end_date))
+
+        ranges = approved_ranges[request.employee_profile_id]
+        if any(start <= request.end_date and end >= request.start_date for start, end in ranges):
+            results[request.id] = _result(request.id, REVIEW_OVERLAP, "This request overlaps leave that is already approved")
+            continue
+
+        if not is_unpaid_leave(request.leave_type):
+            balance = balances.get((request.employee_profile_id, request.leave_type, request.start_date.year))
+            if balance is None or balance[1] < days:
+                results[request.id] = _result(
+                    request.id, REVIEW_INSUFFICIENT_BALANCE, "Insufficient leave balance to approve this request"
+                )
+                continue
+            balance[1] -= days
+            debits[balance[0]] += days
+            ledger.append({"leave_balance_id": balance[0], "leave_request_id": request.id, "days": days})
+
+        ranges.append((request.start_date, request.end_date))
+        approvals.append((request, days))
+    return approvals, debits, ledger
+
+def review_leave_requests(
+    db: Session,
+    ids: Sequence[int],
+    approve: bool,
+    reviewer_id: int,
+    comments: Optional[str] = None,
+) -> List[dict]:
+    """
+    Approves or rejects many leave requests in one transaction and returns the
+    outcome of every ID, in the order given.
+    """
+    ids = list(dict.fromkeys(ids))
+    requests = {request.id: request for request in db.query(LeaveRequest).filter(LeaveRequest.id.in_(ids))}
+
+    results: Dict[int, dict] = {}
+    pending = []
+    for request_id in ids:
+        request = requests.get(request_id)
+        if request is None:
+            results[request_id] = _result(request_id, REVIEW_NOT_FOUND, "Leave request not found")
+        elif request.status != LeaveStatus.PENDING:
+            results[request_id] = _result(request_id, REVIEW_NOT_PENDING, f"Leave request is already {request.status.value}")
+        else:
+            pending.append(request)
+
+    debits, ledger = {}, []
+    if approve and pending:
+        transitions, debits, ledger = _plan_leave_approvals(db, pending, results)
+    else:
+        transitions = [(request, request.total_days) for request in pending]
+    if not transitions:
+        return [results[request_id] for request_id in ids]
+
+    values = {
+        "status": LeaveStatus.APPROVED if approve else LeaveStatus.REJECTED,
+        "approver_id": reviewer_id,
+        "approved_at": datetime.now(),
+        "total_days": bindparam("b_total_days"),
+    }
+    if comments:
+        values["comments"] = comments
+    transition = update(LeaveRequest.__table__).where(
+        LeaveRequest.__table__.c.id == bindparam("b_id"),
+        LeaveRequest.__table__.c.status == LeaveStatus.PENDING,
+    ).values(**values)
+    debit = update(LeaveBalance.__table__).where(
+        LeaveBalance.__table__.c.id == bindparam("b_id"),
+        LeaveBalance.__table__.c.remaining_days >= bindparam("b_days"),
+    ).values(
+        used_days=func.coalesce(LeaveBalance.__table__.c.used_days, 0) + bindparam("b_days"),
+        remaining_days=LeaveBalance.__table__.c.remaining_days - bindparam("b_days"),
+    )
+
+    applied = _update_all(db, transition, [{"b_id": request.id, "b_total_days": days} for request, days in transitions])
+    if applied:
+        applied = _update_all(db, debit, [{"b_id": balance_id, "b_days": days} for balance_id, days in debits.items()])
+    if not applied:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+
+    if ledger:
+        db.execute(insert(LeaveBalanceLedger), [
+            {**entry, "entry_type": LEDGER_APPROVAL, "created_by_id": reviewer_id} for entry in ledger
+        ])
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT, -len(transitions))
+    if approve:
+        record_leave_approvals(db, [(request.employee_profile_id, request.start_date, request.end_date) for request, _ in transitions])
+    # Read before committing, which expires the loaded requests
+    applied_ids = [request.id for request, _ in transitions]
+    db.commit()
+
+    outcome = REVIEW_APPROVED if approve else REVIEW_REJECTED
+    for request_id in applied_ids:
+        results[request_id] = _result(request_id, outcome)
+    return [results[request_id] for request_id in ids]
+
+def review_correction_requests(
+    db: Session,
+    ids: Sequence[int],
+    approve: bool,
+    reviewer_id: int,
+    comments: Optional[str] = None,
+) -> List[dict]:
+    """
+    Approves or rejects many attendance correction requests in one transaction,
+    applying approved corrections to their attendance records, and returns the
+    outcome of every ID, in the order given.
+    """
+    ids = list(dict.fromkeys(ids))
+    corrections = {
+        correction.id: correction
+        for correction in db.query(AttendanceCorrectionRequest).filter(AttendanceCorrectionRequest.id.in_(ids))
+    }
+
+    results: Dict[int, dict] = {}
+    pending = []
+    for request_id in ids:
+        correction = corrections.get(request_id)
+        if correction is None:
+            results[request_id] = _result(request_id, REVIEW_NOT_FOUND, "Correction request not found")
+        elif correction.status != CorrectionRequestStatus.PENDING:
+            results[request_id] = _result(request_id, REVIEW_NOT_PENDING, f"Request is already {correction.status.value}")
+        else:
+            pending.append(correction)
+    if not pending:
+        return [results[request_id] for request_id in ids]
+
+    values = {
+        "status": CorrectionRequestStatus.APPROVED if approve else CorrectionRequestStatus.REJECTED,
+        "reviewed_by_id": reviewer_id,
+        "reviewed_at": datetime.now(),
+    }
+    if comments:
+        values["reviewer_comments"] = comments
+    table = AttendanceCorrectionRequest.__table__
+    transition = update(table).where(
+        table.c.id == bindparam("b_id"),
+        table.c.status == CorrectionRequestStatus.PENDING,
+    ).values(**values)
+    if not _update_all(db, transition, [{"b_id": correction.id} for correction in pending]):
+        db.rollback()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+
+    if approve:
+        attendances = {
+            row.id: row
+            for row in db.execute(
+                select(
+                    Attendance.id, Attendance.employee_profile_id, Attendance.date, Attendance.status,
+                    Attendance.check_in_time, Attendance.check_out_time,
+                ).where(Attendance.id.in_({correction.attendance_id for correction in pending}))
+            )
+        }
+        corrected: Dict[int, dict] = {}
+        deltas = {}
+        for correction in pending:
+            attendance = attendances.get(correction.attendance_id)
+            if attendance is None:
+                continue
+            # A record corrected twice in one batch ends up with the later times
+            previous = corrected.get(attendance.id, {
+                "b_check_in_time": attendance.check_in_time, "b_check_out_time": attendance.check_out_time,
+            })
+            add_change(
+                deltas, attendance.employee_profile_id, attendance.date,
+                attendance_counts(attendance.status, previous["b_check_in_time"], previous["b_check_out_time"]),
+                attendance_counts(attendance.status, correction.requested_check_in_time, correction.requested_check_out_time),
+            )
+            corrected[attendance.id] = {
+                "b_id": attendance.id,
+                "b_check_in_time": correction.requested_check_in_time,
+                "b_check_out_time": correction.requested_check_out_time,
+            }
+        if corrected:
+            db.execute(
+                update(Attendance.__table__).where(Attendance.__table__.c.id == bindparam("b_id")).values(
+                    check_in_time=bindparam("b_check_in_time"),
+                    check_out_time=bindparam("b_check_out_time"),
+                ),
+                list(corrected.values()),
+            )
+            apply_rollup_deltas(db, deltas)
+    applied_ids = [correction.id for correction in pending]
+    db.commit()
+
+    outcome = REVIEW_APPROVED if approve else REVIEW_REJECTED
+    for request_id in applied_ids:
+        results[request_id] = _result(request_id, outcome)
+    return [results[request_id] for request_id in ids]
@@ -0,0 +1,100 @@
+import threading
+import time
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import CompanyHoliday, CompanyWorkWeek, DEFAULT_WORKING_WEEKDAYS
+
+# A company's calendar for a year is compiled once into a running count of working
+# days (one entry per day of the year), so the number of working days in any range
+# is the difference of two entries and whether a day is a working day is the
+# difference of two neighbouring ones. Compiled years are cached per process and
+# dropped when the company's holidays or work week change; the TTL bounds how long
+# other worker processes can keep serving a calendar that was edited elsewhere.
+
+class CompiledYear:
+    """Working-day prefix sums for one company and year."""
+
+    __slots__ = ("year", "prefix", "compiled_at")
+
+    def __init__(self, year: int, prefix: array):
+        self.year = year
+        self.prefix = prefix
+        self.compiled_at = time.monotonic()
+
+    def count(self, start: date, end: date) -> int:
+        """Working days in [start, end], both within this year."""
+        first = start.timetuple().tm_yday - 1
+        last = end.timetuple().tm_yday
+        return self.prefix[last] - self.prefix[first]
+
+    def is_working_day(self, day: date) -> bool:
+        index = day.timetuple().tm_yday
+        return self.prefix[index] != self.prefix[index - 1]
+
+_cache: Dict[Tuple[int, int], CompiledYear] = {}
+_cache_lock = threading.Lock()
+
+def compile_year(working_weekdays: int, holidays, year: int) -> CompiledYear:
+    """Builds the prefix sums for a year from the work-week bitmask and holiday dates."""
+    holidays = set(holidays)
+    day = date(year, 1, 1)
+    prefix = array("H", [0])
+    while day.year == year:
+        is_working = working_weekdays >> day.weekday() & 1 and day not in holidays
+        prefix.append(prefix[-1] + (1 if is_working else 0))
+        day += timedelta(days=1)
+    return CompiledYear(year, prefix)
+
+def _load_year(db: Session, company_id: int, year: int) -> CompiledYear:
+    working_weekdays = db.execute(
+        select(CompanyWorkWeek.working_weekdays).where(CompanyWorkWeek.company_id == company_id)
+    ).scalar()
+    holidays = db.execute(
+        select(CompanyHoliday.date).where(
+            CompanyHoliday.company_id == company_id,
+            CompanyHoliday.date >= date(year, 1, 1),
+            CompanyHoliday.date <= date(year, 12, 31),
+        )
+    ).scalars()
+    if working_weekdays is None:
+        working_weekdays = DEFAULT_WORKING_WEEKDAYS
+    return compile_year(working_weekdays, holidays, year)
+
+def get_calendar_year(db: Session, company_id: int, year: int) -> CompiledYear:
+    """Returns the compiled calendar of a company for a year, compiling it on a cache miss."""
+    key = (company_id, year)
+    compiled = _cache.get(key)
+    if compiled is not None and time.monotonic() - compiled.compiled_at < settings.CALENDAR_CACHE_TTL_SECONDS:
+        return compiled
+
+    compiled = _load_year(db, company_id, year)
+    with _cache_lock:
+        _cache[key] = compiled
+    return compiled
+
+def invalidate_calendar(company_id: int, year: Optional[int] = None) -> None:
+    """Drops the cached calendars of a company (of one year, if given) after an edit."""
+    with _cache_lock:
+        for key in [key for key in _cache if key[0] == company_id and (year is None or key[1] == year)]:
+            del _cache[key]
+
+def clear_calendar_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+def count_working_days(db: Session, company_id: int, start: date, end: date) -> int:
+    """Working days in [start, end] for a company; one lookup per calendar year spanned."""
+    if end < start:
+        return 0
+    total = 0
+    for year in range(start.year, end.year + 1):
+        compiled = get_calendar_year(db, company_id, year)
+        total += compiled.count(max(start, date(year, 1, 1)), min(end, date(year, 12, 31)))
+    return total
+
+def is_working_day(db: Session, company_id: int, day: date) -> bool:
+    return get_calendar_year(db, company_id, day.year).is_working_day(day)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+from app.models import DashboardCounter, EmployeeProfile, LeaveRequest, LeaveStatus, User
+from app.services.leave_interval_service import count_employees_on_leave
+
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_COUNT = "employee_count"
+ACTIVE_USER_COUNT = "active_user_count"
+PENDING_LEAVE_REQUEST_COUNT = "pending_leave_request_count"
+EMPLOYEES_ON_LEAVE = "employees_on_leave"
+
+# How each counter is computed from scratch; used to seed and reconcile the stored values
+COUNTER_SOURCES: Dict[str, Callable[[Session], int]] = {
+    EMPLOYEE_COUNT: lambda db: db.query(func.count(EmployeeProfile.id)).scalar(),
+    ACTIVE_USER_COUNT: lambda db: db.query(func.count(User.id)).filter(User.is_active == True).scalar(),
+    PENDING_LEAVE_REQUEST_COUNT: lambda db: db.query(func.count(LeaveRequest.id)).filter(LeaveRequest.status == LeaveStatus.PENDING).scalar(),
+}
+
+def on_leave_counter(day: date) -> str:
+    """The counter of employees on approved leave on `day`; one is kept per day, from its first read."""
+    return f"{EMPLOYEES_ON_LEAVE}:{day.isoformat()}"
+
+def counter_sources(day: Optional[date] = None) -> Dict[str, Callable[[Session], int]]:
+    """COUNTER_SOURCES plus the counters dated `day` (defaults to today)."""
+    day = day or date.today()
+    return {**COUNTER_SOURCES, on_leave_counter(day): lambda db: count_employees_on_leave(db, day)}
+
+def increment_counter(db: Session, name: str, delta: int = 1) -> None:
+    """
+    Atomically adjusts a counter as part of the caller's transaction (the caller commits).
+    A counter that has not been seeded yet is left alone; it is computed from the
+    source table, including this write, the first time it is read.
+    """
+    if delta == 0:
+        return
+    db.execute(
+        update(DashboardCounter)
+        .where(DashboardCounter.name == name)
+        .values(value=DashboardCounter.value + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+def record_leave_approvals(db: Session, leave_ranges: Iterable[Tuple[int, date, date]]) -> None:
+    """
+    Counts the employees that newly approved leave, given as (employee_profile_id,
+    start_date, end_date), puts on leave today. Approved leave never overlaps, so
+    an employee cannot already be on leave that day.
+    """
+    today = date.today()
+    employee_ids = {employee_id for employee_id, start, end in leave_ranges if start <= today <= end}
+    increment_counter(db, on_leave_counter(today), len(employee_ids))
+
+def reconcile_dashboard_counters(db: Session, day: Optional[date] = None) -> Dict[str, int]:
+    """
+    Recomputes every counter (the dated ones for `day`, today by default) from its
+    source table and stores the result. Dated counters of other days are dropped.
+    """
+    values = {name: source(db) or 0 for name, source in counter_sources(day).items()}
+    for name, value in values.items():
+        db.merge(DashboardCounter(name=name, value=value))
+    db.execute(delete(DashboardCounter).where(
+        DashboardCounter.name.startswith(f"{EMPLOYEES_ON_LEAVE}:"),
+        DashboardCounter.name.not_in(list(values)),
+    ))
+    db.commit()
+    return values
+
+def get_dashboard_counters(db: Session, day: Optional[date] = None) -> Dict[str, int]:
+    """
+    Reads the counters (the dated ones for `day`, today by default) with a single
+    primary-key lookup, seeding them on first use, e.g. on the first read of a day.
+    """
+    names = list(counter_sources(day))
+    values = dict(db.query(DashboardCounter.name, DashboardCounter.value).filter(DashboardCounter.name.in_(names)))
+    if any(name not in values for name in names):
+        values.update(reconcile_dashboard_counters(db, day))
+    return values
+
+async def run_periodic_reconcile(session_factory: Callable[[], Session], interval_seconds: int) -> None:
+    """
+    Reconciles the counters every `interval_seconds` to correct any drift,
+    e.g. from rows changed outside the API. Runs until cancelled.
+    """
+    def reconcile():
+        db = session_factory()
+        try:
+            reconcile_dashboard_counters(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(reconcile)
+        except Exception:
+            logger.exception("Dashboard counter reconcile failed")
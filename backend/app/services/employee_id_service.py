@@ -0,0 +1,85 @@
+from datetime import date
+from typing import Dict, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import EmployeeIdSequence, EmployeeProfile
+
+# Employee login IDs look like OIJODO20220001: "OI", the first two letters of the
+# first and last name, the joining year and a four digit serial that restarts every
+# year. The serials come from one counter row per year, incremented with a single
+# UPDATE ... RETURNING, so allocating one costs the same however many employees
+# exist, and concurrent hires are serialized on that row until they commit.
+
+LOGIN_ID_PREFIX = "OI"
+
+def format_login_id(first_name: str, last_name: Optional[str], year: int, serial: int) -> str:
+    first_part = first_name[:2].upper()
+    last_part = last_name[:2].upper() if last_name else "XX"
+    return f"{LOGIN_ID_PREFIX}{first_part}{last_part}{year}{serial:04d}"
+
+def max_existing_serial(db: Session, year: int) -> int:
+    """
+    The highest serial among existing login IDs of employees who joined in `year`.
+    """
+    employee_ids = db.execute(
+        select(EmployeeProfile.employee_id).where(
+            EmployeeProfile.joining_date >= date(year, 1, 1),
+            EmployeeProfile.joining_date <= date(year, 12, 31),
+        )
+    ).scalars()
+    serials = [int(employee_id[-4:]) for employee_id in employee_ids if employee_id[-4:].isdigit()]
+    return max(serials, default=0)
+
+def allocate_serials(db: Session, year: int, count: int = 1) -> int:
+    """
+    Reserves `count` consecutive serials for `year` and returns the first one.
+    The reservation is part of the caller's transaction (the caller commits).
+    The first allocation for a year seeds its counter from the existing login IDs.
+    """
+    stmt = (
+        update(EmployeeIdSequence)
+        .where(EmployeeIdSequence.year == year)
+        .values(last_serial=EmployeeIdSequence.last_serial + count)
+        .returning(EmployeeIdSequence.last_serial)
+        .execution_options(synchronize_session=False)
+    )
+    last_serial = db.execute(stmt).scalar()
+    if last_serial is None:
+        try:
+            with db.begin_nested():
+                last_serial = max_existing_serial(db, year) + count
+                db.execute(insert(EmployeeIdSequence).values(year=year, last_serial=last_serial))
+        except IntegrityError:
+            # Another request seeded the counter first
+            last_serial = db.execute(stmt).scalar()
+    return last_serial - count + 1
+
+def allocate_login_id(db: Session, first_name: str, last_name: Optional[str], year: int) -> str:
+    """Allocates the next login ID for an employee joining in `year`."""
+    return format_login_id(first_name, last_name, year, allocate_serials(db, year))
+
+def backfill_employee_id_sequences(db: Session) -> Dict[int, int]:
+    """
+    Seeds or raises the counter of every joining year from the existing login IDs,
+    so that new IDs continue after them. Counters are never moved backwards.
+    Returns the resulting last serial per year.
+    """
+    max_serials: Dict[int, int] = {}
+    rows = db.execute(
+        select(EmployeeProfile.employee_id, EmployeeProfile.joining_date).where(EmployeeProfile.joining_date.isnot(None))
+    )
+    for employee_id, joining_date in rows:
+        serial = employee_id[-4:]
+        if serial.isdigit():
+            max_serials[joining_date.year] = max(max_serials.get(joining_date.year, 0), int(serial))
+
+    sequences = {sequence.year: sequence for sequence in db.query(EmployeeIdSequence)}
+    for year, max_serial in max_serials.items():
+        if year in sequences:
+            sequences[year].last_serial = max(sequences[year].last_serial, max_serial)
+        else:
+            sequences[year] = EmployeeIdSequence(year=year, last_serial=max_serial)
+            db.add(sequences[year])
+    db.commit()
+    return {year: sequence.last_serial for year, sequence in sorted(sequences.items())}
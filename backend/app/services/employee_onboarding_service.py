@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.models import EmployeeProfile, LeaveBalance, LeaveType, User, UserRole, UserSettings
+from app.schemas import EmployeeCreateBasic
+from app.services.dashboard_service import increment_counter, EMPLOYEE_COUNT, ACTIVE_USER_COUNT
+from app.services.employee_id_service import allocate_serials, format_login_id
+
+# Leave balances every new employee starts with, for their joining year
+DEFAULT_LEAVE_ALLOWANCES = [
+    (LeaveType.PAID, 24),
+    (LeaveType.SICK, 10),
+    (LeaveType.UNPAID, 0),
+]
+
+# Per-row outcomes of a bulk import
+ROW_CREATED = "created"
+ROW_SKIPPED = "skipped"
+ROW_INVALID = "invalid"
+
+def company_id_for_user(db: Session, user: User) -> int:
+    """
+    The company new employees are added to: the creating HR officer's or admin's company.
+    """
+    company_id = db.execute(
+        select(EmployeeProfile.company_id).where(EmployeeProfile.user_id == user.id)
+    ).scalar()
+    # Fallback if admin has no profile (should not happen in normal flow)
+    return company_id if company_id is not None else 1
+
+def parse_employee_rows(body: bytes, content_type: str) -> List[dict]:
+    """
+    Reads the records of a bulk import from a JSON body (a list, or {"employees": [...]})
+    or a CSV body whose header names the EmployeeCreateBasic fields.
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    try:
+        if media_type == "application/json":
+            data = json.loads(body or b"null")
+            if isinstance(data, dict):
+                data = data.get("employees")
+            if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+                raise HTTPException(status_code=400, detail="Expected a JSON list of employee records")
+            return data
+        if media_type in ("text/csv", "application/csv"):
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            return [{key.strip(): (value or "").strip() for key, value in row.items() if key} for row in reader]
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Could not parse the employee records")
+    raise HTTPException(status_code=415, detail="Send employee records as application/json or text/csv")
+
+def validate_employee_rows(db: Session, raw_rows: List[dict]) -> Tuple[List[Tuple[int, EmployeeCreateBasic]], Dict[int, dict]]:
+    """
+    Validates every record up front. Returns the rows to create, as (row number,
+    record) pairs, and the outcome of every other row keyed by row number: invalid
+    records, and records whose email is already registered, which are skipped so
+    that a partly applied import can simply be sent again.
+    """
+    results: Dict[int, dict] = {}
+    valid: List[Tuple[int, EmployeeCreateBasic]] = []
+    seen_emails = set()
+    for row, raw in enumerate(raw_rows, start=1):
+        try:
+            employee_in = EmployeeCreateBasic.model_validate(raw)
+        except ValidationError as e:
+            errors = [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            results[row] = {"row": row, "work_email": raw.get("work_email"), "status": ROW_INVALID, "errors": errors}
+            continue
+        if employee_in.work_email in seen_emails:
+            results[row] = {
+                "row": row, "work_email": employee_in.work_email, "status": ROW_INVALID,
+                "errors": ["work_email: appears more than once in this import"],
+            }
+            continue
+        seen_emails.add(employee_in.work_email)
+        valid.append((row, employee_in))
+
+    if not valid:
+        return valid, results
+
+    existing = dict(db.execute(
+        select(User.email, EmployeeProfile.employee_id)
+        .outerjoin(EmployeeProfile, EmployeeProfile.user_id == User.id)
+        .where(User.email.in_([employee_in.work_email for _, employee_in in valid]))
+    ).all())
+    to_create = []
+    for row, employee_in in valid:
+        if employee_in.work_email in existing:
+            results[row] = {
+                "row": row, "work_email": employee_in.work_email, "status": ROW_SKIPPED,
+                "employee_id": existing[employee_in.work_email], "errors": ["Email already registered"],
+            }
+        else:
+            to_create.append((row, employee_in))
+    return to_create, results
+
+def create_employees_bulk(
+    db: Session,
+    employees: List[EmployeeCreateBasic],
+    hashed_passwords: List[str],
+    company_id: int,
+) -> List[str]:
+    """
+    Creates the User, UserSettings, EmployeeProfile and default leave balances for
+    every employee with one multi-row INSERT per table, in a single transaction.
+    Returns the allocated login IDs in input order.
+    """
+    if not employees:
+        return []
+
+    # Reserve a block of serials per joining year
+    by_year: Dict[int, List[int]] = defaultdict(list)
+    for index, employee_in in enumerate(employees):
+        by_year[employee_in.joining_date.year].append(index)
+    login_ids: List[Optional[str]] = [None] * len(employees)
+    for year, indexes in by_year.items():
+        first_serial = allocate_serials(db, year, count=len(indexes))
+        for offset, index in enumerate(indexes):
+            employee_in = employees[index]
+            login_ids[index] = format_login_id(employee_in.first_name, employee_in.last_name, year, first_serial + offset)
+
+    # Generated keys are read back with one SELECT per table: an ordered RETURNING
+    # would make SQLite insert the rows one statement at a time
+    emails = [employee_in.work_email for employee_in in employees]
+    db.execute(insert(User), [
+        {"email": email, "hashed_password": hashed_password, "role": UserRole.EMPLOYEE, "is_active": True}
+        for email, hashed_password in zip(emails, hashed_passwords)
+    ])
+    user_id_by_email = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+    user_ids = [user_id_by_email[email] for email in emails]
+
+    db.execute(insert(UserSettings), [{"user_id": user_id} for user_id in user_ids])
+
+    db.execute(
+        insert(EmployeeProfile),
+        [
+            {
+                "user_id": user_id,
+                "company_id": company_id,
+                "employee_id": login_id,
+                "first_name": employee_in.first_name,
+                "last_name": employee_in.last_name,
+                "phone": employee_in.mobile,
+                "designation": employee_in.job_position,
+                "department": employee_in.department,
+                "joining_date": employee_in.joining_date,
+            }
+            for employee_in, user_id, login_id in zip(employees, user_ids, login_ids)
+        ],
+    )
+    profile_id_by_user = dict(db.execute(
+        select(EmployeeProfile.user_id, EmployeeProfile.id).where(EmployeeProfile.user_id.in_(user_ids))
+    ).all())
+    profile_ids = [profile_id_by_user[user_id] for user_id in user_ids]
+
+    db.execute(insert(LeaveBalance), [
+        {
+            "employee_profile_id": profile_id,
+            "leave_type": leave_type,
+            "total_days": Decimal(total),
+            "used_days": Decimal(0),
+            "remaining_days": Decimal(total),
+            "year": employee_in.joining_date.year,
+        }
+        for employee_in, profile_id in zip(employees, profile_ids)
+        for leave_type, total in DEFAULT_LEAVE_ALLOWANCES
+    ])
+
+    increment_counter(db, ACTIVE_USER_COUNT, len(employees))
+    increment_counter(db, EMPLOYEE_COUNT, len(employees))
+    db.commit()
+    return login_ids
@@ -0,0 +1,42 @@
+from datetime import date
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from app.models import Attendance
+from app.services.leave_interval_service import employees_on_leave
+
+def resolve_employee_statuses(
+    db: Session,
+    employee_profile_ids: Iterable[int],
+    day: Optional[date] = None
+) -> Dict[int, str]:
+    """
+    Resolves the attendance status of many employees for a given day (defaults to today).
+
+    Runs at most two queries regardless of how many employees are passed in:
+    one for the attendance records of the day and one for approved leave covering it.
+    Employees with an attendance record get its status, employees on approved leave
+    get "leave" and everyone else is "absent".
+    """
+    ids = list(set(employee_profile_ids))
+    if not ids:
+        return {}
+
+    day = day or date.today()
+
+    statuses: Dict[int, str] = {}
+    attendance_rows = db.query(Attendance.employee_profile_id, Attendance.status).filter(
+        Attendance.employee_profile_id.in_(ids),
+        Attendance.date == day
+    ).all()
+    for employee_profile_id, attendance_status in attendance_rows:
+        statuses[employee_profile_id] = attendance_status.value if hasattr(attendance_status, 'value') else str(attendance_status)
+
+    remaining_ids = [emp_id for emp_id in ids if emp_id not in statuses]
+    if remaining_ids:
+        for employee_profile_id in employees_on_leave(db, day, remaining_ids):
+            statuses[employee_profile_id] = "leave"
+
+    for emp_id in remaining_ids:
+        statuses.setdefault(emp_id, "absent")
+
+    return statuses
@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Iterable, Optional, Set
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import LeaveRequest, LeaveStatus
+
+# Interval queries over leave request date ranges, answered by B-tree range seeks
+# rather than an in-memory structure so every worker process sees the same data:
+#  - "does [start, end] overlap one of this employee's requests" seeks
+#    ix_leave_requests_employee_status_dates on (employee, status) and ranges over
+#    start_date <= end, checking end_date >= start from the index entries;
+#  - "who is on leave on day D" seeks ix_leave_requests_status_end_start on
+#    (status = approved, end_date >= D), so only leave that has not ended yet is
+#    visited, and checks start_date <= D from the same index entries.
+
+# Requests that hold their dates: a new request may not overlap any of these
+ACTIVE_LEAVE_STATUSES = (LeaveStatus.PENDING, LeaveStatus.APPROVED)
+
+def find_overlapping_leave(
+    db: Session,
+    employee_profile_id: int,
+    start: date,
+    end: date,
+    statuses=ACTIVE_LEAVE_STATUSES,
+    exclude_id: Optional[int] = None,
+) -> Optional[LeaveRequest]:
+    """
+    Returns the earliest of the employee's leave requests in one of `statuses` whose
+    date range overlaps [start, end], or None.
+    """
+    stmt = select(LeaveRequest).where(
+        LeaveRequest.employee_profile_id == employee_profile_id,
+        LeaveRequest.status.in_(statuses),
+        LeaveRequest.start_date <= end,
+        LeaveRequest.end_date >= start,
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(LeaveRequest.id != exclude_id)
+    return db.execute(stmt.order_by(LeaveRequest.start_date).limit(1)).scalar()
+
+def _on_leave_statement(day: date, employee_profile_ids: Optional[Iterable[int]]):
+    stmt = select(LeaveRequest.employee_profile_id).where(
+        LeaveRequest.status == LeaveStatus.APPROVED,
+        LeaveRequest.end_date >= day,
+        LeaveRequest.start_date <= day,
+    )
+    if employee_profile_ids is not None:
+        stmt = stmt.where(LeaveRequest.employee_profile_id.in_(list(employee_profile_ids)))
+    return stmt
+
+def employees_on_leave(
+    db: Session,
+    day: Optional[date] = None,
+    employee_profile_ids: Optional[Iterable[int]] = None,
+) -> Set[int]:
+    """
+    IDs of the employees on approved leave on `day` (defaults to today), optionally
+    restricted to the given employees.
+    """
+    day = day or date.today()
+    return set(db.execute(_on_leave_statement(day, employee_profile_ids).distinct()).scalars())
+
+def count_employees_on_leave(db: Session, day: Optional[date] = None) -> int:
+    """Number of employees on approved leave on `day` (defaults to today)."""
+    day = day or date.today()
+    on_leave = _on_leave_statement(day, None).distinct().subquery()
+    return db.execute(select(func.count()).select_from(on_leave)).scalar() or 0
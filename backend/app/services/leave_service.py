@@ -1,2 +1,127 @@
-# app/services/leave_service.py
-# This file will contain business logic related to leave management.
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import and_, extract, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app.models import LeaveBalance, LeaveBalanceLedger, LeaveRequest, LeaveStatus, LeaveType
+
+# Leave balances and request statuses are only changed with conditional UPDATEs:
+# the condition that makes a change valid (enough days remaining, the request still
+# pending) is part of the WHERE clause, so the database checks it against the row
+# it is about to write, under that row's write lock, instead of against a value a
+# request read earlier. Of two concurrent approvals only one can match; the other
+# updates no row and is turned away. Each debit is also recorded in the balance
+# ledger, from which recompute_leave_balances can rebuild the used and remaining days.
+
+LEDGER_APPROVAL = "approval"
+
+def is_unpaid_leave(leave_type) -> bool:
+    return str(leave_type.value if hasattr(leave_type, "value") else leave_type) == LeaveType.UNPAID.value
+
+def transition_leave_request(
+    db: Session,
+    leave_request_id: int,
+    from_status: LeaveStatus,
+    to_status: LeaveStatus,
+    **values,
+) -> bool:
+    """
+    Moves a leave request from `from_status` to `to_status` (setting any other given
+    columns) in the caller's transaction. Returns False, changing nothing, if the
+    request is no longer in `from_status`.
+    """
+    result = db.execute(
+        update(LeaveRequest)
+        .where(LeaveRequest.id == leave_request_id, LeaveRequest.status == from_status)
+        .values(status=to_status, **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def debit_leave_balance(
+    db: Session,
+    leave_request: LeaveRequest,
+    days: Decimal,
+    created_by_id: Optional[int] = None,
+) -> bool:
+    """
+    Charges `days` for an approved leave request to the employee's balance of its
+    type and year, and records the charge in the ledger, in the caller's transaction.
+    Returns False, changing nothing, if the balance does not exist or has fewer
+    than `days` remaining.
+    """
+    balance_id = db.execute(
+        update(LeaveBalance)
+        .where(
+            LeaveBalance.employee_profile_id == leave_request.employee_profile_id,
+            LeaveBalance.leave_type == leave_request.leave_type,
+            LeaveBalance.year == leave_request.start_date.year,
+            LeaveBalance.remaining_days >= days,
+        )
+        .values(
+            used_days=func.coalesce(LeaveBalance.used_days, 0) + days,
+            remaining_days=LeaveBalance.remaining_days - days,
+        )
+        .returning(LeaveBalance.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if balance_id is None:
+        return False
+
+    db.execute(insert(LeaveBalanceLedger).values(
+        leave_balance_id=balance_id,
+        leave_request_id=leave_request.id,
+        entry_type=LEDGER_APPROVAL,
+        days=days,
+        created_by_id=created_by_id,
+    ))
+    return True
+
+def backfill_leave_ledger(db: Session) -> int:
+    """
+    Records a ledger entry for every approved, paid leave request that has none
+    (requests approved before the ledger existed). Returns the number of entries.
+    """
+    missing = select(
+        LeaveBalance.id,
+        LeaveRequest.id,
+        literal(LEDGER_APPROVAL),
+        LeaveRequest.total_days,
+        LeaveRequest.approver_id,
+    ).join(
+        LeaveBalance,
+        and_(
+            LeaveBalance.employee_profile_id == LeaveRequest.employee_profile_id,
+            LeaveBalance.leave_type == LeaveRequest.leave_type,
+            LeaveBalance.year == extract("year", LeaveRequest.start_date),
+        ),
+    ).where(
+        LeaveRequest.status == LeaveStatus.APPROVED,
+        LeaveRequest.leave_type != LeaveType.UNPAID,
+        ~select(LeaveBalanceLedger.id).where(LeaveBalanceLedger.leave_request_id == LeaveRequest.id).exists(),
+    )
+    count = db.execute(insert(LeaveBalanceLedger).from_select(
+        ["leave_balance_id", "leave_request_id", "entry_type", "days", "created_by_id"], missing,
+    )).rowcount
+    db.commit()
+    return count
+
+def recompute_leave_balances(db: Session, employee_profile_id: Optional[int] = None) -> int:
+    """
+    Rebuilds used_days and remaining_days of every balance (or one employee's) from
+    the ledger, keeping total_days as the allowance. Returns the number of balances.
+    """
+    used_days = func.coalesce(
+        select(func.sum(LeaveBalanceLedger.days))
+        .where(LeaveBalanceLedger.leave_balance_id == LeaveBalance.id)
+        .scalar_subquery(),
+        0,
+    )
+    stmt = update(LeaveBalance).values(
+        used_days=used_days,
+        remaining_days=LeaveBalance.total_days - used_days,
+    ).execution_options(synchronize_session=False)
+    if employee_profile_id is not None:
+        stmt = stmt.where(LeaveBalance.employee_profile_id == employee_profile_id)
+    count = db.execute(stmt).rowcount
+    db.commit()
+    return count
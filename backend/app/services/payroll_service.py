@@ -0,0 +1,314 @@
+import calendar
+import logging
+import operator
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from functools import reduce
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app.models import (
+    Attendance, AttendanceStatus, EmployeeProfile, LeaveRequest, LeaveStatus, LeaveType,
+    PayrollRun, PayrollRunEntry, SalaryStructure,
+)
+from app.services.attendance_rollup_service import employees_with_absences, rollups_available
+from app.services.calendar_service import count_working_days, get_calendar_year
+
+# The payroll engine reads salary structures as plain column tuples, a chunk at a
+# time, and computes each amount for the whole chunk column by column (Decimal
+# throughout, rounded to cents once at the end). Loss-of-pay days for the chunk are
+# loaded with one query per source (daily attendance only for the employees whose
+# monthly rollups show an absence, or for all of them while the rollups have not
+# been built), so a run costs a handful of queries per chunk
+# instead of several per employee. Pay is prorated over the working days of each
+# employee's company calendar; weekends and holidays never count as loss of pay.
+# Salary structures hold monthly amounts, so a run always covers one calendar month.
+
+logger = logging.getLogger(__name__)
+
+PAYROLL_CHUNK_SIZE = 2000
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+HALF_DAY = Decimal("0.5")
+
+EARNING_COLUMNS = (
+    SalaryStructure.basic_salary,
+    SalaryStructure.hra,
+    SalaryStructure.standard_allowance,
+    SalaryStructure.performance_bonus,
+    SalaryStructure.lta,
+    SalaryStructure.fixed_allowance,
+)
+# Professional tax is a flat monthly amount; the PF contribution follows earned pay
+FIXED_DEDUCTION_COLUMNS = (SalaryStructure.professional_tax,)
+PRORATED_DEDUCTION_COLUMNS = (SalaryStructure.pf_contribution,)
+
+SALARY_COLUMNS = EARNING_COLUMNS + FIXED_DEDUCTION_COLUMNS + PRORATED_DEDUCTION_COLUMNS
+
+def _add_columns(columns: Sequence[Sequence[Decimal]]) -> List[Decimal]:
+    """Element-wise sum of equally long columns."""
+    return list(reduce(lambda total, column: map(operator.add, total, column), columns))
+
+def _round(column) -> List[Decimal]:
+    return [value.quantize(CENT, rounding=ROUND_HALF_UP) for value in column]
+
+def is_calendar_month(period_start: date, period_end: date) -> bool:
+    """Whether the period is exactly one calendar month, the period salaries are paid for."""
+    return (
+        period_start.day == 1
+        and (period_end.year, period_end.month) == (period_start.year, period_start.month)
+        and period_end.day == calendar.monthrange(period_end.year, period_end.month)[1]
+    )
+
+def _salary_statement():
+    return select(
+        SalaryStructure.id,
+        SalaryStructure.employee_profile_id,
+        *[func.coalesce(column, 0).label(column.key) for column in SALARY_COLUMNS],
+    )
+
+def compute_salary_columns(rows: Sequence[tuple]) -> Dict[str, List]:
+    """
+    Computes gross salary, deductions and net salary for rows selected with
+    _salary_statement(), returning one list per output column.
+    """
+    if not rows:
+        rows_as_columns = [()] * (len(SALARY_COLUMNS) + 2)
+    else:
+        rows_as_columns = list(zip(*rows))
+
+    ids, employee_ids, *components = rows_as_columns
+    components = [[Decimal(value) for value in column] for column in components]
+    earnings = components[:len(EARNING_COLUMNS)]
+    fixed_deductions = _add_columns(components[len(EARNING_COLUMNS):len(EARNING_COLUMNS) + len(FIXED_DEDUCTION_COLUMNS)])
+    prorated_deductions = _add_columns(components[len(EARNING_COLUMNS) + len(FIXED_DEDUCTION_COLUMNS):])
+
+    gross = _add_columns(earnings)
+    total_deductions = list(map(operator.add, fixed_deductions, prorated_deductions))
+    return {
+        "id": list(ids),
+        "employee_profile_id": list(employee_ids),
+        "components": components,
+        "fixed_deductions": fixed_deductions,
+        "prorated_deductions": prorated_deductions,
+        "gross_salary": gross,
+        "total_deductions": total_deductions,
+        "net_salary": list(map(operator.sub, gross, total_deductions)),
+    }
+
+def get_payroll_projection(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+    """
+    Returns a page of salary structures with their computed gross, deductions and
+    net salary, without loading SalaryStructure entities.
+    """
+    rows = db.execute(_salary_statement().order_by(SalaryStructure.id).offset(skip).limit(limit)).all()
+    computed = compute_salary_columns(rows)
+    columns = {column.key: values for column, values in zip(SALARY_COLUMNS, computed["components"])}
+    return [
+        {
+            "id": computed["id"][i],
+            "employee_profile_id": computed["employee_profile_id"][i],
+            **{key: values[i] for key, values in columns.items()},
+            "gross_salary": computed["gross_salary"][i],
+            "total_deductions": computed["total_deductions"][i],
+            "net_salary": computed["net_salary"][i],
+        }
+        for i in range(len(rows))
+    ]
+
+def _iter_salary_chunks(db: Session, chunk_size: int) -> Iterator[Sequence[tuple]]:
+    last_id = 0
+    while True:
+        rows = db.execute(
+            _salary_statement().where(SalaryStructure.id > last_id).order_by(SalaryStructure.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+WorkingDayCheck = Callable[[int, date], bool]
+
+def _unpaid_leave_dates(
+    db: Session,
+    employee_ids: Sequence[int],
+    period_start: date,
+    period_end: date,
+    is_working_day: WorkingDayCheck,
+) -> Dict[int, Set[date]]:
+    """Working days within the period covered by approved unpaid leave, per employee."""
+    leave_dates: Dict[int, Set[date]] = defaultdict(set)
+    rows = db.execute(
+        select(LeaveRequest.employee_profile_id, LeaveRequest.start_date, LeaveRequest.end_date).where(
+            LeaveRequest.employee_profile_id.in_(employee_ids),
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.leave_type == LeaveType.UNPAID,
+            LeaveRequest.start_date <= period_end,
+            LeaveRequest.end_date >= period_start,
+        )
+    )
+    for employee_id, start, end in rows:
+        day, last = max(start, period_start), min(end, period_end)
+        while day <= last:
+            if is_working_day(employee_id, day):
+                leave_dates[employee_id].add(day)
+            day += timedelta(days=1)
+    return leave_dates
+
+def _absent_days(
+    db: Session,
+    employee_ids: Sequence[int],
+    period_start: date,
+    period_end: date,
+    leave_dates: Dict[int, Set[date]],
+    is_working_day: WorkingDayCheck,
+    use_rollups: bool = True,
+) -> Dict[int, Decimal]:
+    """
+    Absent working days (half days count as 0.5) within the period, per employee.
+    Days already covered by unpaid leave are not counted twice.
+    """
+    absent: Dict[int, Decimal] = defaultdict(Decimal)
+    with_absences = list(employee_ids)
+    if use_rollups:
+        # The monthly rollups tell which employees have any absence in the period's
+        # months; only their daily records are read, to match them against the calendar
+        with_absences = employees_with_absences(db, employee_ids, period_start, period_end)
+        if not with_absences:
+            return absent
+    rows = db.execute(
+        select(Attendance.employee_profile_id, Attendance.date, Attendance.status).where(
+            Attendance.employee_profile_id.in_(with_absences),
+            Attendance.date >= period_start,
+            Attendance.date <= period_end,
+            Attendance.status.in_([AttendanceStatus.ABSENT, AttendanceStatus.HALF_DAY]),
+        )
+    )
+    for employee_id, day, attendance_status in rows:
+        if day in leave_dates.get(employee_id, ()) or not is_working_day(employee_id, day):
+            continue
+        absent[employee_id] += Decimal(1) if attendance_status == AttendanceStatus.ABSENT else HALF_DAY
+    return absent
+
+def compute_payroll_chunk(
+    db: Session,
+    rows: Sequence[tuple],
+    period_start: date,
+    period_end: date,
+    use_rollups: Optional[bool] = None,
+) -> List[dict]:
+    """
+    Computes the payroll entries for a chunk of salary rows, prorating pay over the
+    working days of the period by the loss-of-pay days (approved unpaid leave and
+    absences) that fall on working days. `use_rollups` defaults to whether the
+    monthly rollups have been built.
+    """
+    if use_rollups is None:
+        use_rollups = rollups_available(db)
+    company_ids = dict(db.execute(
+        select(EmployeeProfile.id, EmployeeProfile.company_id).where(EmployeeProfile.id.in_([row[1] for row in rows]))
+    ).all())
+    # SQLite does not enforce the foreign key, so a salary structure can outlive its profile
+    orphans = [row[0] for row in rows if row[1] not in company_ids]
+    if orphans:
+        logger.warning("Skipped salary structures without an employee profile: %s", orphans)
+        rows = [row for row in rows if row[1] in company_ids]
+    computed = compute_salary_columns(rows)
+    employee_ids = computed["employee_profile_id"]
+
+    working_days_by_company = {
+        company_id: Decimal(count_working_days(db, company_id, period_start, period_end))
+        for company_id in set(company_ids.values())
+    }
+
+    def is_working_day(employee_id: int, day: date) -> bool:
+        return get_calendar_year(db, company_ids[employee_id], day.year).is_working_day(day)
+
+    leave_dates = _unpaid_leave_dates(db, employee_ids, period_start, period_end, is_working_day)
+    absent = _absent_days(db, employee_ids, period_start, period_end, leave_dates, is_working_day, use_rollups)
+    working_days = [working_days_by_company[company_ids[employee_id]] for employee_id in employee_ids]
+    unpaid_leave_days = [Decimal(len(leave_dates.get(employee_id, ()))) for employee_id in employee_ids]
+    absent_days = [absent.get(employee_id, ZERO) for employee_id in employee_ids]
+    payable_days = [
+        max(working - unpaid - absence, ZERO)
+        for working, unpaid, absence in zip(working_days, unpaid_leave_days, absent_days)
+    ]
+
+    def prorate(column):
+        # A period without working days has nothing to pay for
+        return [
+            value * days / working if working else ZERO
+            for value, days, working in zip(column, payable_days, working_days)
+        ]
+
+    prorated_gross = _round(prorate(computed["gross_salary"]))
+    # Fixed deductions (professional tax) only apply to a period with something to
+    # pay, and deductions never exceed the pay, so net pay is never negative
+    fixed_deductions = [fixed if days else ZERO for fixed, days in zip(computed["fixed_deductions"], payable_days)]
+    prorated_deductions = _round(map(operator.add, fixed_deductions, prorate(computed["prorated_deductions"])))
+    prorated_deductions = list(map(min, prorated_deductions, prorated_gross))
+    net_pay = list(map(operator.sub, prorated_gross, prorated_deductions))
+
+    return [
+        {
+            "employee_profile_id": employee_ids[i],
+            "salary_structure_id": computed["id"][i],
+            "gross_salary": computed["gross_salary"][i],
+            "total_deductions": computed["total_deductions"][i],
+            "unpaid_leave_days": unpaid_leave_days[i],
+            "absent_days": absent_days[i],
+            "payable_days": payable_days[i],
+            "prorated_gross": prorated_gross[i],
+            "prorated_deductions": prorated_deductions[i],
+            "net_pay": net_pay[i],
+        }
+        for i in range(len(rows))
+    ]
+
+def run_payroll(
+    db: Session,
+    period_start: date,
+    period_end: date,
+    created_by_id: Optional[int] = None,
+    chunk_size: int = PAYROLL_CHUNK_SIZE,
+) -> PayrollRun:
+    """
+    Computes pay for every employee with a salary structure over the period (one
+    calendar month, ValueError otherwise) and stores the run and its entries in a
+    single transaction.
+    """
+    if not is_calendar_month(period_start, period_end):
+        raise ValueError("A payroll run covers exactly one calendar month")
+    payroll_run = PayrollRun(
+        period_start=period_start,
+        period_end=period_end,
+        period_days=(period_end - period_start).days + 1,
+        created_by_id=created_by_id,
+    )
+    db.add(payroll_run)
+    db.flush()
+
+    employee_count, total_gross, total_deductions, total_net = 0, ZERO, ZERO, ZERO
+    use_rollups = rollups_available(db)
+    for rows in _iter_salary_chunks(db, chunk_size):
+        entries = compute_payroll_chunk(db, rows, period_start, period_end, use_rollups)
+        if not entries:
+            continue
+        for entry in entries:
+            entry["payroll_run_id"] = payroll_run.id
+        db.execute(insert(PayrollRunEntry), entries)
+
+        employee_count += len(entries)
+        total_gross += sum((entry["prorated_gross"] for entry in entries), ZERO)
+        total_deductions += sum((entry["prorated_deductions"] for entry in entries), ZERO)
+        total_net += sum((entry["net_pay"] for entry in entries), ZERO)
+
+    payroll_run.employee_count = employee_count
+    payroll_run.total_gross = total_gross
+    payroll_run.total_deductions = total_deductions
+    payroll_run.total_net = total_net
+    db.commit()
+    db.refresh(payroll_run)
+    return payroll_run
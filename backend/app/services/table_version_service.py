@@ -0,0 +1,147 @@
+from itertools import chain
+from typing import Dict, Iterable, Set, Type, Union
+from sqlalchemy import event, func, inspect, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import (
+    Attendance, AttendanceMonthlyRollup, DashboardCounter, EmployeeProfile, LeaveRequest, TableVersion, User,
+)
+
+# Per-table write counters for conditional GETs. Sessions record the polled tables
+# they write to, from flushed objects and from INSERT/UPDATE/DELETE statements run
+# through session.execute, and bump those tables' versions just before the
+# transaction commits, so a version changes exactly when a committed write may have
+# changed what a read of the table returns. Writes made outside a Session
+# (engine.begin() in scripts, the activity log writer) are not tracked.
+
+VERSION_TABLE = TableVersion.__tablename__
+CHANGED_TABLES_KEY = "changed_tables"
+
+# The tables polled endpoints take their ETags from; conditional_get refuses any
+# other. Writes to the rest bump nothing.
+POLLED_TABLES = frozenset({
+    Attendance.__tablename__,
+    AttendanceMonthlyRollup.__tablename__,
+    DashboardCounter.__tablename__,
+    EmployeeProfile.__tablename__,
+    LeaveRequest.__tablename__,
+    User.__tablename__,
+})
+
+# Tables every check-in writes to. Bumping a shared counter row from each of those
+# transactions would queue them on its row lock (on PostgreSQL) until the previous
+# one commits, so their inserts and updates show in the newest id and updated_at,
+# read at request time from their indexes, instead. Deletes change neither and
+# still bump the counter.
+STAMPED_MODELS = {model.__tablename__: model for model in (Attendance, AttendanceMonthlyRollup)}
+
+def _changed_tables(session: Session) -> Set[str]:
+    return session.info.setdefault(CHANGED_TABLES_KEY, set())
+
+def _record_write(session: Session, table_name: str, is_delete: bool) -> None:
+    if table_name in POLLED_TABLES and (is_delete or table_name not in STAMPED_MODELS):
+        _changed_tables(session).add(table_name)
+
+def _record_flushed_tables(session: Session, flush_context) -> None:
+    for objects, is_delete in ((chain(session.new, session.dirty), False), (session.deleted, True)):
+        for obj in objects:
+            for table in inspect(obj).mapper.tables:
+                _record_write(session, table.name, is_delete)
+
+def _record_statement_table(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        _record_write(orm_execute_state.session, table.name, orm_execute_state.is_delete)
+
+def _bump_before_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # a savepoint; the outer transaction bumps everything on commit
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if tables:
+        bump_table_versions(session, tables)
+
+def _forget_changes(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return  # a savepoint; writes before it are still part of the outer transaction
+    session.info.pop(CHANGED_TABLES_KEY, None)
+
+def track_table_versions(session_class: Type[Session] = Session) -> None:
+    """Installs the session events that keep the table versions up to date (idempotent)."""
+    listeners = (
+        ("after_flush", _record_flushed_tables),
+        ("do_orm_execute", _record_statement_table),
+        ("before_commit", _bump_before_commit),
+        ("after_soft_rollback", _forget_changes),
+    )
+    for name, listener in listeners:
+        if not event.contains(session_class, name, listener):
+            event.listen(session_class, name, listener)
+
+def bump_table_versions(db: Session, tables: Iterable[str]) -> None:
+    """Increments the versions of the given tables in the caller's transaction."""
+    tables = sorted(set(tables))
+    matched = db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if matched == len(tables):
+        return
+    # Tables created after seed_table_versions last ran
+    existing = set(db.execute(select(TableVersion.table_name).where(TableVersion.table_name.in_(tables))).scalars())
+    missing = [{"table_name": table, "version": 1} for table in tables if table not in existing]
+    try:
+        with db.begin_nested():
+            db.execute(insert(TableVersion), missing)
+    except IntegrityError:
+        # A concurrent transaction created some of them since the UPDATE above
+        for row in missing:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(TableVersion), [row])
+            except IntegrityError:
+                db.execute(
+                    update(TableVersion)
+                    .where(TableVersion.table_name == row["table_name"])
+                    .values(version=TableVersion.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+
+def seed_table_versions(engine: Engine) -> None:
+    """Creates the missing version rows for every table on the models (run on startup)."""
+    with engine.begin() as conn:
+        existing = set(conn.execute(select(TableVersion.table_name)).scalars())
+        missing = [
+            {"table_name": table, "version": 0}
+            for table in Base.metadata.tables
+            if table != VERSION_TABLE and table not in existing
+        ]
+        if missing:
+            conn.execute(insert(TableVersion), missing)
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> Dict[str, Union[int, str]]:
+    """
+    The current version of each table (0 for a table that was never written to),
+    extended with the newest id and updated_at for the stamped tables.
+    """
+    tables = sorted(set(tables))
+    versions = dict(db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    ).all())
+    versions = {table: versions.get(table, 0) for table in tables}
+    stamped = [table for table in tables if table in STAMPED_MODELS]
+    if stamped:
+        newest = iter(db.execute(select(*chain.from_iterable(
+            (select(func.max(column)).scalar_subquery() for column in (STAMPED_MODELS[table].id, STAMPED_MODELS[table].updated_at))
+            for table in stamped
+        ))).one())
+        for table in stamped:
+            versions[table] = f"{versions[table]}:{next(newest)}:{next(newest)}"
+    return versions
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Collection, Optional
+from fastapi import HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app.config import settings
+
+# Every upload route stores files through save_upload. The file is read and written
+# in fixed-size chunks with the file I/O in the threadpool, so a large upload never
+# blocks the event loop; its type is taken from its leading bytes rather than the
+# client's Content-Type, and its SHA-256 is computed while it is written.
+#
+# Starlette parses (and spools to disk) the whole multipart body before a route
+# runs, so save_upload only sees an oversized upload after it was received.
+# UploadSizeLimitMiddleware refuses such request bodies before they are parsed.
+
+JPEG = "image/jpeg"
+PNG = "image/png"
+GIF = "image/gif"
+PDF = "application/pdf"
+DOC = "application/msword"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+IMAGE_TYPES = (JPEG, PNG, GIF)
+DOCUMENT_TYPES = (PDF, DOC, DOCX)
+
+# Leading bytes of each accepted type. DOCX files are ZIP archives, so any ZIP is
+# taken for a DOCX; it is only accepted where Word documents are.
+MAGIC_BYTES = (
+    (b"\xff\xd8\xff", JPEG),
+    (b"\x89PNG\r\n\x1a\n", PNG),
+    (b"GIF87a", GIF),
+    (b"GIF89a", GIF),
+    (b"%PDF-", PDF),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", DOC),
+    (b"PK\x03\x04", DOCX),
+)
+
+EXTENSIONS = {JPEG: ".jpg", PNG: ".png", GIF: ".gif", PDF: ".pdf", DOC: ".doc", DOCX: ".docx"}
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """The content type of a file from its first bytes, or None if it is not one we accept."""
+    for magic, content_type in MAGIC_BYTES:
+        if head.startswith(magic):
+            return content_type
+    return None
+
+def _too_large(max_bytes: int, what: str = "File") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{what} is larger than the {max_bytes // (1024 * 1024)} MiB limit",
+    )
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    The body of a request that a route parses itself, refused with 413 when its
+    Content-Length is over `max_bytes`, or otherwise as soon as the received bytes
+    pass it, so an oversized body is never held in memory.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise _too_large(max_bytes, "Request body")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise _too_large(max_bytes, "Request body")
+    return bytes(body)
+
+# Room for the multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware that answers a multipart request whose body is larger than
+    UPLOAD_MAX_BYTES (plus MULTIPART_OVERHEAD_BYTES) with 413 before the form is
+    parsed: right away when its Content-Length says so, and otherwise (a chunked
+    body) as soon as the received bytes pass the limit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers", [])) if scope["type"] == "http" else {}
+        if not headers.get(b"content-type", b"").lower().startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            error = _too_large(settings.UPLOAD_MAX_BYTES)
+            await JSONResponse({"detail": error.detail}, status_code=error.status_code)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_within_limit():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(settings.UPLOAD_MAX_BYTES)
+            return message
+
+        await self.app(scope, receive_within_limit, send)
+
+async def save_upload(
+    file: UploadFile,
+    directory: Path,
+    allowed_types: Collection[str],
+    type_error: str,
+    name: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> dict:
+    """
+    Streams an uploaded file into `directory` as `name` (a random name by default)
+    plus the extension of its sniffed type, and returns its url, content_type,
+    size and sha256. Raises 400 with `type_error` if the type is not allowed and 413
+    if the file is larger than `max_bytes` (settings.UPLOAD_MAX_BYTES by default);
+    nothing is left on disk in either case.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    # The size of the part Starlette has already spooled, when it tracked it
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+    content_type = sniff_content_type(chunk)
+    if content_type not in allowed_types:
+        raise HTTPException(status_code=400, detail=type_error)
+
+    file_path = directory / f"{name or uuid.uuid4()}{EXTENSIONS[content_type]}"
+    # Written under a temporary name and renamed at the end, so a rejected or failed
+    # upload never replaces an existing file
+    part_path = file_path.with_name(f".{uuid.uuid4()}.part")
+    sha256 = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(open, part_path, "wb")
+    try:
+        while chunk:
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            sha256.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+            chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(os.replace, part_path, file_path)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(part_path.unlink, True)
+        raise
+
+    return {
+        "url": f"/{file_path.as_posix()}",
+        "content_type": content_type,
+        "size": size,
+        "sha256": sha256.hexdigest(),
+    }
@@ -0,0 +1,39 @@
+"""
+Seeds the per-year employee login ID counters from the existing employee IDs.
+
+New login IDs continue after the highest serial already used in each joining
+year. Counters are created on first use anyway; run this once after upgrading, or
+after importing employees with login IDs generated elsewhere, so that no
+allocation has to scan the existing IDs. Safe to run repeatedly.
+
+Run from the backend directory: python scripts/backfill_employee_id_sequences.py
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.services.employee_id_service import backfill_employee_id_sequences
+
+
+def main():
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        sequences = backfill_employee_id_sequences(db)
+    finally:
+        db.close()
+
+    if not sequences:
+        print("No employee login IDs found.")
+    for year, last_serial in sequences.items():
+        print(f"{year}: last serial {last_serial:04d}")
+
+
+if __name__ == "__main__":
+    main()
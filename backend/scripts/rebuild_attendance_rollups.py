@@ -0,0 +1,36 @@
+"""
+Recomputes the monthly attendance rollups from the raw attendance records.
+
+The rollups are updated as attendance is recorded, so this is only needed once
+after upgrading, or after attendance records were imported or edited without
+going through the API. Safe to run repeatedly.
+
+Run from the backend directory: python scripts/rebuild_attendance_rollups.py [employee_profile_id]
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.services.attendance_rollup_service import rebuild_attendance_rollups
+
+
+def main():
+    employee_profile_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        count = rebuild_attendance_rollups(db, employee_profile_id)
+    finally:
+        db.close()
+
+    print(f"Rebuilt {count} monthly attendance rollups.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Rebuilds the used and remaining days of every leave balance from the balance ledger.
+
+Approved leave requests that predate the ledger are recorded in it first, so the
+first run after upgrading keeps the existing usage. Run it after correcting ledger
+entries by hand, or to check that balances and ledger agree. Safe to run repeatedly.
+
+Run from the backend directory: python scripts/recompute_leave_balances.py
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.services.leave_service import backfill_leave_ledger, recompute_leave_balances
+
+
+def main():
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        backfilled = backfill_leave_ledger(db)
+        recomputed = recompute_leave_balances(db)
+    finally:
+        db.close()
+
+    print(f"Recorded {backfilled} approved leave requests in the ledger.")
+    print(f"Recomputed {recomputed} leave balances.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Seeds a database with a synthetic company, for benchmarks and query-plan tests.
+
+Writes the company, its users and employee profiles with salary structures, leave
+balances, --days of attendance and leave history up to yesterday, and the monthly
+attendance rollups, all with core bulk inserts in batches of employees. Every user
+gets the same password hash, computed once (bcrypt per user would take hours for a
+large company). Each employee draws from their own generator, seeded from --seed and
+their index, so the same arguments write the same rows whatever the batch size.
+
+The indexes of the attendance and leave tables are dropped for the load and rebuilt
+afterwards (also when the load fails), which is much faster than maintaining them
+row by row. The database must not contain any employees yet; existing users, such
+as the admin created on startup, are kept and the synthetic ones follow them.
+
+Run from the backend directory: python scripts/seed_synthetic_data.py --employees 100000 --days 365 --database-url sqlite:///./synthetic.db
+"""
+
+import argparse
+import os
+import random
+import sys
+import time as timer
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.security import get_password_hash
+from app.database import create_db_engine
+from app.migrations import create_missing_indexes, run_migrations
+from app.models import (
+    Attendance, AttendanceMonthlyRollup, AttendanceStatus, Company, EmployeeProfile, LeaveBalance,
+    LeaveRequest, LeaveStatus, LeaveType, SalaryStructure, User, UserRole,
+)
+from app.services.dashboard_service import reconcile_dashboard_counters
+from app.services.employee_onboarding_service import DEFAULT_LEAVE_ALLOWANCES
+from app.services.leave_service import backfill_leave_ledger
+
+DEFAULT_PASSWORD = "Synthetic@123"
+DEFAULT_BATCH_SIZE = 1000
+EMAIL_DOMAIN = "synthetic.example.com"
+
+# Tables whose indexes are rebuilt after the load instead of maintained during it
+DEFERRED_INDEX_TABLES = [Attendance, AttendanceMonthlyRollup, LeaveRequest, LeaveBalance]
+
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Dara", "Eli", "Farah", "Gita", "Hugo", "Ines", "Jon"]
+DEPARTMENTS = ["Engineering", "Sales", "Support", "Finance", "Operations", "Marketing", "People"]
+DESIGNATIONS = ["Associate", "Senior Associate", "Lead", "Manager"]
+
+# Check-ins between 08:30 and 10:00, full days of 8 to 9.5 hours
+CHECK_IN_OFFSETS = [timedelta(minutes=minute) for minute in range(510, 601)]
+SHIFT_MINUTES = list(range(480, 571))
+HALF_DAY_MINUTES = 240
+
+def employee_email(index: int) -> str:
+    return f"employee{index}@{EMAIL_DOMAIN}"
+
+def employee_role(index: int) -> UserRole:
+    """The first employee is the admin and one in a hundred is an HR officer."""
+    if index == 0:
+        return UserRole.ADMIN
+    return UserRole.HR_OFFICER if index % 100 == 1 else UserRole.EMPLOYEE
+
+def working_days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=d) for d in range((end - start).days + 1) if (start + timedelta(days=d)).weekday() < 5]
+
+def employee_rows(
+    index: int,
+    user_id: int,
+    profile_id: int,
+    approver_id: int,
+    company_id: int,
+    password_hash: str,
+    rng: random.Random,
+    days: List[date],
+    today: date,
+) -> Dict[type, list]:
+    """The rows of one synthetic employee, by model."""
+    rows = defaultdict(list)
+    rows[User].append({
+        "id": user_id, "email": employee_email(index), "hashed_password": password_hash,
+        "role": employee_role(index), "is_active": True,
+    })
+    rows[EmployeeProfile].append({
+        "id": profile_id, "user_id": user_id, "company_id": company_id, "employee_id": f"SYN{index:07d}",
+        "first_name": rng.choice(FIRST_NAMES), "last_name": f"Synthetic{index}",
+        "department": rng.choice(DEPARTMENTS), "designation": rng.choice(DESIGNATIONS),
+        "joining_date": days[0] - timedelta(days=rng.randint(0, 1500)),
+    })
+    basic = Decimal(rng.randrange(25000, 150000, 500))
+    rows[SalaryStructure].append({
+        "employee_profile_id": profile_id, "basic_salary": basic, "hra": (basic * Decimal("0.4")).quantize(Decimal("1")),
+        "standard_allowance": Decimal("4167.00"), "performance_bonus": (basic * Decimal("0.08")).quantize(Decimal("1")),
+        "lta": Decimal("2500.00"), "fixed_allowance": Decimal(rng.randrange(0, 5000, 250)),
+        "professional_tax": Decimal("200.00"), "pf_contribution": (basic * Decimal("0.12")).quantize(Decimal("1")),
+    })
+
+    # A few blocks of leave a year; the days of rejected requests are worked
+    on_leave = set()
+    used = defaultdict(Decimal)
+    for _ in range(max(1, len(days) // 260)):
+        for leave_type, blocks, longest in ((LeaveType.PAID, 4, 4), (LeaveType.SICK, 2, 2), (LeaveType.UNPAID, rng.randint(0, 1), 3)):
+            for _ in range(blocks):
+                start = rng.randrange(max(1, len(days) - longest))
+                block = days[start:start + rng.randint(1, longest)]
+                if not block or any(day in on_leave for day in block):
+                    continue
+                approved = rng.random() < 0.9
+                if approved:
+                    on_leave.update(block)
+                    if leave_type != LeaveType.UNPAID:
+                        used[(leave_type, block[0].year)] += len(block)
+                created_at = datetime.combine(block[0] - timedelta(days=rng.randint(3, 30)), time(11))
+                rows[LeaveRequest].append({
+                    "employee_profile_id": profile_id, "leave_type": leave_type, "start_date": block[0], "end_date": block[-1],
+                    "total_days": Decimal(len(block)), "reason": "Synthetic leave",
+                    "status": LeaveStatus.APPROVED if approved else LeaveStatus.REJECTED,
+                    "approver_id": approver_id, "approved_at": created_at + timedelta(days=1), "created_at": created_at,
+                })
+    if rng.random() < 0.1:
+        start = today + timedelta(days=rng.randint(7, 60))
+        rows[LeaveRequest].append({
+            "employee_profile_id": profile_id, "leave_type": LeaveType.PAID, "start_date": start,
+            "end_date": start + timedelta(days=1), "total_days": Decimal(2), "reason": "Synthetic leave",
+            "status": LeaveStatus.PENDING, "approver_id": None, "approved_at": None,
+            "created_at": datetime.combine(today, time()),
+        })
+
+    # Next year's allowances are set up ahead, as HR would before the year starts
+    first_year = days[0].year if days else today.year
+    for year in range(first_year, today.year + 2):
+        for leave_type, total in DEFAULT_LEAVE_ALLOWANCES:
+            rows[LeaveBalance].append({
+                "employee_profile_id": profile_id, "leave_type": leave_type, "year": year, "total_days": Decimal(total),
+                "used_days": used[(leave_type, year)], "remaining_days": Decimal(total) - used[(leave_type, year)],
+            })
+
+    # Attendance on the other working days, with the monthly rollups counted alongside
+    months = defaultdict(lambda: [0, 0, 0, 0])  # present, absent, half days, worked minutes
+    for day in days:
+        if day in on_leave:
+            continue
+        month = months[(day.year, day.month)]
+        roll = rng.random()
+        if roll < 0.02:
+            month[1] += 1
+            rows[Attendance].append({
+                "employee_profile_id": profile_id, "date": day, "check_in_time": None, "check_out_time": None,
+                "status": AttendanceStatus.ABSENT,
+            })
+            continue
+        half_day = roll < 0.04
+        minutes = HALF_DAY_MINUTES if half_day else rng.choice(SHIFT_MINUTES)
+        check_in = datetime.combine(day, time()) + rng.choice(CHECK_IN_OFFSETS)
+        month[2 if half_day else 0] += 1
+        month[3] += minutes
+        rows[Attendance].append({
+            "employee_profile_id": profile_id, "date": day, "check_in_time": check_in,
+            "check_out_time": check_in + timedelta(minutes=minutes),
+            "status": AttendanceStatus.HALF_DAY if half_day else AttendanceStatus.PRESENT,
+        })
+    for (year, month_number), (present, absent, half_days, minutes) in months.items():
+        rows[AttendanceMonthlyRollup].append({
+            "employee_profile_id": profile_id, "year": year, "month": month_number, "present_days": present,
+            "absent_days": absent, "half_days": half_days, "leave_days": 0, "worked_minutes": minutes,
+        })
+    return rows
+
+def _reset_id_sequences(engine: Engine, models: list) -> None:
+    """Moves the id sequences past the explicit ids written (PostgreSQL only; SQLite needs nothing)."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for model in models:
+            table = model.__tablename__
+            conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            )
+
+def seed_synthetic_company(
+    engine: Engine,
+    employees: int,
+    days: int = 365,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    defer_indexes: bool = True,
+    today: Optional[date] = None,
+) -> Dict[UserRole, List[str]]:
+    """
+    Seeds the synthetic company into a database without employees and returns the
+    emails of its users by role. Employee i has the email
+    employee{i}@synthetic.example.com; employee 0 is the admin.
+    """
+    run_migrations(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(EmployeeProfile)).scalar():
+            raise ValueError("The database already contains employees")
+        if conn.execute(select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}")).limit(1)).first():
+            raise ValueError("The database already contains synthetic users")
+        # Users and profiles get explicit ids, so that profiles can refer to their
+        # users without reading them back; they follow any existing rows (such as
+        # the admin created on startup)
+        user_offset = conn.execute(select(func.max(User.id))).scalar() or 0
+        profile_offset = conn.execute(select(func.max(EmployeeProfile.id))).scalar() or 0
+
+    today = today or date.today()
+    history = working_days(today - timedelta(days=days), today - timedelta(days=1))
+    password_hash = get_password_hash(password)
+
+    dropped = []
+    if defer_indexes:
+        inspector = inspect(engine)
+        for model in DEFERRED_INDEX_TABLES:
+            existing = {index["name"] for index in inspector.get_indexes(model.__tablename__)}
+            dropped.extend(index for index in model.__table__.indexes if index.name in existing)
+    try:
+        for index in dropped:
+            index.drop(bind=engine)
+
+        with engine.begin() as conn:
+            company_id = conn.execute(insert(Company).values(name="Synthetic Co")).inserted_primary_key[0]
+
+        emails = defaultdict(list)
+        models = [User, EmployeeProfile, SalaryStructure, LeaveRequest, LeaveBalance, Attendance, AttendanceMonthlyRollup]
+        for first in range(0, employees, batch_size):
+            batch = defaultdict(list)
+            for index in range(first, min(first + batch_size, employees)):
+                emails[employee_role(index)].append(employee_email(index))
+                rows = employee_rows(
+                    index, user_offset + index + 1, profile_offset + index + 1, user_offset + 1, company_id,
+                    password_hash, random.Random(seed * 1_000_003 + index), history, today,
+                )
+                for model in models:
+                    batch[model].extend(rows[model])
+            with engine.begin() as conn:
+                for model in models:
+                    if batch[model]:
+                        conn.execute(insert(model.__table__), batch[model])
+        _reset_id_sequences(engine, [User, EmployeeProfile])
+    finally:
+        # Rebuilt even when the load failed, so the database is never left without them
+        if dropped:
+            create_missing_indexes(engine)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        backfill_leave_ledger(db)
+        reconcile_dashboard_counters(db)
+    finally:
+        db.close()
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365, help="Days of history up to yesterday")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="The password of every user")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Employees per insert transaction")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from the settings")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    started = timer.perf_counter()
+    try:
+        seed_synthetic_company(engine, args.employees, args.days, args.seed, args.password, args.batch_size)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    finally:
+        engine.dispose()
+
+    print(f"Seeded {args.employees} employees with {args.days} days of history in {timer.perf_counter() - started:.1f} s.")
+    print(f"Users log in as employee<N>@{EMAIL_DOMAIN} with the password {args.password!r}; employee0 is the admin.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Latency comparison of the sync and async database stacks on the hot routes.
+
+Seeds a fresh SQLite file per stack, then has every employee check in, load
+/dashboard/me and /employees/me, and check out, through the ASGI app in process
+with --concurrency requests in flight at a time. Reports throughput and the
+p50/p99 latency per stack.
+
+Stacks:
+- sync:  the regular routers, sync handlers on the threadpool with a Session
+- async: the routers from app.api.async_routes on an AsyncSession (needs greenlet
+         and aiosqlite, or asyncpg with --database-url)
+
+--database-url must be a scratch database: its tables are dropped and recreated, and
+one that already has tables is refused unless --reset is passed.
+
+Run: python tests/benchmarks/bench_async_stack.py --employees 300 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app as sync_app
+from app.api import async_routes
+from app.auth.security import create_access_token
+from app.auth.token_cache import token_cache
+from app.database import create_db_engine, get_db
+from app import database_async
+from tests.benchmarks.bench_checkin_concurrency import seed
+
+ROUTES = [
+    ("POST", "/api/v1/attendance/check-in"),
+    ("GET", "/api/v1/dashboard/me"),
+    ("GET", "/api/v1/employees/me"),
+    ("POST", "/api/v1/attendance/check-out"),
+]
+
+
+def make_async_app():
+    app = FastAPI()
+    app.include_router(async_routes.router, prefix="/api/v1")
+    return app
+
+
+async def run_scenario(app, emails, concurrency):
+    tokens = [create_access_token({"sub": email}) for email in emails]
+    latencies = []
+    failures = 0
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def employee_day(token):
+            nonlocal failures
+            headers = {"Authorization": f"Bearer {token}"}
+            for method, path in ROUTES:
+                async with in_flight:
+                    start = time.perf_counter()
+                    resp = await client.request(method, path, headers=headers)
+                    latencies.append(time.perf_counter() - start)
+                if resp.status_code >= 400:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(employee_day(token) for token in tokens))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def bench_sync(database_url, employees, concurrency, reset):
+    engine = create_db_engine(database_url)
+    try:
+        emails = seed(engine, employees, reset=reset)
+    except ValueError:
+        engine.dispose()
+        raise
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    sync_app.dependency_overrides[get_db] = override_get_db
+    try:
+        return asyncio.run(run_scenario(sync_app, emails, concurrency))
+    finally:
+        sync_app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+def bench_async(database_url, employees, concurrency, reset):
+    engine = create_db_engine(database_url)
+    try:
+        emails = seed(engine, employees, reset=reset)
+    finally:
+        engine.dispose()
+
+    async def run():
+        database_async.init_async_db(database_url)
+        try:
+            return await run_scenario(make_async_app(), emails, concurrency)
+        finally:
+            await database_async.dispose_async_db()
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--database-url", help="Scratch server database to use instead of a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true", help="Drop the existing tables of --database-url")
+    args = parser.parse_args()
+    # After the first stack the server database only holds this benchmark's tables
+    reset = args.reset
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'stack':<8}{'requests':>10}{'failed':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, bench in (("sync", bench_sync), ("async", bench_async)):
+            token_cache.clear()
+            database_url = args.database_url or f"sqlite:///{tmp}/{name}.db"
+            try:
+                result = bench(database_url, args.employees, args.concurrency, reset)
+            except ValueError as e:
+                sys.exit(str(e))
+            except (ImportError, RuntimeError) as e:
+                print(f"{name:<8}skipped: {e}")
+                continue
+            reset = True
+            print(f"{name:<8}{result['requests']:>10}{result['failures']:>8}{result['throughput']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Check-in throughput benchmark for the database engine configurations.
+
+Seeds a fresh SQLite file per configuration, then fires one
+POST /api/v1/attendance/check-in per employee through the ASGI app in process,
+with --concurrency requests in flight at a time, and reports throughput,
+latency percentiles and failed requests.
+
+Configurations:
+- default: the previous engine (rollback journal, synchronous=FULL, no pragmas)
+- tuned:   create_db_engine() with the SQLite pragmas from Settings (WAL, NORMAL, ...)
+- server:  create_db_engine() against --database-url (e.g. a PostgreSQL URL), if given.
+           The benchmark drops and recreates every table there, so it refuses a
+           database that already has tables unless --reset is passed; point it at a
+           scratch database.
+
+Run: python tests/benchmarks/bench_checkin_concurrency.py --employees 500 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import httpx
+from sqlalchemy import create_engine, insert, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.auth.security import create_access_token
+from app.database import Base, create_db_engine, get_db
+from app.models import Company, EmployeeProfile, User, UserRole
+
+
+def seed(engine, employees, reset=False):
+    """
+    Creates the tables and the employees. A database that already has tables is
+    only wiped when `reset` is given; otherwise ValueError is raised.
+    """
+    if inspect(engine).get_table_names():
+        if not reset:
+            raise ValueError(f"{engine.url.render_as_string(hide_password=True)} already has tables; pass --reset to drop them")
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        company_id = conn.execute(insert(Company.__table__).values(name="Bench Co")).inserted_primary_key[0]
+        conn.execute(insert(User.__table__), [
+            {"id": i + 1, "email": f"bench{i}@example.com", "hashed_password": "x", "role": UserRole.EMPLOYEE, "is_active": True}
+            for i in range(employees)
+        ])
+        conn.execute(insert(EmployeeProfile.__table__), [
+            {"user_id": i + 1, "company_id": company_id, "employee_id": f"BENCH{i:06d}", "first_name": "Bench", "last_name": str(i)}
+            for i in range(employees)
+        ])
+    return [f"bench{i}@example.com" for i in range(employees)]
+
+
+async def run_storm(engine, emails, concurrency):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    tokens = [create_access_token({"sub": email}) for email in emails]
+    latencies = []
+    failures = 0
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def check_in(token):
+            nonlocal failures
+            async with in_flight:
+                start = time.perf_counter()
+                resp = await client.post("/api/v1/attendance/check-in", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - start)
+            if resp.status_code != 201:
+                failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(check_in(token) for token in tokens))
+        elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.pop(get_db, None)
+    latencies.sort()
+    return {
+        "requests": len(tokens),
+        "failures": failures,
+        "seconds": elapsed,
+        "throughput": len(tokens) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--database-url", help="Optional scratch server database to benchmark as well")
+    parser.add_argument("--reset", action="store_true", help="Drop the existing tables of --database-url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configs = [
+            ("default", lambda: create_engine(f"sqlite:///{tmp}/default.db", connect_args={"check_same_thread": False})),
+            ("tuned", lambda: create_db_engine(f"sqlite:///{tmp}/tuned.db")),
+        ]
+        if args.database_url:
+            configs.append(("server", lambda: create_db_engine(args.database_url)))
+
+        print(f"{'config':<10}{'requests':>10}{'failed':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, make_engine in configs:
+            engine = make_engine()
+            try:
+                emails = seed(engine, args.employees, reset=args.reset)
+            except ValueError as e:
+                engine.dispose()
+                sys.exit(str(e))
+            result = asyncio.run(run_storm(engine, emails, args.concurrency))
+            engine.dispose()
+            print(f"{name:<10}{result['requests']:>10}{result['failures']:>8}{result['throughput']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Reproducible end-to-end benchmark of realistic workloads.
+
+Seeds a fresh SQLite file with a synthetic company of --employees employees, each
+with a salary structure, leave balances, --years of attendance and leave history up
+to yesterday, using scripts/seed_synthetic_data.py. Every random choice comes from
+--seed, so the same arguments seed the same data on every commit. Then runs each scenario against the ASGI app in process
+and reports throughput, latency percentiles and database queries per request (from
+the Server-Timing header), per scenario and per endpoint, as the median of --repeat
+runs that each start from a copy of the seeded database:
+
+- checkin-storm: every employee checks in, --concurrency requests in flight at a time
+- hr-dashboard:  HR officers poll the admin dashboard, employee list, leave list and
+                 daily attendance with If-None-Match, while employees apply for leave
+- payroll:       the month-end payroll run for last month, then the payroll export
+                 paged through /salary/all
+
+--output writes the results with the commit and the arguments as JSON. --baseline
+compares against such a file from another commit, run with the same arguments on the
+same machine, and exits with status 1 when a scenario's p95 latency rises, or its
+throughput falls, by more than --tolerance, or when an endpoint runs more queries.
+
+Run: python tests/benchmarks/bench_harness.py --employees 2000 --years 1 --output bench.json
+Compare: python tests/benchmarks/bench_harness.py --employees 2000 --years 1 --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.auth.security import create_access_token
+from app.auth.token_cache import token_cache
+from app.config import settings
+from app.database import create_db_engine, get_db
+from app.models import UserRole
+from app.services.calendar_service import clear_calendar_cache
+from scripts.seed_synthetic_data import seed_synthetic_company, working_days
+
+SCENARIOS = ["checkin-storm", "hr-dashboard", "payroll"]
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# Query counts are reported in the results; the per-request warnings would drown them
+logging.getLogger("app.metrics").setLevel(logging.ERROR)
+settings.SERVER_TIMING_ENABLED = True
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+class Recorder:
+    """Collects the latency, outcome and query count of every request of a scenario."""
+
+    def __init__(self, client):
+        self.client = client
+        self.samples = defaultdict(list)
+
+    async def request(self, label, method, url, token, ok=(200,), **kwargs):
+        headers = {"Authorization": f"Bearer {token}", **kwargs.pop("headers", {})}
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        seconds = time.perf_counter() - start
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        self.samples[label].append((seconds, response.status_code in ok, int(match.group(1)) if match else 0))
+        return response
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(seconds for seconds, _, _ in samples)
+    return {
+        "requests": len(samples),
+        "failures": sum(1 for _, ok, _ in samples if not ok),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1] * 1000,
+        "queries": sum(queries for _, _, queries in samples) / len(samples),
+    }
+
+
+async def gather_limited(concurrency, jobs):
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with in_flight:
+            await job()
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+
+async def checkin_storm(recorder, emails, args, rng):
+    staff = [email for role_emails in emails.values() for email in role_emails]
+    rng.shuffle(staff)
+
+    def check_in(email):
+        return lambda: recorder.request(
+            "POST /attendance/check-in", "POST", "/api/v1/attendance/check-in",
+            create_access_token({"sub": email}), ok=(201,),
+        )
+
+    await gather_limited(args.concurrency, [check_in(email) for email in staff])
+
+
+async def hr_dashboard(recorder, emails, args, rng):
+    officers = emails[UserRole.HR_OFFICER] or emails[UserRole.ADMIN]
+    applicants = list(emails[UserRole.EMPLOYEE])
+    rng.shuffle(applicants)
+    polled = [
+        ("GET /dashboard/admin", "/api/v1/dashboard/admin", {}),
+        ("GET /employees/", "/api/v1/employees/", {"limit": 50}),
+        ("GET /leave/all", "/api/v1/leave/all", {"limit": 50, "status": "pending"}),
+        ("GET /attendance/daily", "/api/v1/attendance/daily", {}),
+    ]
+    etags = {}
+    leave_days = working_days(date.today() + timedelta(days=90), date.today() + timedelta(days=150))
+
+    def poll(officer):
+        async def run():
+            token = create_access_token({"sub": officer})
+            for label, url, params in polled:
+                headers = {"If-None-Match": etags[(officer, url)]} if (officer, url) in etags else {}
+                response = await recorder.request(label, "GET", url, token, ok=(200, 304), params=params, headers=headers)
+                if "etag" in response.headers:
+                    etags[(officer, url)] = response.headers["etag"]
+        return run
+
+    def apply(applicant, offset):
+        async def run():
+            token = create_access_token({"sub": applicant})
+            me = await recorder.request("GET /employees/me", "GET", "/api/v1/employees/me", token)
+            start = leave_days[offset % len(leave_days)]
+            await recorder.request("POST /leave/apply", "POST", "/api/v1/leave/apply", token, ok=(201,), json={
+                "employee_profile_id": me.json()["id"], "leave_type": "paid",
+                "start_date": start.isoformat(), "end_date": start.isoformat(), "reason": "Benchmark",
+            })
+        return run
+
+    jobs = []
+    for round_number in range(args.dashboard_rounds):
+        jobs.extend(poll(officer) for officer in officers)
+        # Roughly one leave application for every ten polls
+        for _ in range(max(1, len(officers) * len(polled) // 10)):
+            if applicants:
+                jobs.append(apply(applicants.pop(), round_number))
+    await gather_limited(args.concurrency, jobs)
+
+
+async def payroll(recorder, emails, args, rng):
+    token = create_access_token({"sub": emails[UserRole.ADMIN][0]})
+    period_end = date.today().replace(day=1) - timedelta(days=1)
+    for _ in range(args.payroll_runs):
+        await recorder.request("POST /salary/payroll-runs", "POST", "/api/v1/salary/payroll-runs", token, ok=(201,), json={
+            "period_start": period_end.replace(day=1).isoformat(), "period_end": period_end.isoformat(),
+        })
+    for skip in range(0, args.employees, 1000):
+        await recorder.request("GET /salary/all", "GET", "/api/v1/salary/all", token, params={"skip": skip, "limit": 1000})
+
+
+RUNNERS = {"checkin-storm": checkin_storm, "hr-dashboard": hr_dashboard, "payroll": payroll}
+
+
+async def run_scenario(name, emails, args):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        recorder = Recorder(client)
+        started = time.perf_counter()
+        await RUNNERS[name](recorder, emails, args, random.Random(f"{args.seed}:{name}"))
+        elapsed = time.perf_counter() - started
+    result = summarize([sample for samples in recorder.samples.values() for sample in samples], elapsed)
+    result["endpoints"] = {label: summarize(samples, elapsed) for label, samples in sorted(recorder.samples.items())}
+    return result
+
+
+def median_results(runs):
+    """Every figure of the results as its median over the repeated runs."""
+    merged = {}
+    for name, result in runs[0].items():
+        merged[name] = {key: statistics.median(run[name][key] for run in runs) for key in result if key != "endpoints"}
+        merged[name]["endpoints"] = {
+            label: {key: statistics.median(run[name]["endpoints"][label][key] for run in runs) for key in row}
+            for label, row in result["endpoints"].items()
+        }
+    return merged
+
+
+def print_results(results):
+    print(f"{'scenario / endpoint':<34}{'requests':>9}{'failed':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+    for name, result in results.items():
+        for label, row in [(name, result)] + [(f"  {label}", row) for label, row in result["endpoints"].items()]:
+            print(
+                f"{label:<34}{row['requests']:>9}{row['failures']:>7}{row['throughput']:>9.1f}"
+                f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['queries']:>9.1f}"
+            )
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the change against the baseline per scenario and endpoint and returns the
+    regressions: scenarios whose throughput or p95 latency got worse by more than
+    `tolerance`, and endpoints that run more queries per request. Single endpoints
+    have too few requests for their timings to be compared reliably, but their query
+    counts are deterministic.
+    """
+    regressions = []
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'}:")
+    print(f"{'scenario / endpoint':<34}{'req/s':>10}{'p95':>10}{'queries':>10}")
+    for name, result in results.items():
+        if name not in baseline["results"]:
+            continue
+        before_result = baseline["results"][name]
+        rows = [(name, result, before_result, True)] + [
+            (f"  {label}", row, before_result["endpoints"][label], False)
+            for label, row in result["endpoints"].items() if label in before_result["endpoints"]
+        ]
+        for label, row, before, timed in rows:
+            throughput = row["throughput"] / before["throughput"] - 1 if before["throughput"] else 0.0
+            p95 = row["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+            queries = row["queries"] - before["queries"]
+            flag = ""
+            if (timed and (throughput < -tolerance or p95 > tolerance)) or queries >= 1:
+                flag = "  REGRESSION"
+                regressions.append(label.strip())
+            print(f"{label:<34}{throughput:>+10.0%}{p95:>+10.0%}{queries:>+10.1f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--dashboard-rounds", type=int, default=20)
+    parser.add_argument("--payroll-runs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of every scenario; the median is reported")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "template.db")
+        engine = create_db_engine(f"sqlite:///{template}")
+        started = time.perf_counter()
+        emails = seed_synthetic_company(engine, args.employees, days=365 * args.years, seed=args.seed)
+        engine.dispose()
+        print(f"Seeded {args.employees} employees with {args.years} year(s) of history in {time.perf_counter() - started:.1f} s\n")
+
+        runs = []
+        for _ in range(args.repeat):
+            # Every repeat starts from a copy of the same seeded database
+            database = os.path.join(tmp, "run.db")
+            shutil.copyfile(template, database)
+            engine = create_db_engine(f"sqlite:///{database}")
+            SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+            def override_get_db():
+                db = SessionLocal()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[get_db] = override_get_db
+            token_cache.clear()
+            clear_calendar_cache()
+            try:
+                runs.append({name: asyncio.run(run_scenario(name, emails, args)) for name in args.scenarios})
+            finally:
+                app.dependency_overrides.pop(get_db, None)
+                engine.dispose()
+                os.remove(database)
+
+    results = median_results(runs)
+    print_results(results)
+    parameters = {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "tolerance")}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "commit": git_commit(), "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(), "parameters": parameters, "results": results,
+            }, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("parameters") != parameters:
+            print("\nWarning: the baseline was run with different parameters:", baseline.get("parameters"))
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Payroll computation benchmark: per-row ORM path vs the batch payroll engine.
+
+Seeds a fresh SQLite file with --employees salary structures, a sprinkling of
+approved unpaid leave and absences in the pay period, then computes a month of
+payroll two ways and reports the time and the number of SQL statements:
+
+- per-row: loads SalaryStructure entities, calls calculate_net_salary() on each and
+  looks up each employee's unpaid leave and absences with their own queries
+  (what prorating on the existing /salary/all path would take)
+- batch:   run_payroll(), which reads numeric columns in chunks, computes the
+  amounts column-wise and stores the payroll run snapshot
+
+Run: python tests/benchmarks/bench_payroll.py --employees 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_db_engine
+from app.models import (
+    Attendance, AttendanceStatus, Company, EmployeeProfile, LeaveRequest, LeaveStatus,
+    LeaveType, SalaryStructure, User, UserRole,
+)
+from app.services.payroll_service import run_payroll
+from app.services.salary_service import calculate_net_salary
+
+PERIOD_START, PERIOD_END = date(2025, 6, 1), date(2025, 6, 30)
+
+
+def seed(engine, employees):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        company_id = conn.execute(insert(Company.__table__).values(name="Bench Co")).inserted_primary_key[0]
+        conn.execute(insert(User.__table__), [
+            {"id": i + 1, "email": f"bench{i}@example.com", "hashed_password": "x", "role": UserRole.EMPLOYEE, "is_active": True}
+            for i in range(employees)
+        ])
+        conn.execute(insert(EmployeeProfile.__table__), [
+            {"id": i + 1, "user_id": i + 1, "company_id": company_id, "employee_id": f"BENCH{i:06d}", "first_name": "Bench", "last_name": str(i)}
+            for i in range(employees)
+        ])
+        conn.execute(insert(SalaryStructure.__table__), [
+            {
+                "employee_profile_id": i + 1,
+                "basic_salary": Decimal("30000.00") + i % 1000,
+                "hra": Decimal("12000.00"),
+                "standard_allowance": Decimal("4167.00"),
+                "performance_bonus": Decimal("2500.00"),
+                "lta": Decimal("2500.00"),
+                "fixed_allowance": Decimal("2915.50"),
+                "professional_tax": Decimal("200.00"),
+                "pf_contribution": Decimal("3600.00"),
+            }
+            for i in range(employees)
+        ])
+        conn.execute(insert(LeaveRequest.__table__), [
+            {
+                "employee_profile_id": i + 1,
+                "leave_type": LeaveType.UNPAID.value,
+                "start_date": PERIOD_START + timedelta(days=i % 25),
+                "end_date": PERIOD_START + timedelta(days=i % 25 + 2),
+                "total_days": Decimal(3),
+                "status": LeaveStatus.APPROVED,
+            }
+            for i in range(0, employees, 10)
+        ])
+        conn.execute(insert(Attendance.__table__), [
+            {"employee_profile_id": i + 1, "date": PERIOD_START + timedelta(days=i % 28), "status": AttendanceStatus.ABSENT}
+            for i in range(0, employees, 7)
+        ])
+
+
+def per_row_payroll(db):
+    results = []
+    for salary_structure in db.query(SalaryStructure).all():
+        calculated = calculate_net_salary(salary_structure)
+        unpaid_leave = db.query(LeaveRequest).filter(
+            LeaveRequest.employee_profile_id == salary_structure.employee_profile_id,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.leave_type == LeaveType.UNPAID,
+            LeaveRequest.start_date <= PERIOD_END,
+            LeaveRequest.end_date >= PERIOD_START,
+        ).all()
+        absences = db.query(func.count(Attendance.id)).filter(
+            Attendance.employee_profile_id == salary_structure.employee_profile_id,
+            Attendance.date >= PERIOD_START,
+            Attendance.date <= PERIOD_END,
+            Attendance.status == AttendanceStatus.ABSENT,
+        ).scalar()
+        results.append((calculated, len(unpaid_leave), absences))
+    return results
+
+
+def measure(engine, fn):
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", record)
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        fn(db)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", record)
+    return elapsed, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/payroll.db")
+        seed(engine, args.employees)
+
+        print(f"{'path':<10}{'employees':>10}{'seconds':>10}{'rows/s':>12}{'queries':>10}")
+        for name, fn in [
+            ("per-row", per_row_payroll),
+            ("batch", lambda db: run_payroll(db, PERIOD_START, PERIOD_END)),
+        ]:
+            elapsed, queries = measure(engine, fn)
+            print(f"{name:<10}{args.employees:>10}{elapsed:>10.2f}{args.employees / elapsed:>12.0f}{queries:>10}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
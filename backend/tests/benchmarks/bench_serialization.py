@@ -0,0 +1,152 @@
+"""
+Serialization throughput of the large list endpoints, per endpoint.
+
+Seeds a fresh SQLite file with --employees employees, each with a salary structure
+and --days attendance records, then requests a page of --limit rows from every
+endpoint --requests times through the ASGI app in process and reports requests per
+second for two implementations:
+
+- model: the previous handlers, returning ORM objects or dicts that FastAPI
+         validates into the response_model and encodes
+- fast:  the current handlers, selecting row tuples and returning FastJSONResponse
+
+Run: python tests/benchmarks/bench_serialization.py --employees 1000 --limit 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, Query, Response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.main import app as fast_app
+from app.auth.dependencies import get_current_active_user_with_roles
+from app.auth.security import create_access_token
+from app.database import create_db_engine, get_db
+from app.models import Attendance, AttendanceStatus, EmployeeProfile, SalaryStructure, User, UserRole
+from app.schemas import Attendance as AttendanceSchema, SalaryPayroll
+from app.api.pagination import paginate_keyset
+from app.services.payroll_service import get_payroll_projection
+from tests.benchmarks.bench_checkin_concurrency import seed as seed_employees
+
+ENDPOINTS = ["/api/v1/salary/all", "/api/v1/attendance/all"]
+
+# The handlers as they were before the fast response path
+model_router = APIRouter()
+admin = get_current_active_user_with_roles([UserRole.ADMIN, UserRole.HR_OFFICER])
+
+
+@model_router.get("/salary/all", response_model=List[SalaryPayroll])
+def salary_all(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: User = Depends(admin)):
+    return get_payroll_projection(db, skip=skip, limit=limit)
+
+
+@model_router.get("/attendance/all", response_model=List[AttendanceSchema])
+def attendance_all(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin),
+):
+    query = db.query(Attendance)
+    return paginate_keyset(query, [Attendance.date, Attendance.id], cursor, limit, response, descending=True, offset=skip)
+
+
+def seed(engine, employees, days):
+    emails = seed_employees(engine, employees)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(
+            email="admin@bench.example.com", hashed_password="x", role=UserRole.ADMIN, is_active=True,
+        ))
+        profile_ids = list(conn.execute(select(EmployeeProfile.id)).scalars())
+        conn.execute(insert(SalaryStructure.__table__), [
+            {
+                "employee_profile_id": profile_id, "basic_salary": Decimal("50000.00") + profile_id,
+                "hra": Decimal("20000.00"), "standard_allowance": Decimal("4167.00"),
+                "performance_bonus": Decimal("2500.00"), "lta": Decimal("2500.00"),
+                "fixed_allowance": Decimal("1000.00"), "professional_tax": Decimal("200.00"),
+                "pf_contribution": Decimal("6000.00"),
+            }
+            for profile_id in profile_ids
+        ])
+        first_day = date(2025, 1, 1)
+        conn.execute(insert(Attendance.__table__), [
+            {
+                "employee_profile_id": profile_id, "date": first_day + timedelta(days=d),
+                "status": AttendanceStatus.PRESENT,
+                "check_in_time": datetime.combine(first_day + timedelta(days=d), datetime.min.time()) + timedelta(hours=9),
+                "check_out_time": datetime.combine(first_day + timedelta(days=d), datetime.min.time()) + timedelta(hours=17),
+            }
+            for profile_id in profile_ids
+            for d in range(days)
+        ])
+    return emails
+
+
+async def measure(app, path, token, limit, requests):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.get(path, params={"limit": limit}, headers=headers)
+        assert response.status_code == 200, response.text
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path, params={"limit": limit}, headers=headers)
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, len(response.json())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    model_app = FastAPI()
+    model_app.include_router(model_router, prefix="/api/v1")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/serialization.db")
+        seed(engine, args.employees, args.days)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        for app in (model_app, fast_app):
+            app.dependency_overrides[get_db] = override_get_db
+        token = create_access_token({"sub": "admin@bench.example.com"})
+
+        print(f"{'endpoint':<26}{'rows':>6}{'model req/s':>14}{'fast req/s':>12}{'speedup':>9}")
+        for path in ENDPOINTS:
+            model_rate, rows = asyncio.run(measure(model_app, path, token, args.limit, args.requests))
+            fast_rate, _ = asyncio.run(measure(fast_app, path, token, args.limit, args.requests))
+            print(f"{path:<26}{rows:>6}{model_rate:>14.1f}{fast_rate:>12.1f}{fast_rate / model_rate:>8.1f}x")
+
+        fast_app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
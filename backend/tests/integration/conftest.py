@@ -0,0 +1,85 @@
+import importlib.util
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+import app.models  # noqa: F401 - register all models on Base.metadata
+from app.services.calendar_service import clear_calendar_cache
+from app.services.table_version_service import seed_table_versions, track_table_versions
+
+# Sessions bump the table versions on commit, as they do in the app
+track_table_versions()
+
+
+@pytest.fixture
+def engine():
+    # In-memory database shared across connections for the duration of one test
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    seed_table_versions(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fresh_calendar_cache():
+    # Every test starts from an empty database, so no compiled calendar carries over
+    clear_calendar_cache()
+    yield
+    clear_calendar_cache()
+
+
+@pytest.fixture
+def async_db_drivers():
+    # The async stack is part of the documented install, so its tests fail rather
+    # than skip without it; deselect them explicitly with -m "not async_db"
+    missing = [name for name in ("greenlet", "aiosqlite") if importlib.util.find_spec(name) is None]
+    if missing:
+        pytest.fail(
+            f"The async route tests need {' and '.join(missing)} (see the README install step); "
+            'deselect them with -m "not async_db"',
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryCounter:
+    """Counts the SQL statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(engine):
+    return lambda: QueryCounter(engine)
@@ -0,0 +1,51 @@
+import time
+
+from app.models import ActivityLog, User, UserRole
+from app.services.activity_service import ActivityLogWriter
+
+
+def add_user(db):
+    user = User(email="logger@example.com", hashed_password="x", role=UserRole.EMPLOYEE)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_drain_on_stop_writes_every_entry_in_batches(engine, db, count_queries):
+    user = add_user(db)
+    writer = ActivityLogWriter(max_queue_size=100, batch_size=10, flush_interval=60)
+
+    for i in range(25):
+        assert writer.enqueue(user.id, "Action", str(i))
+    with count_queries() as counter:
+        writer.start(engine)
+        writer.stop()
+
+    assert db.query(ActivityLog).count() == 25
+    assert sum(statement.startswith("INSERT") for statement in counter.statements) == 3
+    assert writer.stats()["flushed"] == 25
+    assert writer.stats()["queue_depth"] == 0
+
+
+def test_flushes_after_interval(engine, db):
+    user = add_user(db)
+    writer = ActivityLogWriter(max_queue_size=100, batch_size=100, flush_interval=0.05)
+    writer.start(engine)
+    try:
+        writer.enqueue(user.id, "User login")
+        deadline = time.monotonic() + 2
+        while writer.stats()["flushed"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert db.query(ActivityLog).count() == 1
+    finally:
+        writer.stop()
+
+
+def test_full_queue_drops_entries(db):
+    writer = ActivityLogWriter(max_queue_size=2, batch_size=10, flush_interval=1)
+
+    results = [writer.enqueue(1, "Action") for _ in range(3)]
+
+    assert results == [True, True, False]
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["queue_depth"] == 2
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from app import database_async
+from app.auth.security import create_access_token
+from app.database import create_db_engine
+from app.database_async import async_database_url
+
+
+def test_async_url_swaps_in_the_async_driver():
+    assert async_database_url("sqlite:///./dayflow.db") == "sqlite+aiosqlite:///./dayflow.db"
+    assert async_database_url("postgresql://hr:secret@db/dayflow") == "postgresql+asyncpg://hr:secret@db/dayflow"
+    assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+@pytest.mark.async_db
+def test_async_routes_check_in_and_load_the_dashboard(tmp_path, async_db_drivers):
+    import httpx
+    from app.api import async_routes
+    from tests.benchmarks.bench_checkin_concurrency import seed
+
+    database_url = f"sqlite:///{tmp_path}/async.db"
+    engine = create_db_engine(database_url)
+    email = seed(engine, 1)[0]
+    engine.dispose()
+
+    app = FastAPI()
+    app.include_router(async_routes.router, prefix="/api/v1")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+    async def run():
+        database_async.init_async_db(database_url)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                checked_in = await client.post("/api/v1/attendance/check-in", headers=headers)
+                again = await client.post("/api/v1/attendance/check-in", headers=headers)
+                summary = await client.get("/api/v1/dashboard/me", headers=headers)
+            return checked_in, again, summary
+        finally:
+            await database_async.dispose_async_db()
+
+    checked_in, again, summary = asyncio.run(run())
+
+    assert checked_in.status_code == 201
+    assert again.status_code == 400
+    assert summary.json()["today_attendance"]["id"] == checked_in.json()["id"]
+
+
+@pytest.mark.async_db
+def test_async_admin_dashboard_answers_a_matching_etag_with_304(tmp_path, async_db_drivers):
+    import httpx
+    from sqlalchemy import update
+    from app.api import async_routes
+    from app.migrations import run_migrations
+    from app.models import User, UserRole
+    from tests.benchmarks.bench_checkin_concurrency import seed
+
+    database_url = f"sqlite:///{tmp_path}/async.db"
+    engine = create_db_engine(database_url)
+    email = seed(engine, 1)[0]
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(update(User).values(role=UserRole.ADMIN))
+    engine.dispose()
+
+    app = FastAPI()
+    app.include_router(async_routes.router, prefix="/api/v1")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+    async def run():
+        database_async.init_async_db(database_url)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                first = await client.get("/api/v1/dashboard/admin", headers=headers)
+                again = await client.get("/api/v1/dashboard/admin", headers={**headers, "If-None-Match": first.headers["etag"]})
+            return first, again
+        finally:
+            await database_async.dispose_async_db()
+
+    first, again = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert again.status_code == 304
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.attendance import get_all_attendance_records, get_daily_attendance, get_weekly_attendance
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.models import Attendance, AttendanceStatus
+from app.services.attendance_export_service import ExportFormat, iter_attendance_export
+from tests.integration.test_employee_status import seed_employees
+
+START = date(2025, 3, 3)  # a Monday
+
+
+def seed_attendance(db, employees=5, days=7):
+    profiles = seed_employees(db, employees)
+    db.query(Attendance).delete()
+    for offset in range(days):
+        for profile in profiles:
+            db.add(Attendance(
+                employee_profile_id=profile.id,
+                date=START + timedelta(days=offset),
+                status=AttendanceStatus.PRESENT,
+            ))
+    db.commit()
+    return profiles
+
+
+def fetch_all_pages(fetch, limit):
+    rows, cursor = [], None
+    while True:
+        response = Response()
+        page = fetch(response, cursor, limit)
+        rows.extend(page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return rows
+
+
+def test_all_records_cursor_walks_every_row_once_newest_first(db):
+    seed_attendance(db)
+
+    rows = fetch_all_pages(
+        lambda response, cursor, limit: json.loads(get_all_attendance_records(
+            response, skip=0, limit=limit, cursor=cursor, employee_profile_id=None, db=db, current_user=None
+        ).body),
+        limit=4,
+    )
+
+    keys = [(date.fromisoformat(row["date"]), row["id"]) for row in rows]
+    assert len(keys) == 35
+    assert len(set(keys)) == 35
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_weekly_pages_cover_the_week(db):
+    seed_attendance(db)
+
+    rows = fetch_all_pages(
+        lambda response, cursor, limit: get_weekly_attendance(
+            response, day_in_week=START, cursor=cursor, limit=limit, db=db, current_user=None
+        ),
+        limit=10,
+    )
+
+    assert len({row.id for row in rows}) == 35
+
+
+def test_daily_loads_profiles_in_the_same_query(db, count_queries):
+    seed_attendance(db, employees=60, days=1)
+    db.expire_all()
+
+    with count_queries() as counter:
+        rows = get_daily_attendance(Response(), day=START, cursor=None, limit=100, db=db, current_user=None)
+        codes = {row.employee_profile.employee_id for row in rows}
+
+    assert len(codes) == 60
+    assert counter.count == 1
+
+
+def test_invalid_cursor_is_rejected(db):
+    with pytest.raises(HTTPException) as exc:
+        get_all_attendance_records(
+            Response(), skip=0, limit=10, cursor="not-a-cursor", employee_profile_id=None, db=db, current_user=None
+        )
+    assert exc.value.status_code == 400
+
+
+def test_csv_export_streams_in_batches(engine, db):
+    seed_attendance(db)
+
+    chunks = list(iter_attendance_export(engine, START, START + timedelta(days=1), ExportFormat.CSV, batch_size=4))
+
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 10
+    assert len(chunks) == 3  # two days of five employees, four rows per chunk
+    assert rows[0]["date"] == START.isoformat()
+    assert rows[0]["status"] == "present"
+
+
+def test_ndjson_export(engine, db):
+    profiles = seed_attendance(db)
+
+    body = "".join(iter_attendance_export(engine, START, START, ExportFormat.NDJSON, profiles[0].id))
+
+    records = [json.loads(line) for line in body.splitlines()]
+    assert len(records) == 1
+    assert records[0]["employee_id"] == profiles[0].employee_id
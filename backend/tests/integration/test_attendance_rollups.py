@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta
+
+from app.api.attendance import check_in, check_out, manual_attendance_entry
+from app.api.attendance_correction import approve_correction_request
+from app.migrations import run_migrations
+from app.models import (
+    Attendance, AttendanceCorrectionRequest, AttendanceMonthlyRollup, AttendanceStatus, User,
+)
+from app.schemas import AttendanceManualCreate
+from app.services.attendance_rollup_service import get_month_summary, rebuild_attendance_rollups
+from app.services.payroll_service import run_payroll
+from tests.integration.test_employee_status import seed_employees
+from tests.integration.test_payroll import JUNE_END, JUNE_START, seed_salaries
+
+
+def rollups(db):
+    db.expire_all()
+    return {
+        (r.employee_profile_id, r.year, r.month): (r.present_days, r.absent_days, r.half_days, r.leave_days, r.worked_minutes)
+        for r in db.query(AttendanceMonthlyRollup)
+    }
+
+
+def manual(db, profile, day, status, hours=None):
+    check_in_time = datetime.combine(day, datetime.min.time()) + timedelta(hours=9) if hours else None
+    entry = AttendanceManualCreate(
+        employee_profile_id=profile.id,
+        date=day,
+        status=status,
+        check_in_time=check_in_time,
+        check_out_time=check_in_time + timedelta(hours=hours) if hours else None,
+    )
+    return manual_attendance_entry(entry, db=db, current_user=None)
+
+
+def test_attendance_writes_keep_rollups_in_step_with_raw_rows(db):
+    profiles = seed_employees(db, 3)
+    db.query(Attendance).delete()
+    db.commit()
+    reviewer = db.query(User).first()
+
+    check_in(employee_profile=profiles[0], db=db)
+    check_out(employee_profile=profiles[0], db=db)
+    manual(db, profiles[1], date(2025, 6, 2), AttendanceStatus.PRESENT, hours=8)
+    manual(db, profiles[1], date(2025, 6, 3), AttendanceStatus.ABSENT)
+    # Overwriting a record moves its day from one count to another
+    manual(db, profiles[1], date(2025, 6, 3), AttendanceStatus.HALF_DAY, hours=4)
+    manual(db, profiles[2], date(2025, 6, 30), AttendanceStatus.LEAVE)
+    manual(db, profiles[2], date(2025, 7, 1), AttendanceStatus.PRESENT, hours=7)
+
+    attendance = db.query(Attendance).filter(Attendance.date == date(2025, 6, 2)).one()
+    correction = AttendanceCorrectionRequest(
+        attendance_id=attendance.id,
+        requested_by_id=reviewer.id,
+        reason="Stayed late",
+        requested_check_in_time=attendance.check_in_time,
+        requested_check_out_time=attendance.check_in_time + timedelta(hours=10),
+    )
+    db.add(correction)
+    db.commit()
+    approve_correction_request(correction.id, db=db, current_user=reviewer)
+
+    incremental = rollups(db)
+    assert incremental[(profiles[1].id, 2025, 6)] == (1, 0, 1, 0, 14 * 60)
+    assert incremental[(profiles[2].id, 2025, 6)] == (0, 0, 0, 1, 0)
+    assert incremental[(profiles[2].id, 2025, 7)] == (1, 0, 0, 0, 7 * 60)
+
+    rebuild_attendance_rollups(db)
+    assert rollups(db) == incremental
+
+
+def test_month_summary_sums_every_employee(db):
+    profiles = seed_employees(db, 2)
+    for profile in profiles:
+        manual(db, profile, date(2025, 6, 2), AttendanceStatus.PRESENT, hours=8)
+    manual(db, profiles[0], date(2025, 6, 3), AttendanceStatus.ABSENT)
+
+    summary = get_month_summary(db, 2025, 6)
+
+    assert (summary["present_days"], summary["absent_days"], summary["worked_hours"]) == (2, 1, 16)
+
+
+def test_payroll_reads_daily_attendance_only_for_employees_with_absences(db, count_queries):
+    profiles = seed_salaries(db, 4)
+    manual(db, profiles[0], date(2025, 6, 2), AttendanceStatus.PRESENT, hours=8)
+    run_payroll(db, JUNE_START, JUNE_END)  # compiles and caches the company calendar
+
+    with count_queries() as counter:
+        run_payroll(db, JUNE_START, JUNE_END)
+    assert not any("FROM attendances" in statement for statement in counter.statements)
+
+    manual(db, profiles[1], date(2025, 6, 3), AttendanceStatus.ABSENT)
+    with count_queries() as counter:
+        payroll_run = run_payroll(db, JUNE_START, JUNE_END)
+    attendance_queries = [statement for statement in counter.statements if "FROM attendances" in statement]
+    assert len(attendance_queries) == 1
+    assert payroll_run.employee_count == 4
+
+
+def test_payroll_reads_daily_attendance_while_the_rollups_are_not_built(db):
+    profiles = seed_salaries(db, 2)
+    # Attendance from before the rollups existed: raw rows, an empty rollup table
+    db.add(Attendance(employee_profile_id=profiles[0].id, date=date(2025, 6, 3), status=AttendanceStatus.ABSENT))
+    db.commit()
+    assert not rollups(db)
+
+    payroll_run = run_payroll(db, JUNE_START, JUNE_END)
+
+    entries = {entry.employee_profile_id: entry for entry in payroll_run.entries}
+    assert entries[profiles[0].id].absent_days == 1
+    assert entries[profiles[1].id].absent_days == 0
+
+
+def test_migrations_build_the_rollups_of_existing_attendance(engine, db):
+    profiles = seed_employees(db, 2)
+    db.query(Attendance).delete()
+    db.add(Attendance(employee_profile_id=profiles[0].id, date=date(2025, 6, 3), status=AttendanceStatus.ABSENT))
+    db.commit()
+    db.query(AttendanceMonthlyRollup).delete()
+    db.commit()
+
+    run_migrations(engine)
+
+    assert rollups(db) == {(profiles[0].id, 2025, 6): (0, 1, 0, 0, 0)}
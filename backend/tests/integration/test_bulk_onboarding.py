@@ -0,0 +1,57 @@
+from app.models import EmployeeProfile, LeaveBalance, User, UserSettings
+from app.services.employee_onboarding_service import (
+    ROW_INVALID, ROW_SKIPPED, create_employees_bulk, parse_employee_rows, validate_employee_rows,
+)
+from tests.integration.test_employee_status import seed_employees
+
+CSV = b"""first_name,last_name,work_email,job_position,department,mobile,joining_date
+John,Doe,john@example.com,Engineer,R&D,555-0100,2024-02-01
+Jane,Smith,jane@example.com,Designer,R&D,555-0101,2025-01-15
+Bad,Row,not-an-email,Engineer,R&D,555-0102,2024-02-01
+Dup,Licate,john@example.com,Engineer,R&D,555-0103,2024-02-01
+Old,Hand,emp0@example.com,Engineer,R&D,555-0104,2024-02-01
+"""
+
+
+def test_validation_reports_every_row_up_front(db):
+    seed_employees(db, 1)
+
+    to_create, results = validate_employee_rows(db, parse_employee_rows(CSV, "text/csv; charset=utf-8"))
+
+    assert [row for row, _ in to_create] == [1, 2]
+    assert results[3]["status"] == ROW_INVALID and results[3]["errors"][0].startswith("work_email")
+    assert results[4]["status"] == ROW_INVALID
+    assert results[5]["status"] == ROW_SKIPPED
+    assert results[5]["employee_id"] == "EMP0000"
+
+
+def test_bulk_create_uses_a_fixed_number_of_statements(db, count_queries):
+    company_id = seed_employees(db, 1)[0].company_id
+    rows = [
+        {
+            "first_name": f"First{i}", "last_name": "Last", "work_email": f"new{i}@example.com",
+            "job_position": "Engineer", "department": "R&D", "mobile": "555", "joining_date": "2024-03-01",
+        }
+        for i in range(50)
+    ]
+    to_create, _ = validate_employee_rows(db, rows)
+    employees = [employee_in for _, employee_in in to_create]
+
+    with count_queries() as counter:
+        login_ids = create_employees_bulk(db, employees, ["hash"] * len(employees), company_id)
+
+    # Sequence update, first-use seeding (savepoint, scan, insert, release), users and
+    # their ids, settings, profiles and their ids, leave balances, two counter updates,
+    # and the table version bump on commit
+    assert counter.count == 14
+    assert login_ids[0] == "OIFILA20240001"
+    assert login_ids[-1] == "OIFILA20240050"
+    assert db.query(User).count() == 51
+    assert db.query(UserSettings).count() == 50
+    assert db.query(EmployeeProfile).filter(EmployeeProfile.employee_id.in_(login_ids)).count() == 50
+    assert db.query(LeaveBalance).count() == 150
+
+    # Sending the same records again skips all of them
+    to_create, results = validate_employee_rows(db, rows)
+    assert to_create == []
+    assert {result["status"] for result in results.values()} == {ROW_SKIPPED}
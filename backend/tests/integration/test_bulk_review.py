@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.models import (
+    Attendance, AttendanceCorrectionRequest, CorrectionRequestStatus, LeaveBalanceLedger,
+    LeaveRequest, LeaveStatus, User,
+)
+from app.services.attendance_rollup_service import rebuild_attendance_rollups
+from app.services.bulk_review_service import review_correction_requests, review_leave_requests, summarize_review
+from tests.integration.test_attendance_rollups import rollups
+from tests.integration.test_employee_status import seed_employees
+from tests.integration.test_leave_balance import balance_of, seed_requests
+
+
+def seed_requests_for(db, profile_id, weeks):
+    first = db.query(LeaveRequest).order_by(LeaveRequest.id).first()
+    request = LeaveRequest(
+        employee_profile_id=profile_id,
+        leave_type=first.leave_type,
+        start_date=first.start_date + timedelta(weeks=weeks),
+        end_date=first.end_date + timedelta(weeks=weeks),
+        total_days=Decimal(2),
+        status=LeaveStatus.PENDING,
+    )
+    db.add(request)
+    db.commit()
+    return request.id
+
+
+def test_bulk_approval_reports_each_outcome(db):
+    # Six two-day requests against a ten day balance
+    profile, approver_ids, request_ids = seed_requests(db, 6, balance_days=10)
+    db.query(LeaveRequest).filter(LeaveRequest.id == request_ids[1]).update({"status": LeaveStatus.CANCELLED})
+    db.commit()
+
+    results = review_leave_requests(db, request_ids + [request_ids[0], 9999], True, approver_ids[0])
+
+    assert [(result["id"], result["status"]) for result in results] == [
+        (request_ids[0], "approved"),
+        (request_ids[1], "not_pending"),
+        (request_ids[2], "approved"),
+        (request_ids[3], "approved"),
+        (request_ids[4], "approved"),
+        (request_ids[5], "approved"),
+        (9999, "not_found"),
+    ]
+    balance = balance_of(db, profile.id)
+    assert (balance.used_days, balance.remaining_days) == (Decimal(10), Decimal(0))
+    assert db.query(LeaveBalanceLedger).count() == 5
+    assert summarize_review(results)["succeeded"] == 5
+
+    # Nothing left to spend
+    more = seed_requests_for(db, profile.id, weeks=10)
+    assert review_leave_requests(db, [more], True, approver_ids[0])[0]["status"] == "insufficient_balance"
+
+
+def test_bulk_approval_queries_do_not_grow_with_the_batch(db, count_queries):
+    _, approver_ids, request_ids = seed_requests(db, 10, balance_days=24)
+    db.expire_all()
+    review_leave_requests(db, request_ids[:1], True, approver_ids[0])
+    db.expire_all()
+
+    with count_queries() as small:
+        review_leave_requests(db, request_ids[1:3], True, approver_ids[0])
+    db.expire_all()
+    with count_queries() as large:
+        review_leave_requests(db, request_ids[3:], True, approver_ids[0])
+
+    assert large.count == small.count
+
+
+def test_bulk_rejection_records_comments(db):
+    _, approver_ids, request_ids = seed_requests(db, 3, balance_days=10)
+
+    results = review_leave_requests(db, request_ids, False, approver_ids[0], comments="Month-end freeze")
+
+    assert {result["status"] for result in results} == {"rejected"}
+    db.expire_all()
+    rejected = db.query(LeaveRequest).filter(LeaveRequest.id.in_(request_ids)).all()
+    assert {(leave.status, leave.comments, leave.approver_id) for leave in rejected} == {
+        (LeaveStatus.REJECTED, "Month-end freeze", approver_ids[0])
+    }
+    assert db.query(LeaveBalanceLedger).count() == 0
+
+
+def test_bulk_correction_approval_updates_attendance(db):
+    seed_employees(db, 6)
+    reviewer = db.query(User).first()
+    attendances = db.query(Attendance).order_by(Attendance.id).all()
+    check_in = datetime(2025, 3, 3, 9, 0)
+    corrections = [
+        AttendanceCorrectionRequest(
+            attendance_id=attendance.id,
+            requested_by_id=reviewer.id,
+            reason="Forgot to check in",
+            requested_check_in_time=check_in,
+            requested_check_out_time=check_in + timedelta(hours=8),
+        )
+        for attendance in attendances
+    ]
+    db.add_all(corrections)
+    db.commit()
+    rebuild_attendance_rollups(db)
+    correction_ids = [correction.id for correction in corrections]
+
+    results = review_correction_requests(db, correction_ids + [9999], True, reviewer.id)
+
+    assert [result["status"] for result in results] == ["approved"] * len(attendances) + ["not_found"]
+    db.expire_all()
+    assert {(a.check_in_time, a.check_out_time) for a in db.query(Attendance)} == {(check_in, check_in + timedelta(hours=8))}
+    assert {c.status for c in db.query(AttendanceCorrectionRequest)} == {CorrectionRequestStatus.APPROVED}
+    incremental = rollups(db)
+    rebuild_attendance_rollups(db)
+    assert rollups(db) == incremental
+
+    again = review_correction_requests(db, correction_ids, False, reviewer.id)
+    assert {result["status"] for result in again} == {"not_pending"}
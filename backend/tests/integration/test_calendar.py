@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.calendar import get_working_days
+from app.models import Company, CompanyHoliday, CompanyWorkWeek, EmployeeProfile
+from app.services.calendar_service import (
+    count_working_days, invalidate_calendar, is_working_day,
+)
+
+
+def add_company(db):
+    company = Company(name="Acme")
+    db.add(company)
+    db.commit()
+    return company
+
+
+def test_weekends_are_not_working_days(db):
+    company = add_company(db)
+
+    # Monday 2 June to Sunday 15 June 2025
+    assert count_working_days(db, company.id, date(2025, 6, 2), date(2025, 6, 15)) == 10
+    assert count_working_days(db, company.id, date(2025, 6, 7), date(2025, 6, 8)) == 0
+    assert not is_working_day(db, company.id, date(2025, 6, 7))
+    assert is_working_day(db, company.id, date(2025, 6, 9))
+
+
+def test_ranges_spanning_years(db):
+    company = add_company(db)
+
+    # Monday 29 December 2025 to Friday 2 January 2026
+    assert count_working_days(db, company.id, date(2025, 12, 29), date(2026, 1, 2)) == 5
+    assert count_working_days(db, company.id, date(2024, 1, 1), date(2024, 12, 31)) == 262
+
+
+def test_lookups_are_served_from_the_compiled_year(db, count_queries):
+    company = add_company(db)
+    count_working_days(db, company.id, date(2025, 1, 1), date(2025, 1, 31))
+
+    with count_queries() as counter:
+        for month in range(1, 13):
+            count_working_days(db, company.id, date(2025, month, 1), date(2025, month, 28))
+    assert counter.count == 0
+
+
+def test_holiday_and_work_week_edits_take_effect_after_invalidation(db):
+    company = add_company(db)
+    week = (date(2025, 6, 2), date(2025, 6, 8))
+    assert count_working_days(db, company.id, *week) == 5
+
+    db.add(CompanyHoliday(company_id=company.id, date=date(2025, 6, 4), name="Founders' Day"))
+    db.add(CompanyWorkWeek(company_id=company.id, working_weekdays=0b0111111))  # Monday to Saturday
+    db.commit()
+    assert count_working_days(db, company.id, *week) == 5  # still the cached calendar
+
+    invalidate_calendar(company.id)
+    assert count_working_days(db, company.id, *week) == 5  # one holiday fewer, one Saturday more
+    assert not is_working_day(db, company.id, date(2025, 6, 4))
+    assert is_working_day(db, company.id, date(2025, 6, 7))
+
+
+def test_working_days_range_is_capped(db, monkeypatch):
+    monkeypatch.setattr("app.api.calendar.settings.CALENDAR_MAX_RANGE_YEARS", 2)
+    company = add_company(db)
+    profile = EmployeeProfile(company_id=company.id)
+
+    result = get_working_days(date(2024, 1, 1), date(2025, 12, 31), employee_profile=profile, db=db)
+    assert result.working_days == 262 + 261
+
+    with pytest.raises(HTTPException) as exc:
+        get_working_days(date(2024, 12, 31), date(2026, 1, 1), employee_profile=profile, db=db)
+    assert exc.value.status_code == 400
@@ -0,0 +1,100 @@
+from datetime import date
+from decimal import Decimal
+
+from datetime import timedelta
+
+from app.api.leave import approve_leave_request
+from app.models import DashboardCounter, LeaveRequest, LeaveStatus, LeaveType, User, UserRole
+from app.services.bulk_review_service import review_leave_requests
+from app.services.dashboard_service import (
+    ACTIVE_USER_COUNT, EMPLOYEE_COUNT, PENDING_LEAVE_REQUEST_COUNT,
+    get_dashboard_counters, increment_counter, on_leave_counter, reconcile_dashboard_counters,
+)
+from app.services.leave_interval_service import count_employees_on_leave
+from tests.integration.test_employee_status import seed_employees
+
+
+def test_counters_are_seeded_on_first_read(db):
+    seed_employees(db, 4)
+
+    counters = get_dashboard_counters(db)
+
+    assert counters[EMPLOYEE_COUNT] == 4
+    assert counters[ACTIVE_USER_COUNT] == 4
+    assert counters[PENDING_LEAVE_REQUEST_COUNT] == 0
+    assert counters[on_leave_counter(date.today())] == 1
+    assert db.query(DashboardCounter).count() == 4
+
+
+def test_increments_are_committed_with_the_write(db):
+    profiles = seed_employees(db, 2)
+    get_dashboard_counters(db)
+
+    db.add(LeaveRequest(
+        employee_profile_id=profiles[0].id,
+        leave_type=LeaveType.PAID,
+        start_date=date.today(),
+        end_date=date.today(),
+        total_days=Decimal(1),
+        status=LeaveStatus.PENDING,
+    ))
+    increment_counter(db, PENDING_LEAVE_REQUEST_COUNT)
+    db.commit()
+
+    assert get_dashboard_counters(db)[PENDING_LEAVE_REQUEST_COUNT] == 1
+
+
+def test_reconcile_corrects_drift(db, count_queries):
+    seed_employees(db, 3)
+    get_dashboard_counters(db)
+
+    # A change made outside the API is not reflected until the next reconcile
+    db.query(User).update({User.is_active: False})
+    db.commit()
+    assert get_dashboard_counters(db)[ACTIVE_USER_COUNT] == 3
+
+    reconcile_dashboard_counters(db)
+
+    with count_queries() as counter:
+        counters = get_dashboard_counters(db)
+    assert counters[ACTIVE_USER_COUNT] == 0
+    assert counter.count == 1
+
+
+def test_leave_approvals_keep_the_on_leave_counter(db):
+    profiles = seed_employees(db, 6)
+    approver = User(email="hr@example.com", hashed_password="x", role=UserRole.HR_OFFICER, is_active=True)
+    db.add(approver)
+    today = date.today()
+    requests = [
+        LeaveRequest(
+            employee_profile_id=profile.id,
+            leave_type=LeaveType.UNPAID,
+            start_date=today + timedelta(days=offset),
+            end_date=today + timedelta(days=offset),
+            total_days=Decimal(1),
+            status=LeaveStatus.PENDING,
+        )
+        # Employees without leave today: one request for today, one for tomorrow, two for today
+        for profile, offset in ((profiles[2], 0), (profiles[5], 1), (profiles[3], 0), (profiles[0], 0))
+    ]
+    db.add_all(requests)
+    db.commit()
+    assert get_dashboard_counters(db)[on_leave_counter(today)] == 2
+
+    approve_leave_request(requests[0].id, db=db, current_user=approver)
+    review_leave_requests(db, [request.id for request in requests[1:]], approve=True, reviewer_id=approver.id)
+
+    counters = get_dashboard_counters(db)
+    assert counters[on_leave_counter(today)] == count_employees_on_leave(db) == 5
+
+
+def test_reconcile_drops_the_counters_of_other_days(db):
+    seed_employees(db, 2)
+    yesterday = date.today() - timedelta(days=1)
+    get_dashboard_counters(db, yesterday)
+
+    reconcile_dashboard_counters(db)
+
+    assert db.get(DashboardCounter, on_leave_counter(yesterday)) is None
+    assert db.get(DashboardCounter, on_leave_counter(date.today())) is not None
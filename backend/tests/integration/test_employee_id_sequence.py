@@ -0,0 +1,86 @@
+import threading
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_db_engine
+from app.models import Company, EmployeeIdSequence, EmployeeProfile, User, UserRole
+from app.services.employee_id_service import (
+    allocate_login_id, allocate_serials, backfill_employee_id_sequences,
+)
+
+
+def add_employee(db, employee_id, joining_date):
+    company = db.query(Company).first() or Company(name="Acme")
+    user = User(email=f"{employee_id}@example.com", hashed_password="x", role=UserRole.EMPLOYEE)
+    db.add_all([company, user])
+    db.flush()
+    db.add(EmployeeProfile(
+        user_id=user.id, company_id=company.id, employee_id=employee_id,
+        first_name="Jo", last_name="Do", joining_date=joining_date,
+    ))
+    db.commit()
+
+
+def test_first_allocation_continues_after_existing_ids(db):
+    add_employee(db, "OIJODO20240007", date(2024, 3, 1))
+    add_employee(db, "OIJODO20230042", date(2023, 3, 1))
+
+    assert allocate_login_id(db, "jane", "smith", 2024) == "OIJASM20240008"
+    assert allocate_login_id(db, "Al", None, 2024) == "OIALXX20240009"
+    assert allocate_serials(db, 2025) == 1
+    db.commit()
+
+    assert db.get(EmployeeIdSequence, 2024).last_serial == 9
+
+
+def test_allocate_block(db):
+    assert allocate_serials(db, 2024, count=5) == 1
+    assert allocate_serials(db, 2024, count=3) == 6
+
+
+def test_allocation_is_a_single_statement_once_seeded(db, count_queries):
+    allocate_serials(db, 2024)
+    db.commit()
+
+    with count_queries() as counter:
+        allocate_serials(db, 2024)
+    assert counter.count == 1
+
+
+def test_backfill_never_moves_counters_backwards(db):
+    add_employee(db, "OIJODO20240007", date(2024, 3, 1))
+    db.add(EmployeeIdSequence(year=2023, last_serial=50))
+    db.add(EmployeeIdSequence(year=2024, last_serial=3))
+    db.commit()
+    add_employee(db, "OIJODO20230042", date(2023, 3, 1))
+
+    assert backfill_employee_id_sequences(db) == {2023: 50, 2024: 7}
+
+
+def test_concurrent_allocations_are_unique(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/sequence.db")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    serials, errors = [], []
+
+    def allocate():
+        db = SessionLocal()
+        try:
+            for _ in range(10):
+                serials.append(allocate_serials(db, 2024))
+                db.commit()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    assert not errors
+    assert sorted(serials) == list(range(1, 81))
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from app.api.employees import read_all_employees
+from app.models import (
+    Attendance, AttendanceStatus, Company, EmployeeProfile, LeaveRequest,
+    LeaveStatus, LeaveType, User, UserRole,
+)
+from app.services.employee_status_service import resolve_employee_statuses
+
+
+def seed_employees(db, count):
+    company = Company(name="Acme")
+    db.add(company)
+    db.flush()
+
+    profiles = []
+    for i in range(count):
+        user = User(email=f"emp{i}@example.com", hashed_password="x", role=UserRole.EMPLOYEE)
+        db.add(user)
+        db.flush()
+        profile = EmployeeProfile(
+            user_id=user.id,
+            company_id=company.id,
+            employee_id=f"EMP{i:04d}",
+            first_name="Emp",
+            last_name=str(i),
+        )
+        db.add(profile)
+        profiles.append(profile)
+    db.flush()
+
+    today = date.today()
+    for i, profile in enumerate(profiles):
+        if i % 3 == 0:
+            db.add(Attendance(
+                employee_profile_id=profile.id,
+                date=today,
+                check_in_time=datetime.now(),
+                status=AttendanceStatus.PRESENT,
+            ))
+        elif i % 3 == 1:
+            db.add(LeaveRequest(
+                employee_profile_id=profile.id,
+                leave_type=LeaveType.PAID,
+                start_date=today - timedelta(days=1),
+                end_date=today + timedelta(days=1),
+                total_days=Decimal(3),
+                status=LeaveStatus.APPROVED,
+            ))
+    db.commit()
+    return profiles
+
+
+def test_resolve_employee_statuses(db):
+    profiles = seed_employees(db, 6)
+
+    statuses = resolve_employee_statuses(db, [p.id for p in profiles])
+
+    assert [statuses[p.id] for p in profiles] == ["present", "leave", "absent"] * 2
+
+
+def test_employee_list_query_count_is_constant(db, count_queries):
+    seed_employees(db, 30)
+    db.expire_all()
+
+    with count_queries() as counter:
+        small_page = read_all_employees(skip=0, limit=5, db=db, current_user=None)
+    small_page_queries = counter.count
+
+    db.expire_all()
+    with count_queries() as counter:
+        large_page = read_all_employees(skip=0, limit=30, db=db, current_user=None)
+
+    assert len(small_page) == 5
+    assert len(large_page) == 30
+    # Employees + users, attendance, approved leave
+    assert counter.count <= 3
+    assert counter.count == small_page_queries
+    assert {emp.status for emp in large_page} == {"present", "leave", "absent"}
@@ -0,0 +1,40 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from fastapi import Response
+
+from app.api.attendance import get_all_attendance_records
+from app.api.salary import get_all_payroll_data
+from app.models import Attendance, AttendanceStatus, SalaryStructure
+from app.responses import dumps
+from app.schemas import Attendance as AttendanceSchema, SalaryPayroll
+from app.services.payroll_service import get_payroll_projection
+from tests.integration.test_employee_status import seed_employees
+
+
+def test_dumps_matches_the_response_model_encoding():
+    content = {"amount": Decimal("10.50"), "day": date(2025, 3, 3), "status": AttendanceStatus.HALF_DAY}
+    assert json.loads(dumps(content)) == {"amount": "10.50", "day": "2025-03-03", "status": "half_day"}
+
+
+def test_row_responses_match_the_response_models(db):
+    profiles = seed_employees(db, 3)
+    # A record whose profile no longer exists is returned without one
+    db.add(Attendance(employee_profile_id=999, date=date(2024, 1, 1), status=AttendanceStatus.ABSENT))
+    db.add_all([SalaryStructure(employee_profile_id=p.id, basic_salary=Decimal("1000.25") * p.id) for p in profiles])
+    db.commit()
+
+    response = Response()
+    fast = get_all_attendance_records(response, skip=0, limit=1, cursor=None, employee_profile_id=None, db=db, current_user=None)
+    cursor = fast.headers["X-Next-Cursor"]
+    rest = get_all_attendance_records(Response(), skip=0, limit=1000, cursor=cursor, employee_profile_id=None, db=db, current_user=None)
+    attendance = db.query(Attendance).order_by(Attendance.date.desc(), Attendance.id.desc()).all()
+    rows = json.loads(fast.body) + json.loads(rest.body)
+    assert rows == [AttendanceSchema.model_validate(a).model_dump(mode="json") for a in attendance]
+    assert rows[-1]["employee_profile"] is None
+
+    salaries = get_all_payroll_data(skip=0, limit=100, db=db, current_user=None)
+    assert json.loads(salaries.body) == [
+        SalaryPayroll.model_validate(row).model_dump(mode="json") for row in get_payroll_projection(db)
+    ]
@@ -0,0 +1,137 @@
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.leave import approve_leave_request
+from app.database import Base, create_db_engine
+from app.models import LeaveBalance, LeaveBalanceLedger, LeaveRequest, LeaveStatus, LeaveType, User, UserRole
+from app.services.leave_service import backfill_leave_ledger, debit_leave_balance, recompute_leave_balances
+from tests.integration.test_employee_status import seed_employees
+
+MONDAY = date(2025, 3, 3)
+
+
+def seed_requests(db, count, balance_days):
+    """One employee with a paid balance and `count` pending two-day requests in different weeks."""
+    profile = seed_employees(db, 1)[0]
+    db.query(LeaveRequest).delete()
+    approvers = [User(email=f"hr{i}@example.com", hashed_password="x", role=UserRole.HR_OFFICER) for i in range(2)]
+    db.add_all(approvers)
+    db.add(LeaveBalance(
+        employee_profile_id=profile.id, leave_type=LeaveType.PAID, year=MONDAY.year,
+        total_days=Decimal(balance_days), used_days=Decimal(0), remaining_days=Decimal(balance_days),
+    ))
+    requests = [
+        LeaveRequest(
+            employee_profile_id=profile.id,
+            leave_type=LeaveType.PAID,
+            start_date=MONDAY + timedelta(weeks=i),
+            end_date=MONDAY + timedelta(weeks=i, days=1),
+            total_days=Decimal(2),
+            status=LeaveStatus.PENDING,
+        )
+        for i in range(count)
+    ]
+    db.add_all(requests)
+    db.commit()
+    return profile, [approver.id for approver in approvers], [request.id for request in requests]
+
+
+def balance_of(db, profile_id):
+    db.expire_all()
+    return db.query(LeaveBalance).filter(LeaveBalance.employee_profile_id == profile_id).one()
+
+
+def test_debit_is_refused_when_the_balance_is_short(db):
+    profile, _, request_ids = seed_requests(db, 2, balance_days=3)
+    first, second = [db.get(LeaveRequest, request_id) for request_id in request_ids]
+
+    assert debit_leave_balance(db, first, Decimal(2))
+    assert not debit_leave_balance(db, second, Decimal(2))
+    db.commit()
+
+    balance = balance_of(db, profile.id)
+    assert (balance.used_days, balance.remaining_days) == (Decimal(2), Decimal(1))
+    assert db.query(LeaveBalanceLedger).count() == 1
+
+
+def test_balances_are_recomputed_from_the_ledger(db):
+    profile, approver_ids, request_ids = seed_requests(db, 2, balance_days=10)
+    approver = db.get(User, approver_ids[0])
+    approve_leave_request(request_ids[0], db=db, current_user=approver)
+
+    balance = balance_of(db, profile.id)
+    balance.used_days, balance.remaining_days = Decimal(7), Decimal(3)
+    db.commit()
+
+    assert recompute_leave_balances(db) == 1
+    balance = balance_of(db, profile.id)
+    assert (balance.used_days, balance.remaining_days) == (Decimal(2), Decimal(8))
+
+
+def test_backfill_records_leave_approved_before_the_ledger(db):
+    profile, _, request_ids = seed_requests(db, 2, balance_days=10)
+    db.query(LeaveRequest).filter(LeaveRequest.id == request_ids[0]).update({"status": LeaveStatus.APPROVED})
+    db.commit()
+
+    assert backfill_leave_ledger(db) == 1
+    assert backfill_leave_ledger(db) == 0
+    recompute_leave_balances(db)
+    balance = balance_of(db, profile.id)
+    assert (balance.used_days, balance.remaining_days) == (Decimal(2), Decimal(8))
+
+
+def test_concurrent_approvals_never_overspend(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/leave.db")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        # Ten requests of two days against a ten day balance: only five can be approved
+        profile, approver_ids, request_ids = seed_requests(db, 10, balance_days=10)
+        profile_id = profile.id
+
+    outcomes, errors = [], []
+
+    def approve_all(approver_id, order):
+        db = SessionLocal()
+        try:
+            approver = db.get(User, approver_id)
+            for request_id in order:
+                try:
+                    approve_leave_request(request_id, db=db, current_user=approver)
+                    outcomes.append((request_id, 200))
+                except HTTPException as e:
+                    outcomes.append((request_id, e.status_code))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+        finally:
+            db.close()
+
+    # Eight officers work through the queue at once, half of them from each end
+    threads = [
+        threading.Thread(target=approve_all, args=(approver_ids[i % 2], request_ids[::1 if i % 2 else -1]))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with SessionLocal() as db:
+        balance = balance_of(db, profile_id)
+        approved = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.APPROVED).count()
+        ledger_days = db.execute(select(func.sum(LeaveBalanceLedger.days))).scalar()
+        ledger_requests = db.execute(select(LeaveBalanceLedger.leave_request_id)).scalars().all()
+    engine.dispose()
+
+    assert not errors
+    assert len(outcomes) == 80
+    assert sum(1 for _, code in outcomes if code == 200) == 5
+    assert approved == 5
+    assert (balance.used_days, balance.remaining_days) == (Decimal(10), Decimal(0))
+    assert ledger_days == Decimal(10)
+    assert len(set(ledger_requests)) == len(ledger_requests) == 5
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi import Response
+
+from app.api.leave import LeaveSortField, SortOrder, get_all_leave_requests
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.models import LeaveRequest, LeaveStatus, LeaveType
+from tests.integration.test_employee_status import seed_employees
+
+START = date(2025, 4, 1)
+
+
+def seed_leaves(db):
+    profiles = seed_employees(db, 6)
+    db.query(LeaveRequest).delete()
+    for i, profile in enumerate(profiles):
+        profile.department = "Sales" if i % 2 else "R&D"
+        for j in range(4):
+            db.add(LeaveRequest(
+                employee_profile_id=profile.id,
+                leave_type=LeaveType.SICK if j == 3 else LeaveType.PAID,
+                start_date=START + timedelta(days=7 * j + i),
+                end_date=START + timedelta(days=7 * j + i + 1),
+                total_days=Decimal(2),
+                status=LeaveStatus.PENDING if j % 2 else LeaveStatus.APPROVED,
+            ))
+    db.commit()
+    return profiles
+
+
+def list_leaves(db, response=None, **filters):
+    params = dict(
+        status_filter=None, leave_type=None, date_from=None, date_to=None, department=None,
+        employee_profile_id=None, sort=LeaveSortField.CREATED_AT, order=SortOrder.DESC,
+        cursor=None, limit=None,
+    )
+    params.update(filters)
+    return get_all_leave_requests(response or Response(), db=db, current_user=None, **params)
+
+
+def test_list_is_a_single_query_with_employee_details(db, count_queries):
+    profiles = seed_leaves(db)
+    db.expire_all()
+
+    with count_queries() as counter:
+        leaves = list_leaves(db)
+
+    assert counter.count == 1
+    assert len(leaves) == 24
+    first = next(leave for leave in leaves if leave["employee_profile_id"] == profiles[0].id)
+    assert first["employee_code"] == "EMP0000"
+    assert first["employee_name"] == "Emp 0"
+
+
+def test_filters(db):
+    seed_leaves(db)
+
+    assert len(list_leaves(db, status_filter=LeaveStatus.PENDING)) == 12
+    assert len(list_leaves(db, leave_type=LeaveType.SICK)) == 6
+    assert len(list_leaves(db, department="Sales")) == 12
+    # Leaves overlapping the first week: employee i is off on days i and i + 1
+    overlapping = list_leaves(db, date_from=START, date_to=START + timedelta(days=2))
+    assert sorted(leave["start_date"] for leave in overlapping) == [START, START + timedelta(days=1), START + timedelta(days=2)]
+
+
+def test_cursor_pages_follow_the_requested_sort(db):
+    seed_leaves(db)
+    seen, cursor = [], None
+    while True:
+        response = Response()
+        page = list_leaves(db, response, sort=LeaveSortField.START_DATE, order=SortOrder.ASC, cursor=cursor, limit=5)
+        seen.extend(page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    keys = [(leave["start_date"], leave["id"]) for leave in seen]
+    assert len(set(keys)) == 24
+    assert keys == sorted(keys)
+
+
+def test_without_a_limit_every_request_is_returned(db):
+    profiles = seed_leaves(db)
+    # More than a default page would hold
+    db.add_all([
+        LeaveRequest(
+            employee_profile_id=profiles[0].id, leave_type=LeaveType.UNPAID, start_date=START + timedelta(days=100 + k),
+            end_date=START + timedelta(days=100 + k), total_days=Decimal(1), status=LeaveStatus.REJECTED,
+        )
+        for k in range(100)
+    ])
+    db.commit()
+    response = Response()
+
+    rows = list_leaves(db, response)
+
+    assert len(rows) == 124
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_cursor_pages_include_requests_without_created_at(db):
+    seed_leaves(db)
+    db.query(LeaveRequest).filter(LeaveRequest.id % 3 == 0).update({LeaveRequest.created_at: None})
+    db.commit()
+
+    for order in SortOrder:
+        seen, cursor = [], None
+        while True:
+            response = Response()
+            page = list_leaves(db, response, order=order, cursor=cursor, limit=5)
+            seen.extend(page)
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+
+        assert len({leave["id"] for leave in seen}) == 24
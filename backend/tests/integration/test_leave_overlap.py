@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.leave import apply_for_leave, approve_leave_request
+from app.models import LeaveBalance, LeaveRequest, LeaveStatus, LeaveType, User, UserRole
+from app.schemas import LeaveRequestCreate
+from app.services.leave_interval_service import (
+    count_employees_on_leave, employees_on_leave, find_overlapping_leave,
+)
+from tests.integration.test_employee_status import seed_employees
+
+# Monday to Friday
+MONDAY = date(2025, 3, 3)
+
+
+def add_leave(db, profile, start, end, status=LeaveStatus.APPROVED):
+    leave = LeaveRequest(
+        employee_profile_id=profile.id,
+        leave_type=LeaveType.PAID,
+        start_date=start,
+        end_date=end,
+        total_days=Decimal((end - start).days + 1),
+        status=status,
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+def apply(db, profile, start, end):
+    leave_in = LeaveRequestCreate(
+        employee_profile_id=profile.id, leave_type=LeaveType.PAID, start_date=start, end_date=end,
+    )
+    return apply_for_leave(leave_in, employee_profile=profile, db=db)
+
+
+def test_overlap_lookup(db):
+    profile = seed_employees(db, 1)[0]
+    add_leave(db, profile, date(2025, 3, 4), date(2025, 3, 6))
+    add_leave(db, profile, date(2025, 3, 10), date(2025, 3, 10), status=LeaveStatus.REJECTED)
+
+    assert find_overlapping_leave(db, profile.id, date(2025, 3, 6), date(2025, 3, 7)) is not None
+    assert find_overlapping_leave(db, profile.id, date(2025, 3, 1), date(2025, 3, 4)) is not None
+    assert find_overlapping_leave(db, profile.id, date(2025, 3, 7), date(2025, 3, 10)) is None
+
+
+def test_employees_on_leave(db):
+    profiles = seed_employees(db, 3)
+    db.query(LeaveRequest).delete()
+    add_leave(db, profiles[0], date(2025, 3, 3), date(2025, 3, 5))
+    add_leave(db, profiles[1], date(2025, 3, 5), date(2025, 3, 5))
+    add_leave(db, profiles[2], date(2025, 3, 5), date(2025, 3, 7), status=LeaveStatus.PENDING)
+
+    assert employees_on_leave(db, date(2025, 3, 5)) == {profiles[0].id, profiles[1].id}
+    assert employees_on_leave(db, date(2025, 3, 5), [profiles[1].id, profiles[2].id]) == {profiles[1].id}
+    assert employees_on_leave(db, date(2025, 3, 6)) == set()
+    assert count_employees_on_leave(db, date(2025, 3, 4)) == 1
+
+
+def test_apply_rejects_overlapping_requests(db):
+    profile = seed_employees(db, 1)[0]
+    db.add(LeaveBalance(
+        employee_profile_id=profile.id, leave_type=LeaveType.PAID, year=2025,
+        total_days=Decimal(24), used_days=Decimal(0), remaining_days=Decimal(24),
+    ))
+    db.commit()
+
+    apply(db, profile, MONDAY, date(2025, 3, 5))
+    with pytest.raises(HTTPException) as exc:
+        apply(db, profile, date(2025, 3, 5), date(2025, 3, 7))
+    assert exc.value.status_code == 400
+    assert "overlap" in exc.value.detail
+
+    assert apply(db, profile, date(2025, 3, 6), date(2025, 3, 7)).status == LeaveStatus.PENDING
+
+
+def test_approve_rejects_requests_overlapping_approved_leave(db):
+    profile = seed_employees(db, 1)[0]
+    db.query(LeaveRequest).delete()
+    approver = User(email="hr@example.com", hashed_password="x", role=UserRole.HR_OFFICER)
+    db.add(approver)
+    add_leave(db, profile, MONDAY, date(2025, 3, 4))
+    # Filed before overlapping requests were rejected on apply
+    legacy = add_leave(db, profile, date(2025, 3, 4), date(2025, 3, 5), status=LeaveStatus.PENDING)
+    legacy.leave_type = LeaveType.UNPAID
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        approve_leave_request(legacy.id, db=db, current_user=approver)
+    assert exc.value.status_code == 400
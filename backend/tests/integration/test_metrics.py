@@ -0,0 +1,76 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api import metrics as metrics_router
+from app.auth.security import create_access_token
+from app.database import get_db
+from app.metrics import MetricsMiddleware, MetricsRegistry, instrument_queries
+from app.models import User, UserRole
+
+
+def test_requests_are_timed_and_their_queries_counted(db, monkeypatch):
+    monkeypatch.setattr("app.metrics.settings.METRICS_QUERY_COUNT_THRESHOLD", 5)
+    monkeypatch.setattr("app.metrics.settings.SERVER_TIMING_ENABLED", True)
+    instrument_queries()
+    registry = MetricsRegistry()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        # One query per "related row", the N+1 shape the threshold is meant to catch
+        for _ in range(item_id):
+            db.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    client = TestClient(app)
+    light = client.get("/items/2")
+    client.get("/items/8")
+    client.get("/missing")
+
+    assert light.headers["server-timing"].startswith('db;dur=')
+    assert 'desc="2 queries"' in light.headers["server-timing"]
+    rendered = registry.render({"token_cache": {"hits": 3, "enabled": True, "note": "ignored"}})
+    route = 'method="GET",route="/items/{item_id}",status="200"'
+    assert f"http_request_duration_seconds_count{{{route}}} 2" in rendered
+    assert f'http_request_duration_seconds_bucket{{{route},le="+Inf"}} 2' in rendered
+    assert f"db_queries_total{{{route}}} 10" in rendered
+    assert f"db_query_heavy_requests_total{{{route}}} 1" in rendered
+    assert 'route="unmatched",status="404"' in rendered
+    assert "token_cache_hits 3" in rendered and "token_cache_enabled 1" in rendered
+    assert "note" not in rendered
+
+
+def test_server_timing_is_opt_in():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=MetricsRegistry())
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    assert "server-timing" not in TestClient(app).get("/ping").headers
+
+
+def test_metrics_are_only_served_to_admins(db):
+    for email, role in (("admin@example.com", UserRole.ADMIN), ("hr@example.com", UserRole.HR_OFFICER)):
+        db.add(User(email=email, hashed_password="x", role=role, is_active=True))
+    db.commit()
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+
+    def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    def scrape(email=None):
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"} if email else {}
+        return client.get("/metrics", headers=headers)
+
+    assert scrape().status_code == 401
+    assert scrape("hr@example.com").status_code == 403
+    admin = scrape("admin@example.com")
+    assert admin.status_code == 200 and "token_cache" in admin.text
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.api.employees import create_employee
+from app.auth import hashing
+from app.config import settings
+from app.schemas import EmployeeCreateBasic
+from tests.integration.test_employee_status import seed_employees
+
+
+def test_batch_hashes_in_parallel_on_the_threadpool(monkeypatch):
+    monkeypatch.setattr("app.auth.hashing.settings.PASSWORD_HASH_WORKERS", 0)
+    running, most = 0, 0
+    lock = threading.Lock()
+
+    def slow_hash(password):
+        nonlocal running, most
+        with lock:
+            running += 1
+            most = max(most, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(hashing, "_hash_password", slow_hash)
+
+    hashed = asyncio.run(hashing.hash_passwords_async([f"pw{i}" for i in range(8)]))
+
+    assert hashed == [f"hashed:pw{i}" for i in range(8)]
+    assert most > 1
+
+
+def test_rejects_hashing_beyond_the_pending_limit_with_503(monkeypatch):
+    monkeypatch.setattr("app.auth.hashing.settings.PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr("app.auth.hashing.settings.PASSWORD_HASH_MAX_PENDING", 2)
+    started = threading.Barrier(3)
+
+    def blocking_hash(password):
+        started.wait(timeout=5)  # holds both pending slots until the third call was refused
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(hashing, "_hash_password", blocking_hash)
+
+    async def run():
+        queued = [asyncio.ensure_future(hashing.hash_password_async(f"pw{i}")) for i in range(2)]
+        await asyncio.sleep(0.05)
+        try:
+            await hashing.hash_password_async("one too many")
+        except HTTPException as exc:
+            refused = exc
+        finally:
+            started.wait(timeout=5)
+        return refused, await asyncio.gather(*queued)
+
+    refused, hashed = asyncio.run(run())
+
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == "1"
+    assert hashed == ["hashed:pw0", "hashed:pw1"]
+    assert hashing._pending == 0
+
+
+def test_verify_and_update_rehashes_an_outdated_work_factor(monkeypatch):
+    monkeypatch.setattr("app.auth.hashing.settings.PASSWORD_HASH_WORKERS", 0)
+    outdated = bcrypt.using(rounds=4).hash("secret")
+
+    is_valid, new_hash = asyncio.run(hashing.verify_and_update_password_async("secret", outdated))
+
+    assert is_valid
+    assert new_hash and new_hash != outdated
+    assert bcrypt.from_string(new_hash).rounds == settings.BCRYPT_ROUNDS
+    assert asyncio.run(hashing.verify_and_update_password_async("secret", new_hash)) == (True, None)
+    assert asyncio.run(hashing.verify_and_update_password_async("wrong", outdated)) == (False, None)
+
+
+def test_duplicate_employee_email_is_refused_before_hashing(db, monkeypatch):
+    admin = seed_employees(db, 1)[0].user
+    hashed = []
+
+    async def record_hash(password):
+        hashed.append(password)
+        return "hashed"
+
+    monkeypatch.setattr("app.api.employees.hash_password_async", record_hash)
+    employee_in = EmployeeCreateBasic(
+        first_name="Dup", last_name="Licate", work_email="emp0@example.com", job_position="Engineer",
+        department="R&D", mobile="555-0100", joining_date=date(2025, 1, 1),
+    )
+
+    with pytest.raises(HTTPException) as refused:
+        asyncio.run(create_employee(employee_in, db=db, current_user=admin))
+
+    assert refused.value.status_code == 400
+    assert hashed == []
@@ -0,0 +1,177 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.models import (
+    Attendance, AttendanceStatus, LeaveRequest, LeaveStatus, LeaveType,
+    PayrollRunEntry, SalaryStructure,
+)
+from app.services.attendance_rollup_service import rebuild_attendance_rollups
+from app.api.salary import create_payroll_run
+from app.schemas.payroll import PayrollRunCreate
+from app.services.payroll_service import get_payroll_projection, run_payroll
+from app.services.salary_service import calculate_net_salary
+from tests.integration.test_employee_status import seed_employees
+
+JUNE_START, JUNE_END = date(2025, 6, 1), date(2025, 6, 30)
+
+
+def seed_salaries(db, count):
+    profiles = seed_employees(db, count)
+    # Drop the attendance and leave seeded for today so only the rows below count
+    db.query(Attendance).delete()
+    db.query(LeaveRequest).delete()
+    for i, profile in enumerate(profiles):
+        db.add(SalaryStructure(
+            employee_profile_id=profile.id,
+            basic_salary=Decimal("30000.00") + i,
+            hra=Decimal("12000.00"),
+            standard_allowance=Decimal("4167.00"),
+            performance_bonus=Decimal("2500.55"),
+            lta=Decimal("2500.00"),
+            fixed_allowance=Decimal("2915.45"),
+            professional_tax=Decimal("200.00"),
+            pf_contribution=Decimal("3600.00"),
+        ))
+    db.commit()
+    return profiles
+
+
+def test_projection_matches_per_row_calculation(db):
+    seed_salaries(db, 5)
+
+    projected = get_payroll_projection(db, skip=0, limit=10)
+
+    for row in projected:
+        expected = calculate_net_salary(db.get(SalaryStructure, row["id"]))
+        assert row["gross_salary"] == expected["gross_salary"]
+        assert row["total_deductions"] == expected["total_deductions"]
+        assert row["net_salary"] == expected["net_salary"]
+
+
+def test_payroll_run_prorates_unpaid_leave_and_absences(db):
+    profiles = seed_salaries(db, 3)
+    # Unpaid leave from Friday 30 May to Tuesday 3 June: two working days in June,
+    # one of which also has an absent record
+    db.add(LeaveRequest(
+        employee_profile_id=profiles[0].id,
+        leave_type=LeaveType.UNPAID,
+        start_date=date(2025, 5, 30),
+        end_date=date(2025, 6, 3),
+        total_days=Decimal(5),
+        status=LeaveStatus.APPROVED,
+    ))
+    db.add(Attendance(employee_profile_id=profiles[0].id, date=date(2025, 6, 2), status=AttendanceStatus.ABSENT))
+    # One absence and one half day, plus an absence on a Saturday which is not a working day
+    db.add(Attendance(employee_profile_id=profiles[1].id, date=date(2025, 6, 10), status=AttendanceStatus.ABSENT))
+    db.add(Attendance(employee_profile_id=profiles[1].id, date=date(2025, 6, 11), status=AttendanceStatus.HALF_DAY))
+    db.add(Attendance(employee_profile_id=profiles[1].id, date=date(2025, 6, 14), status=AttendanceStatus.ABSENT))
+    # Paid leave does not reduce pay
+    db.add(LeaveRequest(
+        employee_profile_id=profiles[2].id,
+        leave_type=LeaveType.PAID,
+        start_date=date(2025, 6, 5),
+        end_date=date(2025, 6, 6),
+        total_days=Decimal(2),
+        status=LeaveStatus.APPROVED,
+    ))
+    db.commit()
+    # The attendance above was inserted directly, bypassing the rollup updates
+    rebuild_attendance_rollups(db)
+
+    payroll_run = run_payroll(db, JUNE_START, JUNE_END, chunk_size=2)
+
+    entries = {
+        entry.employee_profile_id: entry
+        for entry in db.query(PayrollRunEntry).filter(PayrollRunEntry.payroll_run_id == payroll_run.id)
+    }
+    assert payroll_run.employee_count == 3
+    # June 2025 has 21 working days
+    assert entries[profiles[0].id].unpaid_leave_days == 2
+    assert entries[profiles[0].id].absent_days == 0
+    assert entries[profiles[0].id].payable_days == 19
+    assert entries[profiles[1].id].absent_days == Decimal("1.5")
+    assert entries[profiles[2].id].payable_days == 21
+
+    first = entries[profiles[0].id]
+    assert first.gross_salary == Decimal("54083.00")
+    assert first.prorated_gross == Decimal("48932.24")  # 54083 * 19 / 21
+    assert first.prorated_deductions == Decimal("3457.14")  # 200 + 3600 * 19 / 21
+    assert first.net_pay == first.prorated_gross - first.prorated_deductions
+    assert payroll_run.total_net == sum(entry.net_pay for entry in entries.values())
+
+
+def test_payroll_run_never_pays_a_negative_net(db):
+    profiles = seed_salaries(db, 2)
+    # Unpaid leave for the whole of June: nothing to pay, so no professional tax either
+    db.add(LeaveRequest(
+        employee_profile_id=profiles[0].id,
+        leave_type=LeaveType.UNPAID,
+        start_date=JUNE_START,
+        end_date=JUNE_END,
+        total_days=Decimal(21),
+        status=LeaveStatus.APPROVED,
+    ))
+    # A salary too small to cover the fixed deduction
+    small = db.query(SalaryStructure).filter(SalaryStructure.employee_profile_id == profiles[1].id).one()
+    for column in ("basic_salary", "hra", "standard_allowance", "performance_bonus", "lta", "fixed_allowance", "pf_contribution"):
+        setattr(small, column, Decimal("0.00"))
+    small.basic_salary = Decimal("100.00")
+    db.commit()
+
+    payroll_run = run_payroll(db, JUNE_START, JUNE_END)
+
+    entries = {
+        entry.employee_profile_id: entry
+        for entry in db.query(PayrollRunEntry).filter(PayrollRunEntry.payroll_run_id == payroll_run.id)
+    }
+    on_leave, underpaid = entries[profiles[0].id], entries[profiles[1].id]
+    assert on_leave.payable_days == 0
+    assert (on_leave.prorated_gross, on_leave.prorated_deductions, on_leave.net_pay) == (0, 0, 0)
+    assert (underpaid.prorated_gross, underpaid.prorated_deductions, underpaid.net_pay) == (Decimal("100.00"), Decimal("100.00"), 0)
+    assert payroll_run.total_net == 0
+
+
+@pytest.mark.parametrize("period_start, period_end", [
+    (date(2025, 1, 1), date(2025, 3, 31)),  # a quarter
+    (date(2025, 6, 1), date(2025, 6, 15)),  # half a month
+    (date(2025, 6, 16), date(2025, 7, 15)),  # a month's length across two months
+])
+def test_payroll_runs_cover_exactly_one_calendar_month(db, period_start, period_end):
+    seed_salaries(db, 1)
+
+    with pytest.raises(ValueError):
+        run_payroll(db, period_start, period_end)
+    with pytest.raises(HTTPException) as refused:
+        create_payroll_run(PayrollRunCreate(period_start=period_start, period_end=period_end), db=db, current_user=None)
+
+    assert refused.value.status_code == 400
+    assert run_payroll(db, date(2024, 2, 1), date(2024, 2, 29)).employee_count == 1
+
+
+def test_payroll_run_skips_salaries_without_an_employee_profile(db):
+    profiles = seed_salaries(db, 3)
+    db.execute(text("DELETE FROM employee_profiles WHERE id = :id"), {"id": profiles[1].id})
+    db.commit()
+
+    payroll_run = run_payroll(db, JUNE_START, JUNE_END, chunk_size=1)
+
+    assert payroll_run.employee_count == 2
+    assert {entry.employee_profile_id for entry in db.query(PayrollRunEntry)} == {profiles[0].id, profiles[2].id}
+
+
+def test_payroll_run_query_count_depends_on_chunks_not_employees(db, count_queries):
+    seed_salaries(db, 12)
+    run_payroll(db, JUNE_START, JUNE_END)  # compiles and caches the company calendar
+
+    with count_queries() as small_chunks:
+        run_payroll(db, JUNE_START, JUNE_END, chunk_size=4)
+    with count_queries() as one_chunk:
+        run_payroll(db, JUNE_START, JUNE_END, chunk_size=100)
+
+    # Per chunk: salaries, company ids, unpaid leave, absences, entry insert
+    assert one_chunk.count < small_chunks.count
+    assert small_chunks.count - one_chunk.count == 2 * 5
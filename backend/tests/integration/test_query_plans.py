@@ -0,0 +1,119 @@
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.models import (
+    Attendance, AttendanceMonthlyRollup, EmployeeProfile, LeaveBalance, LeaveRequest, LeaveStatus, LeaveType,
+)
+from scripts.seed_synthetic_data import seed_synthetic_company
+
+TODAY = date(2025, 1, 15)
+
+# The queries the routers run on (almost) every request
+HOT_QUERIES = {
+    "employee profile by user": select(EmployeeProfile).where(EmployeeProfile.user_id == 1),
+    "attendance by employee and day": select(Attendance).where(
+        Attendance.employee_profile_id == 1, Attendance.date == TODAY
+    ),
+    "attendance history for employee": select(Attendance).where(
+        Attendance.employee_profile_id == 1
+    ).order_by(Attendance.date.desc()),
+    "attendance for a day": select(Attendance).where(Attendance.date == TODAY),
+    "today's status for a page of employees": select(Attendance.employee_profile_id, Attendance.status).where(
+        Attendance.employee_profile_id.in_([1, 2, 3]), Attendance.date == TODAY
+    ),
+    "attendance rollups for a month": select(AttendanceMonthlyRollup).where(
+        AttendanceMonthlyRollup.year == TODAY.year, AttendanceMonthlyRollup.month == TODAY.month
+    ),
+    "approved leave covering a day": select(LeaveRequest.employee_profile_id).where(
+        LeaveRequest.employee_profile_id.in_([1, 2, 3]),
+        LeaveRequest.status == LeaveStatus.APPROVED,
+        LeaveRequest.start_date <= TODAY,
+        LeaveRequest.end_date >= TODAY,
+    ),
+    "employees on leave on a day": select(LeaveRequest.employee_profile_id).where(
+        LeaveRequest.status == LeaveStatus.APPROVED,
+        LeaveRequest.end_date >= TODAY,
+        LeaveRequest.start_date <= TODAY,
+    ),
+    "overlapping leave for employee": select(LeaveRequest).where(
+        LeaveRequest.employee_profile_id == 1,
+        LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED]),
+        LeaveRequest.start_date <= TODAY,
+        LeaveRequest.end_date >= TODAY,
+    ),
+    "leave requests for employee": select(LeaveRequest).where(LeaveRequest.employee_profile_id == 1),
+    "pending leave count": select(func.count()).select_from(LeaveRequest).where(
+        LeaveRequest.status == LeaveStatus.PENDING
+    ),
+    "leave balance for employee, type and year": select(LeaveBalance).where(
+        LeaveBalance.employee_profile_id == 1,
+        LeaveBalance.leave_type == LeaveType.PAID,
+        LeaveBalance.year == TODAY.year,
+    ),
+}
+
+
+# The index each hot query must SEARCH. The employee-and-day leave check has two
+# good candidates, and which one wins depends on the table statistics.
+EXPECTED_INDEXES = {
+    "employee profile by user": {"sqlite_autoindex_employee_profiles_1"},
+    "attendance by employee and day": {"uq_attendances_employee_date"},
+    "attendance history for employee": {"uq_attendances_employee_date"},
+    "attendance for a day": {"ix_attendances_date"},
+    "today's status for a page of employees": {"uq_attendances_employee_date"},
+    "attendance rollups for a month": {"ix_attendance_monthly_rollups_month"},
+    "approved leave covering a day": {"ix_leave_requests_employee_status_dates", "ix_leave_requests_status_end_start"},
+    "employees on leave on a day": {"ix_leave_requests_status_end_start"},
+    "overlapping leave for employee": {"ix_leave_requests_employee_status_dates"},
+    "leave requests for employee": {"ix_leave_requests_employee_status_dates"},
+    "pending leave count": {"ix_leave_requests_status"},
+    "leave balance for employee, type and year": {"ix_leave_balances_employee_type_year"},
+}
+
+INDEX_SEARCH = re.compile(r"^SEARCH \S+ USING (?:COVERING )?INDEX (\S+) \(")
+
+
+def query_plan(engine, stmt):
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def assert_searches_expected_index(name, plan):
+    # Every table step must be an index SEARCH (a SCAN, even one USING INDEX, walks
+    # the whole index), and at least one of them must use the index meant for it
+    table_steps = [step for step in plan if step.startswith(("SCAN", "SEARCH"))]
+    assert table_steps, plan
+    searched = [INDEX_SEARCH.match(step) for step in table_steps]
+    assert all(searched), f"{name}: {plan}"
+    assert {match.group(1) for match in searched} & EXPECTED_INDEXES[name], f"{name}: {plan}"
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(engine, name):
+    plan = query_plan(engine, HOT_QUERIES[name])
+
+    assert_searches_expected_index(name, plan)
+
+
+@pytest.fixture(scope="module")
+def seeded_engine():
+    # A synthetic company with ANALYZE statistics, seeded once for the module
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    seed_synthetic_company(engine, 200, days=90, today=TODAY)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index_with_statistics(seeded_engine, name):
+    # With realistic data and statistics the planner must still prefer the indexes
+    plan = query_plan(seeded_engine, HOT_QUERIES[name])
+
+    assert_searches_expected_index(name, plan)
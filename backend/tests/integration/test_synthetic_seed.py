@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.pool import StaticPool
+
+from app.models import (
+    Attendance, AttendanceMonthlyRollup, DashboardCounter, EmployeeProfile, LeaveBalance, LeaveRequest,
+    LeaveStatus, User, UserRole,
+)
+from app.auth.security import verify_password
+from app.services.attendance_rollup_service import rebuild_attendance_rollups
+from app.services.leave_service import recompute_leave_balances
+from scripts.seed_synthetic_data import DEFAULT_PASSWORD, seed_synthetic_company
+
+TODAY = date(2025, 3, 3)
+
+
+def table_rows(engine, *columns):
+    with engine.connect() as conn:
+        return conn.execute(select(*columns).order_by(*columns)).all()
+
+
+def test_same_seed_writes_the_same_rows_whatever_the_batch_size(engine):
+    other = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    try:
+        seed_synthetic_company(engine, 30, days=60, seed=7, batch_size=30, today=TODAY)
+        seed_synthetic_company(other, 30, days=60, seed=7, batch_size=4, today=TODAY)
+
+        for columns in (
+            (Attendance.employee_profile_id, Attendance.date, Attendance.status, Attendance.check_in_time),
+            (LeaveRequest.employee_profile_id, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.status),
+            (EmployeeProfile.id, EmployeeProfile.department, EmployeeProfile.joining_date),
+        ):
+            assert table_rows(engine, *columns) == table_rows(other, *columns)
+    finally:
+        other.dispose()
+
+
+def test_seeded_company_is_consistent(engine, db):
+    emails = seed_synthetic_company(engine, 120, days=90, today=TODAY)
+
+    assert emails[UserRole.ADMIN] == ["employee0@synthetic.example.com"]
+    assert len(emails[UserRole.HR_OFFICER]) == 2
+    assert sum(len(role_emails) for role_emails in emails.values()) == 120
+    admin = db.query(User).filter(User.email == "employee0@synthetic.example.com").one()
+    assert verify_password(DEFAULT_PASSWORD, admin.hashed_password)
+
+    # Weekends and approved leave have no attendance; nothing is recorded for today
+    days = {day for (day,) in db.query(Attendance.date).distinct()}
+    assert days and all(day.weekday() < 5 and day < TODAY for day in days)
+    for request in db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.APPROVED):
+        assert not db.query(Attendance).filter(
+            Attendance.employee_profile_id == request.employee_profile_id,
+            Attendance.date.between(request.start_date, request.end_date),
+        ).count()
+
+    # The rollups and balances match what rebuilding them from the raw rows gives
+    def snapshot():
+        db.expire_all()
+        return (
+            sorted((r.employee_profile_id, r.year, r.month, r.present_days, r.absent_days, r.half_days, r.worked_minutes)
+                   for r in db.query(AttendanceMonthlyRollup)),
+            sorted((b.id, b.used_days, b.remaining_days) for b in db.query(LeaveBalance)),
+        )
+
+    seeded = snapshot()
+    rebuild_attendance_rollups(db)
+    recompute_leave_balances(db)
+    assert snapshot() == seeded
+
+    counters = dict(db.query(DashboardCounter.name, DashboardCounter.value))
+    assert counters["employee_count"] == 120
+    assert counters["pending_leave_request_count"] == db.query(LeaveRequest).filter(
+        LeaveRequest.status == LeaveStatus.PENDING
+    ).count()
+
+
+def test_refuses_a_database_with_employees(engine):
+    seed_synthetic_company(engine, 3, days=10, today=TODAY)
+
+    with pytest.raises(ValueError):
+        seed_synthetic_company(engine, 3, days=10, today=TODAY)
+
+
+def test_seeds_alongside_the_startup_admin(engine, db):
+    db.add(User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN, is_active=True))
+    db.commit()
+
+    seed_synthetic_company(engine, 5, days=10, today=TODAY)
+
+    db.expire_all()
+    assert db.query(User).count() == 6
+    admin = db.query(User).filter(User.email == "employee0@synthetic.example.com").one()
+    assert all(profile.user.email.endswith("@synthetic.example.com") for profile in db.query(EmployeeProfile))
+    assert {request.approver_id for request in db.query(LeaveRequest).filter(LeaveRequest.approver_id.is_not(None))} <= {admin.id}
+    # The indexes dropped for the load are back
+    assert "uq_attendances_employee_date" in {index["name"] for index in inspect(engine).get_indexes("attendances")}
+
+
+def test_refuses_a_database_with_synthetic_users(engine, db):
+    db.add(User(email="employee0@synthetic.example.com", hashed_password="x", role=UserRole.ADMIN, is_active=True))
+    db.commit()
+
+    with pytest.raises(ValueError):
+        seed_synthetic_company(engine, 3, days=10, today=TODAY)
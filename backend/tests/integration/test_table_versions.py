@@ -0,0 +1,129 @@
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text, update
+
+from app.api.attendance import check_in
+from app.api.caching import conditional_get
+from app.database import get_db
+from app.migrations import run_migrations
+from app.models import Attendance, AttendanceStatus, Company, EmployeeProfile, LeaveRequest, User, UserRole
+from app.services.table_version_service import get_table_versions
+from tests.integration.test_employee_status import seed_employees
+
+
+def versions(db, *tables):
+    return get_table_versions(db, tables)
+
+
+def test_committed_writes_bump_the_polled_tables_they_touch(db):
+    seed_employees(db, 2)
+    before = versions(db, "employee_profiles", "leave_requests", "companies")
+
+    db.execute(update(EmployeeProfile).values(department="Ops"))
+    db.add(Company(name="Unpolled Co"))
+    db.commit()
+    db.add(Company(name="Second Co"))
+    db.rollback()
+
+    after = versions(db, "employee_profiles", "leave_requests", "companies")
+    assert after["employee_profiles"] == before["employee_profiles"] + 1
+    assert (after["leave_requests"], after["companies"]) == (before["leave_requests"], before["companies"])
+
+
+def test_a_released_savepoint_does_not_lose_earlier_writes(db):
+    seed_employees(db, 1)
+    before = versions(db, "employee_profiles", "users")
+
+    db.execute(update(EmployeeProfile).values(department="Ops"))
+    with db.begin_nested():
+        db.add(User(email="nested@example.com", hashed_password="x", role=UserRole.EMPLOYEE))
+    db.commit()
+
+    after = versions(db, "employee_profiles", "users")
+    assert after == {"employee_profiles": before["employee_profiles"] + 1, "users": before["users"] + 1}
+
+
+def test_check_ins_stamp_attendance_without_updating_a_version_row(db, count_queries):
+    profiles = seed_employees(db, 3)
+    before = versions(db, "attendances", "attendance_monthly_rollups")
+
+    with count_queries() as counter:
+        check_in(employee_profile=profiles[2], db=db)
+
+    assert not [sql for sql in counter.statements if "table_versions" in sql]
+    after = versions(db, "attendances", "attendance_monthly_rollups")
+    assert after["attendances"] != before["attendances"]
+    assert after["attendance_monthly_rollups"] != before["attendance_monthly_rollups"]
+
+
+def test_migrations_add_the_stamp_columns_to_existing_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_attendances_updated_at"))
+        conn.execute(text("ALTER TABLE attendances DROP COLUMN updated_at"))
+
+    run_migrations(engine)
+
+    inspector = inspect(engine)
+    assert "updated_at" in {column["name"] for column in inspector.get_columns("attendances")}
+    assert "ix_attendances_updated_at" in {index["name"] for index in inspector.get_indexes("attendances")}
+
+
+def test_conditional_get_refuses_unversioned_tables():
+    with pytest.raises(ValueError):
+        conditional_get(["companies"], lambda: None)
+
+
+def test_unchanged_tables_answer_304_and_writes_invalidate(engine, db):
+    seed_employees(db, 2)
+    app = FastAPI()
+
+    def override_get_db():
+        yield db
+
+    @app.get("/attendance", dependencies=[Depends(conditional_get(["attendances"], lambda: None))])
+    def list_attendance(session=Depends(get_db)):
+        return [a.id for a in session.query(Attendance)]
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    first = client.get("/attendance")
+    etag = first.headers["etag"]
+    assert client.get("/attendance", headers={"If-None-Match": etag}).status_code == 304
+    # Writes to other tables keep the tag
+    db.query(LeaveRequest).delete()
+    db.commit()
+    assert client.get("/attendance", headers={"If-None-Match": etag}).status_code == 304
+
+    db.query(Attendance).filter(Attendance.id == first.json()[0]).delete()
+    db.commit()
+    changed = client.get("/attendance", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+
+def test_a_304_is_only_given_after_authorization(engine, db):
+    seed_employees(db, 1)
+    app = FastAPI()
+    allowed = {"user": True}
+
+    def override_get_db():
+        yield db
+
+    def authorize():
+        if not allowed["user"]:
+            raise HTTPException(status_code=403, detail="The user does not have enough privileges")
+
+    @app.get("/attendance", dependencies=[Depends(conditional_get(["attendances"], authorize))])
+    def list_attendance(session=Depends(get_db)):
+        return [a.id for a in session.query(Attendance)]
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    etag = client.get("/attendance").headers["etag"]
+
+    # E.g. demoted since the tag was given
+    allowed["user"] = False
+
+    assert client.get("/attendance", headers={"If-None-Match": etag}).status_code == 403
@@ -0,0 +1,42 @@
+import time
+
+from app.auth.token_cache import TokenCache
+from app.models import User, UserRole
+
+
+def make_user(user_id):
+    return User(id=user_id, email=f"user{user_id}@example.com", role=UserRole.EMPLOYEE, is_active=True)
+
+
+def test_hit_returns_snapshot_and_counts():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    assert cache.get("token-a") is None
+
+    cache.set("token-a", {"sub": "user1@example.com", "exp": time.time() + 600}, make_user(1))
+    cached = cache.get("token-a")
+
+    assert cached.id == 1
+    assert cached.email == "user1@example.com"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_token_is_not_cached():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("token-a", {"exp": time.time() - 1}, make_user(1))
+    assert cache.get("token-a") is None
+
+
+def test_invalidate_user_and_eviction():
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    cache.set("token-a", {}, make_user(1))
+    cache.set("token-b", {}, make_user(1))
+    cache.set("token-c", {}, make_user(2))
+
+    # Oldest entry evicted once the cache is full
+    assert cache.get("token-a") is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate_user(1)
+    assert cache.get("token-b") is None
+    assert cache.get("token-c").id == 2
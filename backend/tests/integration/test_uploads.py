@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.services.upload_service import (
+    IMAGE_TYPES, MULTIPART_OVERHEAD_BYTES, PNG, UploadSizeLimitMiddleware, read_body, save_upload,
+)
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 5000
+
+
+def upload(content, declared_size=None):
+    return UploadFile(io.BytesIO(content), filename="picture.png", size=declared_size)
+
+
+def test_upload_is_stored_under_its_sniffed_type_with_its_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.upload_service.settings.UPLOAD_CHUNK_SIZE", 1024)
+
+    stored = asyncio.run(save_upload(upload(PNG_BYTES), tmp_path, IMAGE_TYPES, "Not an image", name="avatar"))
+
+    assert stored["content_type"] == PNG
+    assert stored["url"].endswith("/avatar.png")
+    assert (stored["size"], stored["sha256"]) == (len(PNG_BYTES), hashlib.sha256(PNG_BYTES).hexdigest())
+    assert (tmp_path / "avatar.png").read_bytes() == PNG_BYTES
+
+
+def test_disguised_and_oversized_uploads_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.upload_service.settings.UPLOAD_CHUNK_SIZE", 1024)
+
+    with pytest.raises(HTTPException) as disguised:
+        asyncio.run(save_upload(upload(b"%PDF-1.7 pretending to be a png"), tmp_path, IMAGE_TYPES, "Not an image"))
+    # The size is only known once the stream passes the limit
+    with pytest.raises(HTTPException) as streamed:
+        asyncio.run(save_upload(upload(PNG_BYTES), tmp_path, IMAGE_TYPES, "Not an image", max_bytes=4096))
+    # The size Starlette recorded while spooling the part
+    with pytest.raises(HTTPException) as spooled:
+        asyncio.run(save_upload(upload(PNG_BYTES, len(PNG_BYTES)), tmp_path, IMAGE_TYPES, "Not an image", max_bytes=4096))
+
+    assert (disguised.value.status_code, streamed.value.status_code, spooled.value.status_code) == (400, 413, 413)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_multipart_bodies_are_refused_before_the_form_is_parsed(monkeypatch):
+    monkeypatch.setattr("app.services.upload_service.settings.UPLOAD_MAX_BYTES", 4096)
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware)
+    received = []
+
+    @app.post("/upload")
+    async def receive_upload(file: UploadFile = File(...)):
+        received.append(await file.read())
+        return {}
+
+    client = TestClient(app)
+    small = client.post("/upload", files={"file": ("a.png", PNG_BYTES[:1000])})
+    declared = client.post("/upload", files={"file": ("a.png", b"\x00" * (4096 + MULTIPART_OVERHEAD_BYTES))})
+    # A chunked body has no Content-Length; it is cut off once it passes the limit
+    boundary = "upload-boundary"
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n\r\n".encode()
+            + b"\x00" * (4096 + MULTIPART_OVERHEAD_BYTES) + f"\r\n--{boundary}--\r\n".encode())
+    chunked = client.post(
+        "/upload",
+        content=(body[start:start + 8192] for start in range(0, len(body), 8192)),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert small.status_code == 200
+    assert (declared.status_code, chunked.status_code) == (413, 413)
+    assert received == [PNG_BYTES[:1000]]
+
+
+def test_bodies_read_by_routes_are_refused_past_the_limit():
+    app = FastAPI()
+
+    @app.post("/import")
+    async def import_rows(request: Request):
+        return {"size": len(await read_body(request, 4096))}
+
+    client = TestClient(app)
+    small = client.post("/import", content=b"x" * 4096)
+    declared = client.post("/import", content=b"x" * 4097)
+    chunked = client.post("/import", content=(b"x" * 1024 for _ in range(5)))
+
+    assert small.json() == {"size": 4096}
+    assert (declared.status_code, chunked.status_code) == (413, 413)
+    assert declared.json()["detail"].startswith("Request body is larger than")
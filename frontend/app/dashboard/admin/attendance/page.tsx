@@ -33,7 +33,7 @@ function AttendanceContent() {
       let endpoint = ""
       if (viewMode === 'day') {
         const formattedDate = selectedDate.toISOString().split('T')[0]
-        endpoint = `/attendance/daily?day=${formattedDate}`
+        endpoint = `/attendance/daily?day=${formattedDate}&limit=1000`
       } else {
         // For month view, we might need a range endpoint or just fetch all and filter.
         // Let's use /all for now as a fallback or assume /daily is sufficient for day view which is default.
@@ -44,7 +44,9 @@ function AttendanceContent() {
       }
 
       const token = localStorage.getItem("token") || undefined
-      const data = await api.get(endpoint, token)
+      const data = viewMode === 'day'
+        ? await api.getAllPages(endpoint, token)
+        : await api.get(endpoint, token)
       setRecords(data)
     } catch (error) {
       console.error("Failed to fetch admin attendance records", error)
@@ -20,6 +20,30 @@ export const api = {
         return handleResponse(response);
     },
 
+    // Fetches every page of a keyset-paginated list endpoint by following the
+    // X-Next-Cursor header until the last page.
+    async getAllPages(endpoint: string, token?: string) {
+        const headers: Record<string, string> = {
+            "Content-Type": "application/json",
+        };
+        if (token) {
+            headers["Authorization"] = `Bearer ${token}`;
+        }
+
+        const separator = endpoint.includes("?") ? "&" : "?";
+        const rows: any[] = [];
+        let cursor: string | null = null;
+        do {
+            const url: string = cursor
+                ? `${API_BASE_URL}${endpoint}${separator}cursor=${encodeURIComponent(cursor)}`
+                : `${API_BASE_URL}${endpoint}`;
+            const response = await fetch(url, { method: "GET", headers });
+            rows.push(...(await handleResponse(response)));
+            cursor = response.headers.get("X-Next-Cursor");
+        } while (cursor);
+        return rows;
+    },
+
     async post(endpoint: string, data: any, token?: string) {
         const headers: Record<string, string> = {
             "Content-Type": "application/json",